@@ -0,0 +1,60 @@
+"""Benchmark per-format cost of `save_timestamped_figure` with and without `render_once`.
+
+Usage:
+    python benchmarks/export_render_once.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+import plotstyle  # noqa: E402, F401
+from plotstyle.export import save_timestamped_figure  # noqa: E402
+
+FILE_TYPES = ["pdf", "svg", "png", "jpg"]
+
+
+def make_figure() -> plt.Figure:
+    rng = np.random.default_rng(0)
+    with plt.style.context(["science", "no-latex"]):
+        fig, axes = plt.subplots(2, 2, layout="constrained")
+        for ax in axes.flat:
+            for _ in range(5):
+                ax.plot(np.cumsum(rng.normal(size=500)), label="series")
+            ax.set_xlabel("step")
+            ax.set_ylabel("value")
+        axes[0, 0].legend()
+    return fig
+
+
+def bench(file_types: list[str], render_once: bool, repeat: int) -> float:
+    fig = make_figure()
+    timings = []
+    with tempfile.TemporaryDirectory() as save_dir:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            save_timestamped_figure("bench", save_dir=save_dir, fig=fig, file_types=file_types, render_once=render_once)
+            timings.append(time.perf_counter() - start)
+    plt.close(fig)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'file types':<20} {'savefig [ms]':>14} {'render_once [ms]':>18}")
+    for file_types in [[file_type] for file_type in FILE_TYPES] + [FILE_TYPES]:
+        before = bench(file_types, render_once=False, repeat=args.repeat)
+        after = bench(file_types, render_once=True, repeat=args.repeat)
+        print(f"{','.join(file_types):<20} {before * 1e3:>14.1f} {after * 1e3:>18.1f}")
@@ -0,0 +1,83 @@
+"""Benchmark drawing and saving large line and scatter plots with and without `plotstyle.largedata`.
+
+Reports the time to plot and save one figure as PDF and PNG, and the throughput in points per second, by point count.
+
+Usage:
+    python benchmarks/large_data.py [--max-points 1000000] [--baseline-max-points 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+from collections.abc import Callable
+
+import matplotlib
+
+matplotlib.use("agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+import plotstyle  # noqa: E402, F401
+from plotstyle import largedata  # noqa: E402
+from plotstyle.size import WIDTH, get_dim  # noqa: E402
+
+STYLE = ["science", "no-latex"]
+
+
+def bench(draw: Callable[[plt.Axes], object]) -> float:
+    with plt.style.context(STYLE):
+        start = time.perf_counter()
+        fig, ax = plt.subplots(figsize=get_dim(WIDTH.nature_column))
+        draw(ax)
+        for file_type in ("pdf", "png"):
+            fig.savefig(io.BytesIO(), format=file_type)
+        plt.close(fig)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-points", type=float, default=1e6)
+    parser.add_argument("--baseline-max-points", type=float, default=1e6, help="Skip plain matplotlib above this.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Per plot kind: the plain matplotlib call and the largedata helpers
+    cases: dict[str, tuple[Callable[..., object], dict[str, Callable[..., object]]]] = {
+        "line": (
+            lambda ax, x, y: ax.plot(x, y),
+            {
+                "minmax": lambda ax, x, y: largedata.plot(ax, x, y, style="bench"),
+                "lttb": lambda ax, x, y: largedata.plot(ax, x, y, style=["bench", "bench-lttb"]),
+            },
+        ),
+        "scatter": (
+            lambda ax, x, y: ax.scatter(x, y, s=1),
+            {
+                "rasterize": lambda ax, x, y: largedata.scatter(ax, x, y, style="bench", mode="rasterize", s=1),
+                "aggregate": lambda ax, x, y: largedata.scatter(ax, x, y, style="bench", mode="aggregate"),
+            },
+        ),
+    }
+    # Apply the helpers at every point count, regardless of the default thresholds
+    largedata.configure("bench", line_threshold=0, scatter_threshold=0)
+    largedata.configure("bench-lttb", line_method="lttb")
+
+    print(f"{'plot':<8} {'points':>10} {'method':<11} {'time [s]':>9} {'Mpoints/s':>10}")
+    n = 10_000
+    while n <= args.max_points:
+        for kind, (baseline, helpers) in cases.items():
+            if kind == "line":
+                x, y = np.arange(n, dtype=float), np.cumsum(rng.normal(size=n))
+            else:
+                x, y = rng.normal(size=n), rng.normal(size=n)
+            methods = dict(helpers)
+            if n <= args.baseline_max_points:
+                methods = {"matplotlib": baseline, **methods}
+            for method, draw in methods.items():
+                elapsed = bench(lambda ax: draw(ax, x, y))
+                print(f"{kind:<8} {n:>10} {method:<11} {elapsed:>9.3f} {n / elapsed / 1e6:>10.2f}", flush=True)
+        n *= 10
@@ -0,0 +1,74 @@
+"""Benchmark restyling every axes of subplot grids with `patch_plot` (per axes) and `patch_figure`.
+
+`patch_figure` is timed with the tight layout and with the analytic grid layout of `plotstyle.layout`.
+
+Usage:
+    python benchmarks/patch_grid.py [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import warnings
+
+import matplotlib
+
+matplotlib.use("agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+import plotstyle  # noqa: E402, F401
+from plotstyle.patch import patch_figure, patch_plot  # noqa: E402
+from plotstyle.size import WIDTH  # noqa: E402
+
+STYLE = ["science", "no-latex"]
+GRID_SIZES = [1, 2, 4, 8]
+
+
+def make_grid(n: int) -> plt.Figure:
+    fig, axes = plt.subplots(n, n, squeeze=False)
+    x = np.linspace(0, 10, 200)
+    for i, ax in enumerate(axes.flat):
+        ax.plot(x, np.sin(x + i), label="sin")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.set_title(f"panel {i}")
+        ax.legend()
+    return fig
+
+
+def bench(n: int, restyle, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        fig = make_grid(n)
+        start = time.perf_counter()
+        restyle(fig)
+        fig.canvas.draw()
+        timings.append(time.perf_counter() - start)
+        plt.close(fig)
+    return min(timings)
+
+
+def patch_each_axes(fig: plt.Figure) -> None:
+    for ax in fig.axes:
+        plt.sca(ax)
+        patch_plot(STYLE, WIDTH.nature_2column)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    # Large grids at a journal column width do not fit all decorations, which both layouts warn about
+    warnings.filterwarnings("ignore", message="Tight layout not applied")
+    logging.getLogger("plotstyle.layout").setLevel(logging.ERROR)
+
+    print(f"{'grid':<8} {'patch_plot per axes [ms]':>26} {'patch_figure [ms]':>19} {'patch_figure grid [ms]':>24}")
+    for n in GRID_SIZES:
+        before = bench(n, patch_each_axes, args.repeat)
+        after = bench(n, lambda fig: patch_figure(STYLE, WIDTH.nature_2column, fig=fig), args.repeat)
+        grid = bench(n, lambda fig: patch_figure(STYLE, WIDTH.nature_2column, fig=fig, layout="grid"), args.repeat)
+        print(f"{f'{n}x{n}':<8} {before * 1e3:>26.1f} {after * 1e3:>19.1f} {grid * 1e3:>24.1f}")
@@ -0,0 +1,216 @@
+"""Benchmark suite for style application: import, style context entry, patching, colors, draw and save.
+
+Each benchmark reports the best mean time per call over several repeats. Results can be stored as a baseline and later
+runs compared against it, failing if any benchmark got slower by more than a threshold. Runs offline on CPU only.
+
+Usage:
+    python benchmarks/suite.py                                  # run and print
+    python benchmarks/suite.py --save benchmarks/baseline.json  # store a baseline
+    python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/suite.py --filter "style_context|save"    # only run matching benchmarks
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import timeit
+import warnings
+from collections.abc import Iterator
+from typing import Callable, Tuple
+
+import matplotlib
+
+matplotlib.use("agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+import plotstyle  # noqa: E402
+from plotstyle.colors import Colors, cambridge_core  # noqa: E402
+from plotstyle.export import save_timestamped_figure  # noqa: E402
+from plotstyle.patch import patch_figure, patch_plot  # noqa: E402
+from plotstyle.size import WIDTH  # noqa: E402
+from plotstyle.styles import style_context, style_index  # noqa: E402
+
+STACKS = [
+    ["science", "no-latex"],
+    ["science", "nature", "no-latex"],
+    ["science", "ieee", "bright", "no-latex"],
+    ["science", "grid", "vibrant", "sans", "no-latex"],
+]
+FILE_TYPES = ["pdf", "png", "svg", "jpg"]
+
+Benchmark = Tuple[str, Callable[[], object]]
+
+
+def make_figure(n_axes: int = 1) -> plt.Figure:
+    rng = np.random.default_rng(0)
+    fig, axes = plt.subplots(1, n_axes, squeeze=False)
+    for ax in axes.flat:
+        for _ in range(3):
+            ax.plot(np.cumsum(rng.normal(size=500)), label="series")
+        ax.set_xlabel("step")
+        ax.set_ylabel("value")
+        ax.set_title("title")
+        ax.legend()
+    return fig
+
+
+def time_import(repeat: int) -> float:
+    """Time `import plotstyle` in fresh interpreters, on top of an already imported matplotlib."""
+    code = "import time, matplotlib; t = time.perf_counter(); import plotstyle; print(time.perf_counter() - t)"
+    timings = [float(subprocess.check_output([sys.executable, "-c", code], text=True)) for _ in range(repeat)]
+    return min(timings)
+
+
+def style_benchmarks() -> Iterator[Benchmark]:
+    def enter(context, style):
+        def run():
+            with context(style):
+                pass
+
+        return run
+
+    for name in style_index():
+        yield f"plt.style.context[{name}]", enter(plt.style.context, name)
+    for stack in STACKS:
+        yield f"plt.style.context[{','.join(stack)}]", enter(plt.style.context, stack)
+        yield f"style_context[{','.join(stack)}]", enter(style_context, stack)
+
+
+def patch_benchmarks() -> Iterator[Benchmark]:
+    def run_patch_plot():
+        fig = make_figure()
+        patch_plot(["science", "no-latex"], WIDTH.nature_column)
+        plt.close(fig)
+
+    def run_patch_figure():
+        fig = make_figure(4)
+        patch_figure(["science", "no-latex"], WIDTH.nature_2column, fig=fig)
+        plt.close(fig)
+
+    def run_patch_figure_grid():
+        fig = make_figure(4)
+        patch_figure(["science", "no-latex"], WIDTH.nature_2column, fig=fig, layout="grid")
+        plt.close(fig)
+
+    yield "patch_plot", run_patch_plot
+    yield "patch_figure[4 axes]", run_patch_figure
+    yield "patch_figure[4 axes, grid layout]", run_patch_figure_grid
+
+
+def colors_benchmarks() -> Iterator[Benchmark]:
+    # Fresh instances, so conversions are not served from the per-instance cache
+    palette = cambridge_core.colors
+
+    yield "Colors.to_rgba_array", lambda: Colors(palette).to_rgba_array()
+    yield "Colors.to_hex_list", lambda: Colors(palette).to_hex_list()
+    yield "Colors.to_cycler", lambda: Colors(palette).to_cycler()
+    yield "Colors.interpolate[256]", lambda: Colors(palette).interpolate(256)
+    yield "Colors.lighten", lambda: Colors(palette).lighten(0.3)
+
+
+def draw_save_benchmarks(save_dir: str) -> Iterator[Benchmark]:
+    def run_draw():
+        with style_context(["science", "no-latex"]):
+            fig = make_figure()
+            fig.canvas.draw()
+            plt.close(fig)
+
+    def save(file_type):
+        def run():
+            with style_context(["science", "no-latex"]):
+                fig = make_figure()
+                save_timestamped_figure("bench", save_dir=save_dir, fig=fig, file_types=file_type)
+                plt.close(fig)
+
+        return run
+
+    yield "draw", run_draw
+    for file_type in FILE_TYPES:
+        yield f"save_timestamped_figure[{file_type}]", save(file_type)
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best mean time per call of `func` in seconds."""
+    func()  # warm up caches, as a long-running pipeline would
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_suite(pattern: str | None, repeat: int) -> dict[str, float]:
+    results = {}
+    with tempfile.TemporaryDirectory() as save_dir:
+        benchmarks = [
+            ("import plotstyle", None),
+            *style_benchmarks(),
+            *patch_benchmarks(),
+            *colors_benchmarks(),
+            *draw_save_benchmarks(save_dir),
+        ]
+        for name, func in benchmarks:
+            if pattern and not re.search(pattern, name):
+                continue
+            results[name] = time_import(repeat) if func is None else measure(func, repeat)
+            print(f"{name:<60} {results[name] * 1e3:>10.3f} ms", flush=True)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Return the names of the benchmarks that are slower than the baseline by more than `threshold`."""
+    regressions = []
+    print(f"\n{'benchmark':<60} {'baseline [ms]':>14} {'current [ms]':>13} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        change = current / baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<60} {baseline[name] * 1e3:>14.3f} {current * 1e3:>13.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name matches this regex.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", default=None, help="Write the results as a baseline to this JSON file.")
+    parser.add_argument("--compare", default=None, help="Compare against the baseline in this JSON file.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Relative slowdown that counts as a regression. Default: 0.25."
+    )
+    args = parser.parse_args()
+
+    # The font styles (e.g. cjk-jp-font) warn about fonts that are not installed
+    warnings.filterwarnings("ignore", message="findfont")
+    results = run_suite(args.filter, args.repeat)
+
+    if args.save:
+        meta = {
+            "plotstyle": plotstyle.VERSION,
+            "matplotlib": matplotlib.__version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        }
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
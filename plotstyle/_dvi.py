@@ -0,0 +1,108 @@
+"""Minimal DVI reader/writer used to split a multi-page DVI file into single-page DVI files.
+
+See the DVI format specification in "TeX: The Program", part 31, or `dvitype.web`.
+"""
+
+from __future__ import annotations
+
+_SET_CHAR_MAX = 127
+_SET1, _SET_RULE, _PUT1, _PUT_RULE = 128, 132, 133, 137
+_BOP, _EOP = 139, 140
+_FNT_NUM_0, _FNT_NUM_63, _FNT1, _XXX1, _FNT_DEF1 = 171, 234, 235, 239, 243
+_PRE, _POST, _POST_POST = 247, 248, 249
+
+# Opcodes without arguments: nop, eop, push, pop, w0, x0, y0, z0
+_NO_ARGS = {138, 140, 141, 142, 147, 152, 161, 166}
+# Opcodes followed by a single 1-4 byte argument, mapped to the opcode of the 1 byte variant:
+# set, put, right, w, x, down, y, z, fnt
+_ONE_ARG = {first + k: first for first in (_SET1, _PUT1, 143, 148, 153, 157, 162, 167, _FNT1) for k in range(4)}
+
+
+def _uint(data: bytes, pos: int, size: int) -> int:
+    return int.from_bytes(data[pos : pos + size], "big")
+
+
+def _command_length(data: bytes, pos: int) -> int:
+    """Return the length in bytes of the DVI command starting at `pos`."""
+    op = data[pos]
+    if op <= _SET_CHAR_MAX or op in _NO_ARGS or _FNT_NUM_0 <= op <= _FNT_NUM_63:
+        return 1
+    if op in _ONE_ARG:
+        return 1 + (op - _ONE_ARG[op] + 1)
+    if op in (_SET_RULE, _PUT_RULE):
+        return 9
+    if op == _BOP:
+        return 45
+    if _XXX1 <= op < _XXX1 + 4:
+        k = op - _XXX1 + 1
+        return 1 + k + _uint(data, pos + 1, k)
+    if _FNT_DEF1 <= op < _FNT_DEF1 + 4:
+        k = op - _FNT_DEF1 + 1
+        # fnt_def k[k] c[4] s[4] d[4] a[1] l[1] n[a + l]
+        return 1 + k + 14 + data[pos + 1 + k + 12] + data[pos + 1 + k + 13]
+    raise ValueError(f"Unexpected DVI opcode {op} at byte {pos}.")
+
+
+def _font_number(data: bytes, pos: int) -> int | None:
+    """Return the font selected or defined by the command at `pos`, or None."""
+    op = data[pos]
+    if _FNT_NUM_0 <= op <= _FNT_NUM_63:
+        return op - _FNT_NUM_0
+    if _FNT1 <= op < _FNT1 + 4:
+        return _uint(data, pos + 1, op - _FNT1 + 1)
+    if _FNT_DEF1 <= op < _FNT_DEF1 + 4:
+        return _uint(data, pos + 1, op - _FNT_DEF1 + 1)
+    return None
+
+
+def split_pages(data: bytes) -> list[bytes]:
+    """Split a DVI file into one standalone DVI file per page."""
+    if data[0] != _PRE:
+        raise ValueError("Not a DVI file.")
+    pos = 15 + data[14]  # pre i[1] num[4] den[4] mag[4] k[1] x[k]
+    preamble = data[:pos]
+
+    font_defs: dict[int, bytes] = {}
+    pages: list[tuple[bytes, set[int], set[int]]] = []
+    page: bytearray | None = None
+    used: set[int] = set()
+    defined: set[int] = set()
+    while data[pos] != _POST:
+        op, length = data[pos], _command_length(data, pos)
+        command = data[pos : pos + length]
+        font = _font_number(data, pos)
+        if op == _BOP:
+            page, used, defined = bytearray(), set(), set()
+        if _FNT_DEF1 <= op < _FNT_DEF1 + 4:
+            font_defs[font] = command  # type: ignore[index]
+            if page is not None:
+                defined.add(font)  # type: ignore[arg-type]
+        elif font is not None:
+            used.add(font)
+        if page is not None:
+            page += command
+        if op == _EOP:
+            pages.append((bytes(page), used, defined))  # type: ignore[arg-type]
+            page = None
+        pos += length
+
+    # post p[4] num[4] den[4] mag[4] l[4] u[4] s[2] t[2]
+    post_fields = data[pos + 5 : pos + 25]
+    max_stack = data[pos + 25 : pos + 27]
+
+    split = []
+    for page_bytes, used, defined in pages:
+        # Fonts defined on earlier pages must be defined again before their first use on this page
+        missing_defs = b"".join(font_defs[font] for font in sorted(used - defined))
+        bop = page_bytes[:41] + (-1).to_bytes(4, "big", signed=True)
+        out = bytearray(preamble)
+        bop_offset = len(out)
+        out += bop + missing_defs + page_bytes[45:]
+        post_offset = len(out)
+        out += bytes([_POST]) + bop_offset.to_bytes(4, "big") + post_fields + max_stack + (1).to_bytes(2, "big")
+        out += b"".join(font_defs[font] for font in sorted(used | defined))
+        out += bytes([_POST_POST]) + post_offset.to_bytes(4, "big") + data[1:2]
+        # The file ends with four to seven 223 bytes, padding it to a multiple of four bytes
+        out += bytes([223]) * (4 + (-(len(out) + 4)) % 4)
+        split.append(bytes(out))
+    return split
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import argparse
+import atexit
+import hashlib
+import json
+import logging
+import numbers
+import os
+import pickle
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+from .version import VERSION
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+__all__ = [
+    "FigureCache",
+    "StyleCache",
+    "figure_hash",
+    "default_cache_dir",
+    "get_style_cache",
+    "save_style_cache",
+    "warm_style_cache",
+]
+
+_log = logging.getLogger(__name__)
+
+# Bump to invalidate existing cache files when the on-disk layout changes
+_CACHE_FORMAT = 1
+
+
+def default_cache_dir() -> str:
+    """Return the directory of the compiled style cache.
+
+    This is `$PLOTSTYLE_CACHE_DIR` if set, and a `plotstyle` folder in the matplotlib cache directory otherwise.
+    """
+    if "PLOTSTYLE_CACHE_DIR" in os.environ:
+        return os.environ["PLOTSTYLE_CACHE_DIR"]
+    import matplotlib as mpl
+
+    return os.path.join(mpl.get_cachedir(), "plotstyle")
+
+
+def _stat_key(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class StyleCache:
+    """Compiled cache of validated stylesheet rcParams, stored in a single pickle file.
+
+    Entries are keyed by stylesheet path and invalidated when the modification time or size of the stylesheet
+    changes. The whole cache is invalidated when the matplotlib or plotstyle version changes.
+
+    Note that the cache file is unpickled on load, so `cache_dir` must not be writable by untrusted users.
+    """
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        import matplotlib as mpl
+
+        self.cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        self.header = {"format": _CACHE_FORMAT, "matplotlib": mpl.__version__, "plotstyle": VERSION}
+        self.entries: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+        self._dirty = False
+        self._load()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.cache_dir, f"styles-mpl{self.header['matplotlib']}.pickle")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                header, entries = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            _log.debug("Ignoring unreadable style cache %s: %s", self.path, e)
+            return
+        if header == self.header:
+            self.entries = entries
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        """Return the cached rcParams of the stylesheet at `path`, or None if missing or stale."""
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        key, rc = entry
+        try:
+            if _stat_key(path) != key:
+                return None
+        except OSError:
+            return None
+        return rc
+
+    def put(self, path: str, rc: dict[str, Any]) -> None:
+        """Add the rcParams of the stylesheet at `path` to the cache."""
+        self.entries[path] = (_stat_key(path), dict(rc))
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it has changed. Failures (e.g. a read-only cache directory) are logged."""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write atomically so concurrent processes never read a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((self.header, self.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            _log.debug("Could not write style cache %s: %s", self.path, e)
+            return
+        self._dirty = False
+
+    def clear(self) -> None:
+        """Remove all entries and delete the cache file."""
+        self.entries.clear()
+        self._dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+_style_cache: StyleCache | None = None
+
+
+def get_style_cache() -> StyleCache:
+    """Return the process-wide style cache, reading it from disk on first use.
+
+    New entries are written to disk once, by `save_style_cache` (e.g. at the end of `plotstyle.styles.register_styles`)
+    or when the interpreter exits, rather than after every miss.
+    """
+    global _style_cache
+    if _style_cache is None:
+        _style_cache = StyleCache()
+        atexit.register(_style_cache.save)
+    return _style_cache
+
+
+def save_style_cache() -> None:
+    """Write the new entries of the process-wide style cache to disk. Does nothing if the cache was not used yet."""
+    if _style_cache is not None:
+        _style_cache.save()
+
+
+def warm_style_cache(cache_dir: str | None = None) -> StyleCache:
+    """Parse all bundled stylesheets and write them to the style cache.
+
+    Args:
+        cache_dir (str, optional): The cache directory. Defaults to None, in which case `default_cache_dir()` is used.
+
+    Returns:
+        cache (StyleCache): The warmed cache.
+    """
+    from .styles import parse_style_file, style_index
+
+    cache = StyleCache(cache_dir)
+    for path in style_index().values():
+        if cache.get(path) is None:
+            cache.put(path, parse_style_file(path))
+    cache.save()
+    return cache
+
+
+# Artist attributes that do not affect the rendered output, or that differ between otherwise identical figures
+_FIGURE_HASH_SKIP = {
+    "_axes",
+    "_callbacks",
+    "_canvas_callbacks",
+    "_clippath",
+    "_mouseover",
+    "_number",
+    "_parent_figure",
+    "_remove_method",
+    "_stale",
+    "canvas",
+    "clipbox",
+    "figure",
+    "number",
+    "stale_callback",
+}
+
+
+# rcParams that select or configure the interactive backend and do not affect saved files
+_RC_HASH_SKIP = ("backend", "backend_fallback", "interactive", "toolbar", "keymap.", "macosx.", "tk.", "webagg.")
+
+
+def _named_transforms(fig: plt.Figure) -> dict[int, str]:
+    """Return the names of the standard transforms of `fig` and its axes, keyed by id."""
+    named = {"transFigure": fig.transFigure, "dpi_scale_trans": fig.dpi_scale_trans}
+    if hasattr(fig, "transSubfigure"):
+        named["transSubfigure"] = fig.transSubfigure
+    for i, ax in enumerate(fig.axes):
+        for attr in ("transAxes", "transData", "transScale", "transLimits"):
+            named[f"axes{i}.{attr}"] = getattr(ax, attr)
+        named[f"axes{i}.xaxis_transform"] = ax.get_xaxis_transform()
+        named[f"axes{i}.yaxis_transform"] = ax.get_yaxis_transform()
+    return {id(transform): name for name, transform in named.items()}
+
+
+def _describe_transform(transform: Any, names: dict[int, str], depth: int = 0) -> Any:
+    """Describe a transform by what it is, e.g. `ax.transData` or a blend of two, rather than by its current matrix."""
+    name = names.get(id(transform))
+    if name is not None:
+        return name
+    kind = type(transform).__name__
+    # Composite, blended, transformed-bbox and scaled-translation transforms are described by their parts
+    parts = [
+        getattr(transform, attr)
+        for attr in ("_a", "_b", "_x", "_y", "_child", "_scale_trans")
+        if hasattr(getattr(transform, attr, None), "is_affine")
+    ]
+    if parts and depth < 8:
+        extra = getattr(transform, "_t", None)
+        return (kind, extra, [_describe_transform(part, names, depth + 1) for part in parts])
+    if getattr(transform, "is_affine", False):
+        # A custom transform, e.g. `Affine2D().rotate_deg(30)`
+        return (kind, transform.frozen().get_matrix())
+    return kind
+
+
+def _hash_value(h: Any, value: Any, seen: set[int], depth: int = 0, names: dict[int, str] | None = None) -> None:
+    import numpy as np
+    from matplotlib.artist import Artist
+    from matplotlib.transforms import BboxBase, TransformNode
+
+    if value is None or isinstance(value, (bool, numbers.Number, str, bytes)):
+        h.update(repr(value).encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"{value.dtype}{value.shape}".encode())
+        if value.dtype.hasobject:
+            _hash_value(h, value.tolist(), seen, depth + 1, names)
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+            if np.ma.isMaskedArray(value):
+                h.update(np.ma.getmaskarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"(")
+        for item in value:
+            _hash_value(h, item, seen, depth + 1, names)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for key in sorted(value, key=repr):
+            if key not in _FIGURE_HASH_SKIP:
+                _hash_value(h, key, seen, depth, names)
+                _hash_value(h, value[key], seen, depth + 1, names)
+        h.update(b"}")
+    elif isinstance(value, (set, frozenset)):
+        # Sort, as set iteration order depends on the hash seed
+        _hash_value(h, sorted(map(repr, value)), seen, depth, names)
+    elif isinstance(value, BboxBase):
+        _hash_value(h, value.get_points(), seen, depth, names)
+    elif isinstance(value, TransformNode):
+        _hash_value(h, _describe_transform(value, names or {}), seen, depth, names)
+    elif isinstance(value, Artist) or depth > 4 or id(value) in seen or not hasattr(value, "__dict__"):
+        # Artists are hashed on their own
+        h.update(type(value).__name__.encode())
+    else:
+        seen.add(id(value))
+        h.update(type(value).__name__.encode())
+        _hash_value(h, vars(value), seen, depth + 1, names)
+
+
+def figure_hash(fig: plt.Figure, *extra: Any) -> str:
+    """Return a content hash of a figure.
+
+    The hash covers the data arrays and properties of every artist in the figure, the active rcParams and any `extra`
+    values (e.g. save options). It is stable across processes, so an unchanged figure built by the same code hashes to
+    the same value in every run. Transforms are hashed by what they are (e.g. `ax.transAxes` or `ax.transData`), not by
+    their current matrix.
+
+    Drawing a figure fills in derived state (tick positions, transformed paths, text layout), so a figure hashes to
+    a different value after it has been drawn. Hash figures before drawing or saving them.
+
+    Args:
+        fig (plt.Figure): The figure to hash.
+        *extra: Additional hashable values (numbers, strings, lists, dicts, arrays) to include in the hash.
+
+    Returns:
+        digest (str): The hex digest of the hash.
+    """
+    import matplotlib as mpl
+
+    h = hashlib.sha256()
+    seen: set[int] = set()
+    names = _named_transforms(fig)
+    for artist in fig.findobj():
+        seen.add(id(artist))
+        h.update(type(artist).__name__.encode())
+        _hash_value(h, vars(artist), seen, names=names)
+    rc = {key: repr(value) for key, value in mpl.rcParams.items() if not key.startswith(_RC_HASH_SKIP)}
+    _hash_value(h, rc, seen)
+    _hash_value(h, list(extra), seen)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """Content-addressed index of saved figures, used by `save_timestamped_figure(..., cache=...)`.
+
+    Each save directory holds a JSON index mapping figure hashes to the files written for them. When an identical
+    figure is saved again under the same name, the existing files are reused instead of rendering the figure again.
+    The name is part of the hash, so an identical figure saved under another name is rendered to its own files.
+
+    Args:
+        link (bool, optional): If True, a cache hit hard-links the existing files to the new timestamped paths. If
+            False, the paths of the existing files are returned. Defaults to False.
+        max_entries (int, optional): The maximum number of entries kept in each index. The oldest entries are dropped
+            from the index first, their files are kept. Defaults to 1000.
+        keep_versions (int, optional): If given, only the newest `keep_versions` timestamped versions written through
+            the cache are kept for each figure name, and older versions are deleted. Defaults to None, in which case
+            no files are deleted.
+    """
+
+    INDEX_FILE = ".plotstyle-figures.json"
+
+    def __init__(self, link: bool = False, max_entries: int = 1000, keep_versions: int | None = None) -> None:
+        if keep_versions is not None and keep_versions < 1:
+            raise ValueError("`keep_versions` must be at least 1.")
+        self.link = link
+        self.max_entries = max_entries
+        self.keep_versions = keep_versions
+
+    def _index_path(self, save_dir: str) -> str:
+        return os.path.join(save_dir, self.INDEX_FILE)
+
+    def _read_index(self, save_dir: str) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path(save_dir), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, save_dir: str, index: dict[str, dict[str, Any]]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=save_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=1)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self._index_path(save_dir))
+
+    def lookup(self, key: str, paths: list[str]) -> list[str] | None:
+        """Return the saved paths for figure hash `key`, or None on a cache miss.
+
+        On a miss, any of `paths` that is a hard link is unlinked, so that saving the figure does not overwrite the
+        files of another cache entry in place.
+
+        Args:
+            key (str): The figure hash.
+            paths (list[str]): The paths the figure would be saved to. Used to locate the index and, if `link` is True,
+                as the targets of the hard links.
+
+        Returns:
+            cached_paths (list[str] or None): The paths of the existing files, relative or absolute like `paths`.
+        """
+        save_dir = os.path.dirname(os.path.abspath(paths[0]))
+        entry = self._read_index(save_dir).get(key)
+        # In the same directory as `paths`, so that hits and misses return paths of the same form
+        path_dir = os.path.dirname(paths[0])
+        cached_paths = [] if entry is None else [os.path.join(path_dir, fname) for fname in entry["files"]]
+        if len(cached_paths) != len(paths) or not all(os.path.exists(path) for path in cached_paths):
+            for path in paths:
+                if os.path.exists(path) and os.stat(path).st_nlink > 1:
+                    os.remove(path)
+            return None
+        if not self.link:
+            return cached_paths
+        for cached_path, path in zip(cached_paths, paths):
+            if not os.path.exists(path):
+                os.link(cached_path, path)
+        return paths
+
+    def add(self, key: str, name: str, paths: list[str]) -> None:
+        """Record that the figure with hash `key` and base name `name` was saved to `paths`."""
+        save_dir = os.path.dirname(os.path.abspath(paths[0]))
+        files = [os.path.basename(path) for path in paths]
+        index = self._read_index(save_dir)
+        # Entries whose files were just overwritten are no longer valid
+        for old_key in [k for k, entry in index.items() if k == key or set(entry["files"]) & set(files)]:
+            del index[old_key]
+        index[key] = {"name": os.path.basename(name), "files": files, "time": time.time()}
+
+        if self.keep_versions is not None:
+            versions = [k for k, entry in index.items() if entry["name"] == index[key]["name"]]
+            for old_key in versions[: -self.keep_versions]:
+                old_files = index.pop(old_key)["files"]
+                in_use = {fname for entry in index.values() for fname in entry["files"]}
+                for fname in set(old_files) - in_use:
+                    try:
+                        os.remove(os.path.join(save_dir, fname))
+                    except FileNotFoundError:
+                        pass
+
+        # Entries are kept in insertion order, drop the oldest
+        for old_key in list(index)[: max(0, len(index) - self.max_entries)]:
+            del index[old_key]
+        self._write_index(save_dir, index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m plotstyle.cache", description="Pre-warm the compiled cache of the bundled stylesheets."
+    )
+    parser.add_argument("--cache-dir", default=None, help="Cache directory. Defaults to $PLOTSTYLE_CACHE_DIR.")
+    parser.add_argument("--clear", action="store_true", help="Delete the cache instead of warming it.")
+    args = parser.parse_args()
+
+    if args.clear:
+        cache = StyleCache(args.cache_dir)
+        cache.clear()
+        print(f"Removed {cache.path}")
+    else:
+        cache = warm_style_cache(args.cache_dir)
+        print(f"Cached {len(cache.entries)} stylesheets in {cache.path}")
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import functools
+from typing import TYPE_CHECKING, Any, overload
+
 import matplotlib as mpl
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+
+if TYPE_CHECKING:
+    import seaborn as sns
+    from cycler import Cycler
 
 __all__ = [
+    "Colors",
+    "distinct_colors",
+    "oklab_to_srgb",
+    "srgb_to_oklab",
     "cambridge_special",
     "cambridge_light",
     "cambridge_core",
@@ -12,7 +22,98 @@ __all__ = [
 ]
 
 
+# sRGB <-> Oklab conversion matrices from https://bottosson.github.io/posts/oklab/
+_LINEAR_SRGB_TO_LMS = np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_LMS_TO_OKLAB = np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+
+
+def srgb_to_oklab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (..., 3) array of sRGB colors in [0, 1] to the perceptually uniform Oklab space."""
+    rgb = np.asarray(rgb, dtype=float)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    lms = np.cbrt(linear @ _LINEAR_SRGB_TO_LMS.T)
+    return lms @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_srgb(lab: np.ndarray) -> np.ndarray:
+    """Convert an (..., 3) array of Oklab colors to sRGB, clipped to [0, 1]."""
+    lms = (np.asarray(lab, dtype=float) @ np.linalg.inv(_LMS_TO_OKLAB).T) ** 3
+    linear = lms @ np.linalg.inv(_LINEAR_SRGB_TO_LMS).T
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def _rgba_to_hex(rgba: np.ndarray) -> list[str]:
+    """Vectorized `mpl.colors.to_hex(..., keep_alpha=True)`; the alpha channel is only included if not opaque."""
+    channels = np.round(np.asarray(rgba) * 255).astype(int)
+    return ["#" + "".join(f"{c:02x}" for c in (row if row[3] != 255 else row[:3])) for row in channels.tolist()]
+
+
+class _ColorDict(dict):
+    """Dict of colors that counts its mutations, so that `Colors` can cache derived values such as the name list."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.version += 1
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.version += 1
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.version += 1
+        return value
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> Any:  # type: ignore[misc]
+        # `dict.__ior__` does not go through `update`. Typed loosely, as mypy compares it to the overloaded `__or__`
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Pickle as a plain dict
+        return (dict, (dict(self),))
+
+
 class Colors:
+    __slots__ = ("_colors", "_keys", "_rgba_cache")
+
     def __init__(self, colors: list[str] | dict[str, str] | str) -> None:
         if isinstance(colors, dict):
             self.colors = colors
@@ -21,6 +122,27 @@ class Colors:
         else:
             raise ValueError(f"Unrecognized type {type(colors)} for colors.")
 
+    @property
+    def colors(self) -> dict[str, str]:
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors: dict[str, str]) -> None:
+        # Copied, so that palettes never share (and mutate) the dict they were created from
+        self._set_colors(_ColorDict(colors))
+
+    def _set_colors(self, colors: _ColorDict) -> None:
+        self._colors = colors
+        self._keys: tuple[int, list[str]] | None = None
+        self._rgba_cache: tuple[int, np.ndarray] | None = None
+
+    @classmethod
+    def _from_color_dict(cls, colors: _ColorDict) -> Colors:
+        """Create a palette that takes ownership of `colors` without copying it."""
+        palette = cls.__new__(cls)
+        palette._set_colors(colors)
+        return palette
+
     @classmethod
     def from_json(cls, json_file: str) -> Colors:
         import json
@@ -38,63 +160,232 @@ class Colors:
         return cls(colors)
 
     def __len__(self) -> int:
-        return len(self.colors)
+        return len(self._colors)
+
+    def __getstate__(self) -> dict[str, str]:
+        return dict(self._colors)
+
+    def __setstate__(self, colors: dict[str, str]) -> None:
+        self.colors = colors
 
     @property
     def names(self) -> list[str]:
-        return list(self.colors.keys())
+        return list(self._key_list)
+
+    @property
+    def _key_list(self) -> list[str]:
+        """Cached list of the color names, rebuilt whenever `colors` was modified."""
+        if self._keys is None or self._keys[0] != self._colors.version:
+            self._keys = (self._colors.version, list(self._colors))
+        return self._keys[1]
 
     def _idx_to_color_key(self, idx: int) -> str:
-        if idx >= len(self.colors):
-            raise IndexError(f"Index {idx} is out of bounds. The color palette has {len(self.colors)} colors.")
-        elif idx < (-1 * len(self.colors)):
-            raise IndexError(f"Index {idx} is out of bounds. The color palette has {len(self.colors)} colors.")
-        key = self.names[idx]
-        return key
-
-    def __getitem__(self, key: str | int) -> str:
-        if isinstance(key, int):
-            key = self._idx_to_color_key(key)
-        return self.colors[key]
+        if idx >= len(self._colors):
+            raise IndexError(f"Index {idx} is out of bounds. The color palette has {len(self._colors)} colors.")
+        elif idx < (-1 * len(self._colors)):
+            raise IndexError(f"Index {idx} is out of bounds. The color palette has {len(self._colors)} colors.")
+        return self._key_list[idx]
+
+    @overload
+    def __getitem__(self, key: str | int | np.integer) -> str: ...
+
+    @overload
+    def __getitem__(self, key: slice | list | np.ndarray) -> Colors: ...
+
+    def __getitem__(self, key: str | int | np.integer | slice | list | np.ndarray) -> str | Colors:
+        """Get a color by name or position. Slices, lists of names or positions and boolean masks return a new
+        palette with the selected colors."""
+        if isinstance(key, str):
+            return self._colors[key]
+        if isinstance(key, (int, np.integer)):
+            return self._colors[self._idx_to_color_key(int(key))]
+        if isinstance(key, slice):
+            keys = self._key_list[key]
+        else:
+            items = key.tolist() if isinstance(key, np.ndarray) else list(key)
+            if items and all(isinstance(k, bool) for k in items):
+                if len(items) != len(self):
+                    raise IndexError(f"Boolean mask of length {len(items)} does not match {len(self)} colors.")
+                items = [i for i, selected in enumerate(items) if selected]
+            keys = [k if isinstance(k, str) else self._idx_to_color_key(int(k)) for k in items]
+        return Colors._from_color_dict(_ColorDict((k, self._colors[k]) for k in keys))
 
     def __setitem__(self, key: str | int, value: str):
-        if isinstance(key, int):
-            if key > len(self.colors):
-                raise IndexError(f"Index {key} is out of bounds. The color palette has {len(self.colors)} colors.")
-            elif key == len(self.colors):
+        if isinstance(key, (int, np.integer)):
+            key = int(key)
+            if key > len(self._colors):
+                raise IndexError(f"Index {key} is out of bounds. The color palette has {len(self._colors)} colors.")
+            elif key == len(self._colors):
                 # Add a new color
                 key = str(key)
             else:
                 # Update an existing color
                 key = self._idx_to_color_key(key)
-        self.colors[key] = value
+        self._colors[key] = value
 
     def __add__(self, other: Colors) -> Colors:
-        return Colors(self.colors | other.colors)
+        colors = _ColorDict(self._colors)
+        colors.update(other.colors)
+        return Colors._from_color_dict(colors)
+
+    def to_cycler(self, **kwargs) -> Cycler:
+        from matplotlib.rcsetup import cycler
 
-    def to_cycler(self, **kwargs) -> plt.cycler:
-        return plt.cycler(color=self.colors.values(), **kwargs)
+        return cycler(color=self.colors.values(), **kwargs)
 
     def to_palette(self, **kwargs) -> sns.Palette:
+        import seaborn as sns
+
         return sns.color_palette(list(self.colors.values()), **kwargs)
 
+    @property
+    def _rgba(self) -> np.ndarray:
+        """Read-only (N, 4) array of the RGBA values, converted once and cached until the colors change."""
+        if self._rgba_cache is None or self._rgba_cache[0] != self._colors.version:
+            values = list(self._colors.values())
+            rgba = mpl.colors.to_rgba_array(values) if values else np.zeros((0, 4))
+            rgba.flags.writeable = False
+            self._rgba_cache = (self._colors.version, rgba)
+        return self._rgba_cache[1]
+
+    def to_rgba_array(self) -> np.ndarray:
+        """Return the colors as an (N, 4) array of RGBA values in [0, 1]."""
+        return self._rgba.copy()
+
+    def to_rgb_array(self) -> np.ndarray:
+        """Return the colors as an (N, 3) array of RGB values in [0, 1]."""
+        return self._rgba[:, :3].copy()
+
+    def to_oklab_array(self) -> np.ndarray:
+        """Return the colors as an (N, 3) array in the perceptually uniform Oklab space."""
+        return srgb_to_oklab(self._rgba[:, :3])
+
     def to_rgb_list(self) -> list[tuple[float, float, float]]:
-        return [mpl.colors.colorConverter.to_rgb(rgb) for rgb in self.colors.values()]
+        return [tuple(rgb) for rgb in self._rgba[:, :3].tolist()]
 
     def to_rgba_list(self) -> list[tuple[float, float, float, float]]:
-        return [mpl.colors.colorConverter.to_rgba(rgba) for rgba in self.colors.values()]
+        return [tuple(rgba) for rgba in self._rgba.tolist()]
 
     def to_hex_list(self) -> list[str]:
-        return [mpl.colors.rgb2hex(rgb) for rgb in self.to_rgb_list()]
+        return _rgba_to_hex(np.column_stack([self._rgba[:, :3], np.ones(len(self))]))
 
     def to_hsv_list(self) -> list[tuple[float, float, float]]:
-        return [mpl.colors.rgb_to_hsv(rgb) for rgb in self.to_rgb_list()]
+        return list(mpl.colors.rgb_to_hsv(self._rgba[:, :3]))
+
+    def _with_rgba(self, rgba: np.ndarray) -> Colors:
+        return Colors(dict(zip(self.names, _rgba_to_hex(rgba))))
+
+    def lighten(self, amount: float = 0.2) -> Colors:
+        """Return a palette with every color mixed with white by `amount` (0: unchanged, 1: white)."""
+        rgba = self._rgba.copy()
+        rgba[:, :3] += (1.0 - rgba[:, :3]) * amount
+        return self._with_rgba(rgba)
+
+    def darken(self, amount: float = 0.2) -> Colors:
+        """Return a palette with every color mixed with black by `amount` (0: unchanged, 1: black)."""
+        rgba = self._rgba.copy()
+        rgba[:, :3] *= 1.0 - amount
+        return self._with_rgba(rgba)
+
+    def interpolate(self, n: int) -> Colors:
+        """Return a palette of `n` colors evenly interpolated along this palette in Oklab space."""
+        if len(self) == 0:
+            raise ValueError("Cannot interpolate an empty color palette.")
+        lab = srgb_to_oklab(self._rgba[:, :3])
+        alpha = self._rgba[:, 3]
+        src = np.linspace(0.0, 1.0, len(self))
+        dst = np.linspace(0.0, 1.0, n)
+        lab = np.column_stack([np.interp(dst, src, lab[:, i]) for i in range(3)])
+        return Colors(_rgba_to_hex(np.column_stack([oklab_to_srgb(lab), np.interp(dst, src, alpha)])))
+
+    def distance(self, other: Colors | None = None) -> np.ndarray:
+        """Return the pairwise perceptual distances (Euclidean in Oklab) between the colors of this palette and
+        `other`, as an (N, M) array. If `other` is None, distances within this palette are returned."""
+        lab = self.to_oklab_array()
+        other_lab = lab if other is None else other.to_oklab_array()
+        return np.linalg.norm(lab[:, None, :] - other_lab[None, :, :], axis=-1)
+
+    def extend(self, n: int, **kwargs) -> Colors:
+        """Return a palette of `n` maximally distinguishable colors starting with this palette.
+
+        See `distinct_colors` for the keyword arguments.
+        """
+        return distinct_colors(n, base=self, **kwargs)
 
     def _repr_html_(self) -> str:
         """Rich display of the color palette in an HTML frontend."""
         return self.to_palette()._repr_html_()
 
 
+@functools.lru_cache(maxsize=32)
+def _distinct_colors(
+    base: tuple[str, ...],
+    n: int,
+    lightness: tuple[float, float],
+    min_chroma: float,
+    n_candidates: int,
+    seed: int,
+) -> tuple[str, ...]:
+    # Candidate colors sampled uniformly from the sRGB cube, restricted in Oklab lightness and chroma
+    rgb = np.random.default_rng(seed).random((n_candidates, 3))
+    lab = srgb_to_oklab(rgb)
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    keep = (lab[:, 0] >= lightness[0]) & (lab[:, 0] <= lightness[1]) & (chroma >= min_chroma)
+    rgb, lab = rgb[keep], lab[keep]
+    n_new = n - len(base)
+    if n_new > len(lab):
+        raise ValueError(f"Only {len(lab)} candidate colors satisfy the constraints, increase `n_candidates`.")
+
+    # Greedy farthest-point sampling: repeatedly pick the candidate farthest from all colors chosen so far
+    if base:
+        base_lab = srgb_to_oklab(mpl.colors.to_rgba_array(base)[:, :3])
+        min_dist = np.min(np.linalg.norm(lab[:, None, :] - base_lab[None, :, :], axis=-1), axis=1)
+    else:
+        # Start from the candidate farthest from mid grey
+        min_dist = np.linalg.norm(lab - srgb_to_oklab(np.full(3, 0.5)), axis=1)
+    chosen = np.empty(n_new, dtype=int)
+    for i in range(n_new):
+        chosen[i] = np.argmax(min_dist)
+        np.minimum(min_dist, np.linalg.norm(lab - lab[chosen[i]], axis=1), out=min_dist)
+    return tuple(_rgba_to_hex(np.column_stack([rgb[chosen], np.ones(n_new)])))
+
+
+def distinct_colors(
+    n: int,
+    base: Colors | None = None,
+    lightness: tuple[float, float] = (0.45, 0.85),
+    min_chroma: float = 0.05,
+    n_candidates: int = 20000,
+    seed: int = 0,
+) -> Colors:
+    """Generate a palette of `n` maximally distinguishable colors.
+
+    Colors are chosen greedily from random candidates, each new color being the candidate farthest (in the perceptually
+    uniform Oklab space) from all colors chosen so far, starting from the colors in `base`. Results are memoized by
+    (base palette, n, constraints).
+
+    Args:
+        n (int): The number of colors.
+        base (Colors, optional): A palette to extend, e.g. `cambridge_core`. Its colors come first in the result and
+            keep their names. If it has at least `n` colors, its first `n` colors are returned. Defaults to None.
+        lightness (tuple[float, float], optional): The range of Oklab lightness of new colors, to avoid colors that are
+            too dark or too close to a white background. Defaults to (0.45, 0.85).
+        min_chroma (float, optional): The minimum Oklab chroma of new colors, to avoid greys. Defaults to 0.05.
+        n_candidates (int, optional): The number of random candidate colors. Defaults to 20000.
+        seed (int, optional): The seed of the candidate colors. Defaults to 0.
+
+    Returns:
+        palette (Colors): The palette with `n` colors.
+    """
+    base = Colors({}) if base is None else base
+    if n <= len(base):
+        return base[:n]
+    new_colors = _distinct_colors(tuple(base.colors.values()), n, tuple(lightness), min_chroma, n_candidates, seed)
+    colors = dict(base.colors)
+    colors.update((str(i), color) for i, color in enumerate(new_colors, start=len(base)))
+    return Colors(colors)
+
+
 cambridge_special = Colors(
     # Cambridge colour palettes from: https://www.cam.ac.uk/system/files/guidelines_v8_december_2019.pdf#page=17
     colors={"cambridge_blue": "#a3c1ad", "logo_red": "#ef3340", "logo_yellow": "#ffd100"}
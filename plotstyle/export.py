@@ -1,17 +1,44 @@
 from __future__ import annotations
 
+import contextlib
 import datetime
+import io
+import json
+import logging
 import os
+import pickle
 import re
-from typing import Optional
+import zipfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, TimeoutError, wait
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-import matplotlib.pyplot as plt
+from .profiling import profiled
+from .size import GOLDEN_RATIO, WIDTH, get_dim
 
-__all__ = ["save_timestamped_figure"]
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.transforms import Bbox
+
+    from .cache import FigureCache
+
+__all__ = [
+    "BackgroundFigureSaver",
+    "PdfReportWriter",
+    "export_size_report",
+    "restyle_pickled_figures",
+    "save_timestamped_figure",
+    "save_timestamped_figures",
+    "size_optimized_export",
+]
+
+_log = logging.getLogger(__name__)
 
 _VALID_EXTENSIONS = ("pdf", "png", "jpg", "jpeg", "svg", "eps")
 
 
+@profiled
 def save_timestamped_figure(
     name: str,
     save_dir: str | None = None,
@@ -19,6 +46,11 @@ def save_timestamped_figure(
     file_types: str | list[str] = ["pdf", "png"],
     date_format: str = "v%Y-%m-%d-%H-%M",
     bbox_inches: Optional[str] = "tight",
+    render_once: bool = False,
+    cache: bool | FigureCache = False,
+    optimize_size: bool = False,
+    rasterize_threshold: int | None = None,
+    layout: str | None = None,
     **savefig_kwargs,
 ) -> list[str]:
     """Save a figure with a time stamp in the file name.
@@ -36,6 +68,23 @@ def save_timestamped_figure(
         bbox_inches (str, optional): The bounding box to use. Defaults to "tight", which ensures that all elements of
             the figure are included in the saved image, even if they are outside the axes limits. If None, the figure
             is saved with the default bounding box.
+        render_once (bool, optional): If True, the figure is drawn once with Agg to compute the layout and tight
+            bounding box, which are then reused for every file type instead of being recomputed by each `savefig`
+            call. PNG and JPEG files are cropped from that same draw where possible, so they may differ from a
+            separate `savefig` by up to a pixel. Defaults to False.
+        cache (bool or FigureCache, optional): If set, the figure's data, artist properties, the active rcParams,
+            `name` and the save options are hashed, and if an identical figure was already saved under the same name
+            to the same directory, the existing files are reused instead of rendering the figure. Pass a
+            `plotstyle.cache.FigureCache` to hard-link hits to new timestamped paths or to evict old versions. Defaults
+            to False.
+        optimize_size (bool, optional): If True, PDF files embed subsetted TrueType (Type 42) fonts instead of Type 3
+            fonts and are compressed at the highest level, see `size_optimized_export`. Defaults to False.
+        rasterize_threshold (int, optional): If given, lines and collections with more than this many points are
+            rasterized (at the savefig dpi) in vector files. Defaults to None.
+        layout (str, optional): How to lay out the figure before saving. "tight" calls `tight_layout`. "grid" sets
+            margins computed from the active style's font sizes without measuring text, see
+            `plotstyle.layout.apply_grid_layout`. `bbox_inches` applies either way, pass None to also skip measuring
+            text when saving. Defaults to None, in which case the figure's layout is kept.
         **savefig_kwargs: Additional keyword arguments to pass to `plt.savefig`. See
             https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.savefig.html for details.
 
@@ -64,25 +113,794 @@ def save_timestamped_figure(
     # get the current time stamp
     timestamp = datetime.datetime.now().strftime(date_format)
 
+    if fig is None:
+        import matplotlib.pyplot as plt
+
+        fig = plt.gcf()
+
+    if layout == "tight":
+        fig.tight_layout()
+    elif layout == "grid":
+        from .layout import apply_grid_layout
+
+        apply_grid_layout(fig)
+    elif layout is not None:
+        raise ValueError(f'`layout` must be "tight", "grid" or None, not {layout!r}.')
+
+    saved_figure_paths = [f"{name}_{timestamp}.{file_type}" for file_type in file_types]
+
+    # reuse identical figures that were saved before
+    if cache:
+        from .cache import FigureCache, figure_hash
+
+        figure_cache = cache if isinstance(cache, FigureCache) else FigureCache()
+        key = figure_hash(
+            fig,
+            os.path.basename(name),
+            file_types,
+            bbox_inches,
+            render_once,
+            optimize_size,
+            rasterize_threshold,
+            savefig_kwargs,
+        )
+        cached_paths = figure_cache.lookup(key, saved_figure_paths)
+        if cached_paths is not None:
+            return cached_paths
+
     # save the figure(s)
-    saved_figure_paths = []
+    optimized: contextlib.AbstractContextManager
+    if optimize_size or rasterize_threshold is not None:
+        optimized = size_optimized_export(fig, fonts=optimize_size, rasterize_threshold=rasterize_threshold)
+    else:
+        optimized = contextlib.nullcontext()
+    with optimized:
+        if render_once:
+            _save_rendered_once(fig, saved_figure_paths, bbox_inches, savefig_kwargs)
+        else:
+            for fname in saved_figure_paths:
+                fig.savefig(
+                    fname,
+                    bbox_inches=bbox_inches,
+                    **savefig_kwargs,
+                )
+
+    if cache:
+        figure_cache.add(key, name, saved_figure_paths)
+
+    # return the file name
+    return saved_figure_paths
+
+
+# Embed subsetted TrueType fonts rather than Type 3 fonts, and compress PDF streams at the highest level. PostScript is
+# left alone, as matplotlib embeds whole Type 42 fonts in EPS files, which makes them larger
+_SIZE_OPTIMIZED_RC: dict[Any, Any] = {"pdf.fonttype": 42, "pdf.compression": 9}
+
+
+def _artist_size(artist) -> int:
+    """Return the number of points (or paths) drawn by a line or collection."""
+    import numpy as np
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+
+    if isinstance(artist, Line2D):
+        return len(np.asarray(artist.get_xydata()))
+    if isinstance(artist, Collection):
+        return max(len(np.asarray(artist.get_offsets())), len(artist.get_paths()))
+    return 0
+
+
+@contextlib.contextmanager
+def size_optimized_export(
+    fig: plt.Figure, fonts: bool = True, rasterize_threshold: int | None = None
+) -> Iterator[list]:
+    """Context manager under which vector files of `fig` are saved smaller.
+
+    Matplotlib already embeds only the glyphs a figure uses. With `fonts`, PDF files embed fonts as subsetted TrueType
+    (Type 42) fonts, which are smaller than the default Type 3 fonts (e.g. by about a fifth for the serif "no-latex"
+    style, less for sans-serif styles), and compress streams at the highest level. Subsetting Type 42 fonts requires
+    matplotlib>=3.5, older versions embed the whole font, which can make files larger. EPS files are unchanged, as
+    Type 42 fonts make them larger, and so are SVG files, which draw text as paths (set `svg.fonttype` to "none" to
+    store text as text instead, at the cost of depending on the fonts installed where the SVG is viewed). Dense lines
+    and collections, such as large scatter plots, can additionally be rasterized in all vector formats, while axes,
+    labels and text stay vector graphics.
+
+    Args:
+        fig (plt.Figure): The figure to save.
+        fonts (bool, optional): Whether to embed Type 42 fonts in PDF files and maximize PDF compression. Defaults to
+            True.
+        rasterize_threshold (int, optional): If given, lines and collections with more than this many points are
+            rasterized while the context is active. Defaults to None.
+
+    Yields:
+        rasterized (list): The artists that were rasterized. They are restored when the context exits.
+    """
+    import matplotlib as mpl
+
+    rasterized = []
+    if rasterize_threshold is not None:
+        for ax in fig.axes:
+            for artist in [*ax.lines, *ax.collections]:
+                if not artist.get_rasterized() and _artist_size(artist) > rasterize_threshold:
+                    artist.set_rasterized(True)
+                    rasterized.append(artist)
+    try:
+        with mpl.rc_context(_SIZE_OPTIMIZED_RC if fonts else {}):
+            yield rasterized
+    finally:
+        for artist in rasterized:
+            artist.set_rasterized(False)
+
+
+def export_size_report(
+    fig: plt.Figure,
+    file_types: str | list[str] = ["pdf", "svg"],
+    rasterize_threshold: int | None = None,
+    **savefig_kwargs,
+) -> dict[str, tuple[int, int]]:
+    """Report how much smaller `size_optimized_export` makes the files of a figure.
+
+    The figure is saved in memory once with the active settings and once size-optimized, nothing is written to disk.
+
+    Args:
+        fig (plt.Figure): The figure to save.
+        file_types (str or list[str], optional): The file types to compare. Defaults to ["pdf", "svg"].
+        rasterize_threshold (int, optional): See `size_optimized_export`. Defaults to None.
+        **savefig_kwargs: Additional keyword arguments to pass to `fig.savefig`.
+
+    Returns:
+        sizes (dict[str, tuple[int, int]]): Maps each file type to its (default, optimized) size in bytes.
+    """
+    if isinstance(file_types, str):
+        file_types = [file_types]
+
+    def size(file_type: str) -> int:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=file_type, **savefig_kwargs)
+        return buffer.tell()
+
+    sizes = {}
     for file_type in file_types:
-        fname = f"{name}_{timestamp}.{file_type}"
-        save_func = plt.savefig if fig is None else fig.savefig
-        save_func(
-            fname,
-            bbox_inches=bbox_inches,
-            **savefig_kwargs,
+        default = size(file_type)
+        with size_optimized_export(fig, rasterize_threshold=rasterize_threshold):
+            sizes[file_type] = (default, size(file_type))
+        _log.info(
+            "%s: %d -> %d bytes (%+.0f%%)", file_type, *sizes[file_type], 100 * (sizes[file_type][1] / default - 1)
         )
-        saved_figure_paths.append(fname)
+    return sizes
 
-    # return the file name
+
+_RASTER_EXTENSIONS = ("png", "jpg", "jpeg")
+
+
+def _save_rendered_once(
+    fig: plt.Figure, fnames: list[str], bbox_inches: str | Bbox | None, savefig_kwargs: dict
+) -> None:
+    """Save `fig` to all `fnames`, drawing the artist tree for layout and tight bbox computation only once."""
+    import matplotlib as mpl
+    import matplotlib.image
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    dpi = savefig_kwargs.get("dpi", mpl.rcParams["savefig.dpi"])
+    if dpi == "figure":
+        dpi = fig.dpi
+    savefig_kwargs = {key: value for key, value in savefig_kwargs.items() if key != "dpi"}
+    bbox_extra_artists = savefig_kwargs.pop("bbox_extra_artists", None)
+    pad_inches = savefig_kwargs.pop("pad_inches", None)
+    if bbox_inches is None:
+        bbox_inches = mpl.rcParams["savefig.bbox"]
+
+    # Draw once with Agg at the output resolution; this also runs the layout engine
+    orig_canvas, orig_dpi = fig.canvas, fig.dpi
+    canvas = FigureCanvasAgg(fig)
+    try:
+        fig.dpi = dpi
+        canvas.draw()
+        if bbox_inches == "tight":
+            if pad_inches in (None, "layout"):
+                pad_inches = mpl.rcParams["savefig.pad_inches"]
+            bbox_inches = fig.get_tightbbox(canvas.get_renderer(), bbox_extra_artists=bbox_extra_artists).padded(
+                pad_inches
+            )
+        rgba = canvas.buffer_rgba()
+        raster = _crop_raster(rgba, bbox_inches, dpi) if _can_reuse_raster(savefig_kwargs) else None
+    finally:
+        fig.dpi = orig_dpi
+        fig.set_canvas(orig_canvas)
+
+    # The layout has been computed by the draw above, so freeze it for the remaining draws
+    layout_engine = fig.get_layout_engine() if hasattr(fig, "get_layout_engine") else None
+    if layout_engine is not None:
+        fig.set_layout_engine("none")
+    try:
+        for fname in fnames:
+            file_type = fname.rsplit(".", 1)[-1]
+            if file_type in _RASTER_EXTENSIONS and raster is not None:
+                # `print_jpg` blends against white, see matplotlib.backends.backend_agg
+                with mpl.rc_context({"savefig.facecolor": "white"}):
+                    mpl.image.imsave(fname, raster, format=file_type, dpi=dpi)
+            else:
+                fig.savefig(fname, dpi=dpi, bbox_inches=bbox_inches, **savefig_kwargs)
+    finally:
+        if layout_engine is not None:
+            fig.set_layout_engine(layout_engine)
+
+
+def _can_reuse_raster(savefig_kwargs: dict) -> bool:
+    """Whether the Agg draw of the figure matches what `savefig` would rasterize."""
+    import matplotlib as mpl
+
+    return (
+        not savefig_kwargs
+        and not mpl.rcParams["savefig.transparent"]
+        and mpl.rcParams["savefig.facecolor"] == "auto"
+        and mpl.rcParams["savefig.edgecolor"] == "auto"
+    )
+
+
+def _crop_raster(rgba, bbox_inches, dpi: float):
+    """Crop an RGBA buffer of the full figure to `bbox_inches`, or return None if the bbox exceeds the figure."""
+    import numpy as np
+
+    rgba = np.asarray(rgba)
+    if bbox_inches is None or isinstance(bbox_inches, str):
+        return rgba.copy()
+    height, width = rgba.shape[:2]
+    x0 = int(round(bbox_inches.x0 * dpi))
+    y0 = int(round(height - bbox_inches.y1 * dpi))
+    x1 = x0 + int(bbox_inches.width * dpi)
+    y1 = y0 + int(bbox_inches.height * dpi)
+    if x0 < 0 or y0 < 0 or x1 > width or y1 > height:
+        return None
+    return rgba[y0:y1, x0:x1].copy()
+
+
+def _init_export_worker(backend: str) -> None:
+    import matplotlib as mpl
+
+    mpl.use(backend)
+
+
+def _snapshot_rc_params() -> dict:
+    import matplotlib as mpl
+
+    from .styles import _style_blacklist
+
+    blacklist = _style_blacklist()
+    return {key: value for key, value in mpl.rcParams.items() if key not in blacklist}
+
+
+def _save_pickled_figure(fig_bytes: bytes, name: str, rc: dict, save_kwargs: dict) -> list[str]:
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
+    # Save-time settings (e.g. `savefig.*`, `pdf.fonttype`) are read from the rcParams active in the calling process
+    with mpl.rc_context(rc):
+        fig = pickle.loads(fig_bytes)
+        try:
+            return save_timestamped_figure(name, fig=fig, **save_kwargs)
+        finally:
+            plt.close(fig)
+
+
+def save_timestamped_figures(
+    figures: Iterable[tuple[plt.Figure, str]],
+    save_dir: str | None = None,
+    file_types: str | list[str] = ["pdf", "png"],
+    max_workers: int | None = None,
+    max_pending: int | None = None,
+    backend: str = "agg",
+    close: bool = True,
+    **save_kwargs,
+) -> list[list[str]]:
+    """Save many figures with a time stamp in the file name, rendering them across a process pool.
+
+    Each figure is pickled and handed to a worker process, which saves it in all requested file types via
+    `save_timestamped_figure`. Figures are closed in the calling process as soon as they are handed off, and at most
+    `max_pending` figures are in flight at once, so memory stays bounded for long iterables. The rcParams active
+    when a figure is handed off are also applied in the worker while saving it.
+
+    Args:
+        figures (Iterable[tuple[plt.Figure, str]]): Pairs of (figure, name), where name is passed on to
+            `save_timestamped_figure`. May be a generator that creates figures on demand.
+        save_dir (str, optional): The directory to save the figures in. See `save_timestamped_figure`.
+        file_types (str or list[str], optional): The file types to save each figure as. Defaults to ["pdf", "png"].
+        max_workers (int, optional): The number of worker processes. Defaults to None, in which case the number of
+            CPUs is used. If 0, the figures are saved serially in the calling process.
+        max_pending (int, optional): The maximum number of figures in flight. Defaults to twice the number of workers.
+        backend (str, optional): The matplotlib backend pinned in each worker. Defaults to "agg", which also dispatches
+            to the pdf, svg and ps backends for vector file types.
+        close (bool, optional): Whether to close each figure in the calling process once it has been handed off.
+            Defaults to True.
+        **save_kwargs: Additional keyword arguments to pass to `save_timestamped_figure`.
+
+    Returns:
+        saved_figure_paths (list[list[str]]): For each input figure, in order, the list of paths to the saved files.
+    """
+    import matplotlib.pyplot as plt
+
+    save_kwargs.update(save_dir=save_dir, file_types=file_types)
+
+    if max_workers == 0:
+        saved_figure_paths = []
+        for fig, name in figures:
+            saved_figure_paths.append(save_timestamped_figure(name, fig=fig, **save_kwargs))
+            if close:
+                plt.close(fig)
+        return saved_figure_paths
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * max_workers
+
+    futures: list[Future] = []
+    with ProcessPoolExecutor(max_workers, initializer=_init_export_worker, initargs=(backend,)) as executor:
+        for fig, name in figures:
+            # Wait for the oldest figure before handing off more than `max_pending`
+            if len(futures) >= max_pending:
+                futures[len(futures) - max_pending].result()
+            futures.append(
+                executor.submit(_save_pickled_figure, pickle.dumps(fig), name, _snapshot_rc_params(), save_kwargs)
+            )
+            if close:
+                plt.close(fig)
+        return [future.result() for future in futures]
+
+
+_PICKLE_EXTENSIONS = (".pickle", ".pkl")
+_RESTYLE_MANIFEST = ".plotstyle-restyle.jsonl"
+
+
+def _iter_pickled_figures(source_dir: str) -> Iterator[tuple[str, str]]:
+    """Yield (path, name) for each pickled figure below `source_dir`, where name is the path relative to `source_dir`
+    without extension. Directories are walked lazily in sorted order."""
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for fname in sorted(files):
+            stem, ext = os.path.splitext(fname)
+            if ext in _PICKLE_EXTENSIONS:
+                path = os.path.join(root, fname)
+                yield path, os.path.relpath(os.path.join(root, stem), source_dir)
+
+
+def _read_restyle_manifest(manifest: str) -> dict[str, dict]:
+    """Read the completed entries of a restyle manifest, keyed by figure name. Later entries take precedence."""
+    done: dict[str, dict] = {}
+    if not os.path.exists(manifest):
+        return done
+    with open(manifest) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if "paths" in entry:
+                done[entry["name"]] = entry
+    return done
+
+
+def _restyle_pickled_figure(
+    path: str, name: str, style: str | list[str], figsize: tuple[float, float], save_kwargs: dict
+) -> list[str]:
+    import matplotlib.pyplot as plt
+
+    from .patch import patch_figure
+    from .styles import style_context
+
+    save_dir = save_kwargs.get("save_dir")
+    os.makedirs(os.path.dirname(os.path.join(save_dir or "", name)) or ".", exist_ok=True)
+    with open(path, "rb") as f:
+        fig = pickle.load(f)
+    try:
+        # Save-time settings of the style (e.g. `savefig.*`, `pdf.fonttype`) apply to the export as well
+        with style_context(style):
+            patch_figure(style, figsize, fig=fig)
+            return save_timestamped_figure(name, fig=fig, **save_kwargs)
+    finally:
+        plt.close(fig)
+
+
+def restyle_pickled_figures(
+    source_dir: str,
+    style: str | list[str],
+    width: float = WIDTH.latex_default_article,
+    save_dir: str | None = None,
+    fraction_of_line_width: float = 1.0,
+    ratio: float = GOLDEN_RATIO,
+    manifest: str | None = None,
+    max_workers: int | None = None,
+    max_pending: int | None = None,
+    backend: str = "agg",
+    **save_kwargs,
+) -> dict[str, list[str]]:
+    """Restyle and re-export every pickled figure in a directory.
+
+    Figures pickled with `pickle.dump(fig, f)` (files ending in ".pickle" or ".pkl", searched recursively) are loaded
+    one by one in worker processes, restyled with `plotstyle.patch.patch_figure` at the size given by
+    `plotstyle.size.get_dim` and saved with `save_timestamped_figure`. Only file paths are handed to the workers and at
+    most `max_pending` figures are in flight, so memory stays bounded regardless of the number of figures.
+
+    Progress is appended to a JSON lines manifest as figures complete. When run again with the same style, size and save
+    options, figures listed in the manifest whose pickle has not changed since are skipped, so an interrupted run can be
+    resumed.
+
+    Example:
+        >>> from plotstyle.size import WIDTH
+        >>> restyle_pickled_figures(  # doctest: +SKIP
+        ...     "results/figures", ["science", "nature"], width=WIDTH.nature_column, save_dir="paper/figures"
+        ... )
+
+    Args:
+        source_dir (str): The directory containing the pickled figures.
+        style (str or list[str]): The style (or list of styles) to apply, e.g. `["science", "nature"]`.
+        width (float, optional): The target text width in pt, e.g. `WIDTH.nature_column`. Defaults to
+            `WIDTH.latex_default_article` (345.0pt).
+        save_dir (str, optional): The directory to save the figures in. The directory structure below `source_dir` is
+            kept. Defaults to None, in which case the figures are saved next to their pickles.
+        fraction_of_line_width (float, optional): Fraction of `width` the figures occupy. Defaults to 1.
+        ratio (float, optional): Height to width ratio of the figures. Defaults to the golden ratio (5 ** 0.5 - 1)/2.
+        manifest (str, optional): Path of the progress manifest. Defaults to ".plotstyle-restyle.jsonl" in `save_dir`.
+        max_workers (int, optional): The number of worker processes. Defaults to None, in which case the number of
+            CPUs is used. If 0, the figures are restyled serially in the calling process.
+        max_pending (int, optional): The maximum number of figures in flight. Defaults to twice the number of workers.
+        backend (str, optional): The matplotlib backend pinned in each worker. Defaults to "agg".
+        **save_kwargs: Additional keyword arguments to pass to `save_timestamped_figure`, e.g. `file_types`.
+
+    Returns:
+        saved_figure_paths (dict[str, list[str]]): Maps the name of each figure (its path relative to `source_dir`,
+            without extension) to the paths of its saved files, including figures completed by earlier runs. Figures
+            that failed to load or save are logged and left out, and are retried on the next run.
+    """
+    figsize = get_dim(width, fraction_of_line_width=fraction_of_line_width, ratio=ratio)
+    save_dir = source_dir if save_dir is None else save_dir
+    os.makedirs(save_dir, exist_ok=True)
+    save_kwargs.update(save_dir=save_dir)
+    if manifest is None:
+        manifest = os.path.join(save_dir, _RESTYLE_MANIFEST)
+    # Figures are only skipped on resume if they were exported with the same settings
+    settings = json.loads(json.dumps({"style": style, "figsize": figsize, "save_kwargs": save_kwargs}, default=repr))
+
+    done = _read_restyle_manifest(manifest)
+    saved_figure_paths = {}
+
+    def pending_figures() -> Iterator[dict]:
+        for path, name in _iter_pickled_figures(source_dir):
+            stat = os.stat(path)
+            entry = {"name": name, "source": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, **settings}
+            previous = done.get(name)
+            if previous is not None and all(previous.get(key) == value for key, value in entry.items()):
+                saved_figure_paths[name] = previous["paths"]
+                continue
+            yield entry
+
+    with open(manifest, "a") as manifest_file:
+
+        def record(entry: dict, get_paths: Callable[[], list[str]]) -> None:
+            try:
+                paths = get_paths()
+            except Exception as e:
+                _log.warning("Failed to restyle %s: %s", entry["source"], e)
+                return
+            entry["paths"] = saved_figure_paths[entry["name"]] = paths
+            manifest_file.write(json.dumps(entry) + "\n")
+            manifest_file.flush()
+
+        if max_workers == 0:
+            for entry in pending_figures():
+                record(
+                    entry, lambda: _restyle_pickled_figure(entry["source"], entry["name"], style, figsize, save_kwargs)
+                )
+            return saved_figure_paths
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_pending is None:
+            max_pending = 2 * max_workers
+
+        in_flight: deque[tuple[dict, Future]] = deque()
+        with ProcessPoolExecutor(max_workers, initializer=_init_export_worker, initargs=(backend,)) as executor:
+            for entry in pending_figures():
+                # Wait for the oldest figure before handing off more than `max_pending`
+                if len(in_flight) >= max_pending:
+                    oldest, future = in_flight.popleft()
+                    record(oldest, future.result)
+                future = executor.submit(
+                    _restyle_pickled_figure, entry["source"], entry["name"], style, figsize, save_kwargs
+                )
+                in_flight.append((entry, future))
+            for entry, future in in_flight:
+                record(entry, future.result)
     return saved_figure_paths
 
 
+class PdfReportWriter:
+    """Streaming writer that appends figures to a single multi-page PDF, and optionally a zip of PNGs.
+
+    Each figure is restyled, written as the next page and closed immediately, so memory stays flat however many
+    figures the report has. Fonts are embedded once for the whole PDF and shared by all pages, instead of once per
+    file as with `save_timestamped_figure`.
+
+    Example:
+        >>> report = PdfReportWriter("report", style=["science", "nature"], width=WIDTH.nature_column)  # doctest: +SKIP
+        >>> with report:  # doctest: +SKIP
+        ...     for run in runs:
+        ...         fig, ax = plt.subplots()
+        ...         ax.plot(run.loss)
+        ...         report.add(fig, name=run.name)
+
+    Args:
+        name (str): The base name of the report (without timestamp), see `save_timestamped_figure`.
+        save_dir (str, optional): The directory to save the report in. Defaults to None, in which case the report is
+            saved relative to the current working directory.
+        style (str or list[str], optional): The style (or list of styles) applied to every figure with
+            `plotstyle.patch.patch_figure`. Defaults to None, in which case figures are not restyled.
+        width (float, optional): If given, every figure is resized to this text width in pt, e.g.
+            `WIDTH.nature_column`, see `plotstyle.size.get_dim`. Defaults to None, in which case figures keep their
+            size.
+        fraction_of_line_width (float, optional): Fraction of `width` the figures occupy. Defaults to 1.
+        ratio (float, optional): Height to width ratio of the figures. Defaults to the golden ratio (5 ** 0.5 - 1)/2.
+        png_zip (bool, optional): If True, every page is also saved as a PNG in a zip archive next to the PDF.
+            Defaults to False.
+        date_format (str, optional): The format of the time stamp. Defaults to "v%Y-%m-%d-%H-%M".
+        bbox_inches (str, optional): The bounding box of each page, see `save_timestamped_figure`. Defaults to "tight".
+        optimize_size (bool, optional): See `save_timestamped_figure`. Defaults to False.
+        rasterize_threshold (int, optional): See `save_timestamped_figure`. Defaults to None.
+        metadata (dict, optional): PDF metadata, e.g. {"Title": ...}, see `matplotlib.backends.backend_pdf.PdfPages`.
+            Defaults to None.
+        **savefig_kwargs: Additional keyword arguments to pass to `savefig` for each page, e.g. `dpi`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        save_dir: str | None = None,
+        style: str | list[str] | None = None,
+        width: float | None = None,
+        fraction_of_line_width: float = 1.0,
+        ratio: float = GOLDEN_RATIO,
+        png_zip: bool = False,
+        date_format: str = "v%Y-%m-%d-%H-%M",
+        bbox_inches: Optional[str] = "tight",
+        optimize_size: bool = False,
+        rasterize_threshold: int | None = None,
+        metadata: dict | None = None,
+        **savefig_kwargs,
+    ) -> None:
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+            if os.path.isabs(name):
+                raise ValueError("If `save_dir` is given, name must be a relative path.")
+            name = os.path.join(save_dir, name)
+        name = re.sub(r"\.pdf$", "", name)
+        timestamp = datetime.datetime.now().strftime(date_format)
+
+        self.style = style
+        self.figsize = (
+            None if width is None else get_dim(width, fraction_of_line_width=fraction_of_line_width, ratio=ratio)
+        )
+        self.bbox_inches = bbox_inches
+        self.optimize_size = optimize_size
+        self.rasterize_threshold = rasterize_threshold
+        self.savefig_kwargs = savefig_kwargs
+        self.num_pages = 0
+
+        self.path = f"{name}_{timestamp}.pdf"
+        self.png_path = f"{name}_{timestamp}.zip" if png_zip else None
+        # Fonts are embedded when the PDF is closed, with the font type active at that point
+        self._rc: dict[Any, Any] = _SIZE_OPTIMIZED_RC if optimize_size else {}
+        self._pdf: PdfPages | None = PdfPages(self.path, metadata=metadata)
+        self._zip = zipfile.ZipFile(self.png_path, "w") if self.png_path is not None else None
+        self._png_names: set[str] = set()
+
+    def _styled(self) -> contextlib.AbstractContextManager:
+        if self.style is None:
+            return contextlib.nullcontext()
+        from .styles import style_context
+
+        return style_context(self.style)
+
+    def add(self, fig: plt.Figure | None = None, name: str | None = None, close: bool = True) -> int:
+        """Restyle a figure and append it to the report as the next page.
+
+        Args:
+            fig (plt.Figure, optional): The figure to add. Defaults to None, in which case the current figure is added.
+            name (str, optional): The name of the PNG of this page in the zip archive, without extension. A name that
+                is already in the archive gets a counter suffix, e.g. "-2". Defaults to None, in which case the page
+                number is used.
+            close (bool, optional): Whether to close the figure once it is written. Defaults to True.
+
+        Returns:
+            page (int): The page number of the figure, starting at 1.
+        """
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        if self._pdf is None:
+            raise ValueError("Cannot add figures to a closed report.")
+        if fig is None:
+            fig = plt.gcf()
+
+        try:
+            with self._styled():
+                if self.style is not None:
+                    from .patch import patch_figure
+
+                    patch_figure(self.style, self.figsize, fig=fig)
+                elif self.figsize is not None:
+                    fig.set_size_inches(self.figsize)
+
+                with size_optimized_export(fig, fonts=False, rasterize_threshold=self.rasterize_threshold):
+                    with mpl.rc_context(self._rc):
+                        self._pdf.savefig(fig, bbox_inches=self.bbox_inches, **self.savefig_kwargs)
+                    if self._zip is not None:
+                        buffer = io.BytesIO()
+                        fig.savefig(buffer, format="png", bbox_inches=self.bbox_inches, **self.savefig_kwargs)
+                        # PNGs are already compressed
+                        self._zip.writestr(f"{self._png_name(name)}.png", buffer.getvalue())
+        finally:
+            if close:
+                plt.close(fig)
+        self.num_pages += 1
+        return self.num_pages
+
+    def _png_name(self, name: str | None) -> str:
+        base = name or f"page-{self.num_pages + 1:04d}"
+        png_name, count = base, 1
+        while png_name in self._png_names:
+            count += 1
+            png_name = f"{base}-{count}"
+        self._png_names.add(png_name)
+        return png_name
+
+    def close(self) -> list[str]:
+        """Finish the report and return the paths of the saved files."""
+        import matplotlib as mpl
+
+        if self._pdf is not None:
+            with mpl.rc_context(self._rc):
+                self._pdf.close()
+            self._pdf = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        return [self.path] if self.png_path is None else [self.path, self.png_path]
+
+    def __enter__(self) -> PdfReportWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BackgroundFigureSaver:
+    """Non-blocking variant of `save_timestamped_figure` that saves figures in background worker processes.
+
+    `submit` only snapshots the figure (by pickling it together with the active rcParams) and returns a future, so the
+    caller does not wait for rendering, encoding or disk I/O. Use as a context manager, or call `close` when done.
+
+    Example:
+        >>> with BackgroundFigureSaver(max_pending=4) as saver:  # doctest: +SKIP
+        ...     for step in range(num_steps):
+        ...         if step % 100 == 0:
+        ...             saver.submit(f"loss_{step}", fig=fig, save_dir="figures")
+
+    Args:
+        max_workers (int, optional): The number of worker processes. Defaults to 1.
+        max_pending (int, optional): The maximum number of snapshots queued or being saved. Defaults to 8.
+        policy (str, optional): What `submit` does when `max_pending` snapshots are pending. One of "block" (wait for
+            the oldest to finish), "drop_oldest" (cancel the oldest snapshot that has not started yet, blocking if all
+            have started) or "drop_newest" (do not save the new snapshot). Defaults to "block".
+        backend (str, optional): The matplotlib backend pinned in each worker. Defaults to "agg".
+    """
+
+    _POLICIES = ("block", "drop_oldest", "drop_newest")
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 8, policy: str = "block", backend: str = "agg") -> None:
+        if policy not in self._POLICIES:
+            raise ValueError(f"Unrecognized policy {policy}. Valid policies are {self._POLICIES}.")
+        if max_pending < 1:
+            raise ValueError("`max_pending` must be at least 1.")
+        self.max_pending = max_pending
+        self.policy = policy
+        self._executor = ProcessPoolExecutor(max_workers, initializer=_init_export_worker, initargs=(backend,))
+        self._pending: deque[Future] = deque()
+        self._submitted: list[Future] = []
+
+    def submit(self, name: str, fig: plt.Figure | None = None, **save_kwargs) -> Future:
+        """Snapshot a figure and schedule it to be saved with `save_timestamped_figure`.
+
+        Args:
+            name (str): The base name of the figure, see `save_timestamped_figure`.
+            fig (plt.Figure, optional): The figure to save. Defaults to None, in which case the current figure is saved.
+            **save_kwargs: Additional keyword arguments to pass to `save_timestamped_figure`.
+
+        Returns:
+            future (Future): Resolves to the list of saved paths. Cancelled if the snapshot was dropped.
+        """
+        if fig is None:
+            import matplotlib.pyplot as plt
+
+            fig = plt.gcf()
+        snapshot = pickle.dumps(fig)
+        rc = _snapshot_rc_params()
+
+        while self._pending and self._pending[0].done():
+            self._pending.popleft()
+        if len(self._pending) >= self.max_pending and not self._make_room():
+            future: Future = Future()
+            future.cancel()
+            return future
+
+        future = self._executor.submit(_save_pickled_figure, snapshot, name, rc, save_kwargs)
+        self._pending.append(future)
+        self._submitted.append(future)
+        return future
+
+    def _make_room(self) -> bool:
+        """Apply the backpressure policy. Returns False if the new snapshot should be dropped."""
+        if self.policy == "drop_newest":
+            return False
+        if self.policy == "drop_oldest":
+            for future in self._pending:
+                if future.cancel():
+                    self._pending.remove(future)
+                    return True
+        # Errors of earlier snapshots are raised by `flush` and `close`, not by submitting an unrelated figure
+        done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+        self._pending = deque(future for future in self._pending if future not in done)
+        return True
+
+    def flush(self, timeout: float | None = None) -> list[list[str]]:
+        """Wait until all submitted snapshots are saved.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait for all snapshots. Defaults to None (no
+                limit).
+
+        Returns:
+            saved_figure_paths (list[list[str]]): The saved paths of each snapshot submitted since the last flush, in
+                submission order. Dropped snapshots are skipped. Errors raised while saving are re-raised here.
+
+        Raises:
+            TimeoutError: If not all snapshots are saved within `timeout`. They stay tracked, so a later `flush`
+                returns their paths.
+        """
+        _, not_done = wait(self._submitted, timeout=timeout)
+        self._pending = deque(future for future in self._pending if future in not_done)
+        if not_done:
+            raise TimeoutError(f"{len(not_done)} of {len(self._submitted)} snapshots are not saved yet.")
+        submitted, self._submitted = self._submitted, []
+        return [future.result() for future in submitted if not future.cancelled()]
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the workers.
+
+        If `wait` is True, pending snapshots are saved first, and the first error raised while saving a snapshot that
+        was not flushed is re-raised. Otherwise pending snapshots are cancelled.
+        """
+        if not wait:
+            for future in self._pending:
+                future.cancel()
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self.flush()
+
+    def __enter__(self) -> BackgroundFigureSaver:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 if __name__ == "__main__":
     import os
 
+    import matplotlib.pyplot as plt
+
     # Test saving a random figure
     random_fig = plt.figure()
     plt.plot([1, 2, 3], [1, 2, 3])
@@ -0,0 +1,197 @@
+"""Font resolution for the bundled styles.
+
+Several stylesheets (e.g. `nature` and the `cjk-*-font` language styles) list font fallback chains, most of which are
+usually not installed. For each family that is not installed, matplotlib's font manager logs a warning and falls back
+to a scored search over all fonts. `resolve_font_rc` resolves a chain once against the installed fonts, caches the
+result on disk and returns rcParams that only name installed fonts, so rendering never hits that fallback path.
+
+Only the family names are cached, not the font files: matplotlib still maps each family to a file with its own
+`findfont` cache, and naming several families keeps its per-glyph fallback between them (e.g. for CJK text).
+
+Run `python -m plotstyle.fonts` to report which fonts of each bundled style are missing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Mapping
+from typing import Any
+
+from .cache import default_cache_dir
+
+__all__ = ["font_chain", "installed_families", "preflight", "resolve_font_rc"]
+
+_log = logging.getLogger(__name__)
+
+_GENERIC_FAMILIES = ("serif", "sans-serif", "cursive", "fantasy", "monospace")
+_FONT_CACHE_FILE = "fonts.json"
+
+# Resolved chains of this process, see `_resolve_chain`
+_resolved: dict[tuple[str, ...], list[str]] = {}
+
+
+def font_chain(rc: Mapping[str, Any]) -> list[str]:
+    """Return the ordered list of font families that text is rendered with under the rcParams `rc`.
+
+    Generic families in `font.family` (e.g. "sans-serif") are expanded into the corresponding list (e.g.
+    `font.sans-serif`). Keys missing from `rc` are read from the active rcParams.
+    """
+    import matplotlib as mpl
+
+    params: Any = mpl.rcParams
+
+    def get(key: str) -> list[str]:
+        value = rc[key] if key in rc else params[key]
+        return [value] if isinstance(value, str) else list(value)
+
+    chain: list[str] = []
+    for family in get("font.family"):
+        if family.lower() in _GENERIC_FAMILIES:
+            members = [member for member in get(f"font.{family.lower()}") if member.lower() not in _GENERIC_FAMILIES]
+        else:
+            members = [family]
+        chain += [member for member in members if member not in chain]
+    return chain
+
+
+def installed_families() -> dict[str, str]:
+    """Return a mapping from the lower case name of each installed font family to its name."""
+    from matplotlib.font_manager import fontManager
+
+    return {entry.name.lower(): entry.name for entry in fontManager.ttflist}
+
+
+def _fonts_fingerprint() -> str:
+    """Return a key that changes whenever the fonts known to matplotlib's font manager change."""
+    from matplotlib.font_manager import fontManager
+
+    fnames = sorted(entry.fname for entry in fontManager.ttflist)
+    return hashlib.sha256("\n".join(fnames).encode()).hexdigest()
+
+
+def _cache_path() -> str:
+    return os.path.join(default_cache_dir(), _FONT_CACHE_FILE)
+
+
+def _load_font_cache(fingerprint: str) -> dict[str, list[str]]:
+    try:
+        with open(_cache_path()) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("fonts") != fingerprint:
+        return {}
+    return cache["chains"]
+
+
+def _save_font_cache(fingerprint: str, chains: dict[str, list[str]]) -> None:
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically so concurrent processes never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fonts": fingerprint, "chains": chains}, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        _log.debug("Could not write font cache %s: %s", path, e)
+
+
+def _resolve_chain(chain: tuple[str, ...]) -> list[str]:
+    """Return the installed members of `chain`, in order, using the in-process and on-disk caches."""
+    if chain in _resolved:
+        return _resolved[chain]
+
+    fingerprint = _fonts_fingerprint()
+    cached = _load_font_cache(fingerprint)
+    key = json.dumps(chain)
+    if key not in cached:
+        installed = installed_families()
+        cached[key] = [installed[family.lower()] for family in chain if family.lower() in installed]
+        _save_font_cache(fingerprint, cached)
+    _resolved[chain] = cached[key]
+    return cached[key]
+
+
+def resolve_font_rc(rc: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the rcParams that replace the font fallback chain of `rc` with the installed fonts it names.
+
+    The chain (see `font_chain`) is resolved once against the fonts known to matplotlib and cached on disk, next to
+    the compiled style cache. The cache is invalidated when fonts are installed or removed.
+
+    Args:
+        rc (Mapping[str, Any]): The rcParams of a style, e.g. from `plotstyle.styles.resolve_style`.
+
+    Returns:
+        rc (dict): `font.family` set to the installed fonts of the chain, in order. If none of them are installed,
+            matplotlib's default fonts of the same generic family are used instead and a warning is logged.
+    """
+    import matplotlib as mpl
+
+    chain = font_chain(rc)
+    warn = tuple(chain) not in _resolved
+    families = _resolve_chain(tuple(chain))
+    if not families:
+        # Fall back to matplotlib's default fonts of the same generic families, e.g. DejaVu Serif for serif
+        family = rc["font.family"] if "font.family" in rc else mpl.rcParams["font.family"]
+        family = [family] if isinstance(family, str) else family
+        generic = [member for member in family if member.lower() in _GENERIC_FAMILIES]
+        defaults: Any = mpl.rcParamsDefault
+        default_rc = {**defaults, "font.family": generic or defaults["font.family"]}
+        families = _resolve_chain(tuple(font_chain(default_rc)))
+        if warn:
+            _log.warning("None of the fonts %s are installed, using %s instead.", chain, families)
+    return {"font.family": list(families)}
+
+
+def preflight(styles: list[str] | None = None) -> dict[str, dict[str, list[str]]]:
+    """Check which fonts requested by the bundled styles are installed.
+
+    Args:
+        styles (list[str], optional): The styles to check. Defaults to None, in which case all bundled styles that set
+            a font family are checked.
+
+    Returns:
+        report (dict): Maps each style to {"requested": [...], "installed": [...], "missing": [...]}.
+    """
+    from .styles import read_style, style_index
+
+    font_keys = {"font.family", *(f"font.{family}" for family in _GENERIC_FAMILIES)}
+    if styles is None:
+        styles = [name for name in style_index() if font_keys.intersection(read_style(name))]
+    installed = installed_families()
+    report = {}
+    for name in styles:
+        requested = font_chain(read_style(name))
+        report[name] = {
+            "requested": requested,
+            "installed": [family for family in requested if family.lower() in installed],
+            "missing": [family for family in requested if family.lower() not in installed],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    from .styles import read_style
+
+    parser = argparse.ArgumentParser(
+        prog="python -m plotstyle.fonts", description="Report missing fonts of the bundled styles."
+    )
+    parser.add_argument("styles", nargs="*", help="Styles to check. Defaults to all styles that set fonts.")
+    args = parser.parse_args()
+
+    report = preflight(args.styles or None)
+    for name, fonts in report.items():
+        status = "ok" if fonts["installed"] else "NO FONT INSTALLED"
+        print(f"{name}: {status}")
+        print(f"  installed: {', '.join(fonts['installed']) or '-'}")
+        if fonts["missing"]:
+            print(f"  missing:   {', '.join(fonts['missing'])}")
+        if fonts["installed"]:
+            # Populate the on-disk cache
+            resolve_font_rc(read_style(name))
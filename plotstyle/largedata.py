@@ -0,0 +1,307 @@
+"""Plotting helpers for large data.
+
+Drawing and exporting millions of points is slow, and most of them end up in the same pixel. `plot` decimates line
+data to a few points per pixel column of the axes, in a way that preserves the visual shape of the line, and `scatter`
+rasterizes or aggregates dense point clouds into an image. The thresholds and methods are configurable per style via
+`configure`.
+
+Decimation happens once, when the data is added, at the resolution of the axes in the saved figure (see
+`axes_pixel_size`). Set the figure size (e.g. with `plotstyle.size.get_dim`) before plotting.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import Collection
+    from matplotlib.image import AxesImage
+    from matplotlib.lines import Line2D
+
+    from .styles import StyleSpec
+
+__all__ = [
+    "axes_pixel_size",
+    "configure",
+    "decimate_lttb",
+    "decimate_minmax",
+    "large_data_options",
+    "plot",
+    "scatter",
+]
+
+_LINE_METHODS = ("minmax", "lttb")
+_SCATTER_MODES = ("rasterize", "aggregate")
+# The `ax.scatter` keyword arguments that also apply to the image of point counts, the others only apply to markers
+_IMAGE_KWARGS = ("cmap", "norm", "vmin", "vmax", "alpha", "zorder", "label", "url", "gid", "clip_on", "colorizer")
+
+_DEFAULT_OPTIONS: dict[str, Any] = {
+    # Lines with more points are decimated with `line_method`
+    "line_threshold": 20_000,
+    "line_method": "minmax",
+    # Scatters with more points are rasterized or aggregated into a 2D histogram image
+    "scatter_threshold": 100_000,
+    "scatter_mode": "rasterize",
+}
+
+# Options of the bundled styles, applied on top of the defaults in the order the styles are given
+_STYLE_OPTIONS: dict[str, dict[str, Any]] = {
+    # Marker-only lines with small markers, rasterize early
+    "scatter": {"line_threshold": 10_000, "scatter_threshold": 20_000},
+}
+
+
+def configure(style: str, **options) -> None:
+    """Set the large data options used under the style `style`.
+
+    Args:
+        style (str): The name of the style, e.g. "scatter".
+        **options: Any of "line_threshold" (int), "line_method" ("minmax" or "lttb"), "scatter_threshold" (int) and
+            "scatter_mode" ("rasterize" or "aggregate").
+    """
+    for key, value in options.items():
+        if key not in _DEFAULT_OPTIONS:
+            raise ValueError(f"Unrecognized option {key}. Valid options are {tuple(_DEFAULT_OPTIONS)}.")
+        if key == "line_method" and value not in _LINE_METHODS:
+            raise ValueError(f"Unrecognized line method {value}. Valid methods are {_LINE_METHODS}.")
+        if key == "scatter_mode" and value not in _SCATTER_MODES:
+            raise ValueError(f"Unrecognized scatter mode {value}. Valid modes are {_SCATTER_MODES}.")
+    _STYLE_OPTIONS.setdefault(style, {}).update(options)
+
+
+def large_data_options(style: StyleSpec | None = None) -> dict[str, Any]:
+    """Return the large data options of a style (or list of styles), later styles taking precedence."""
+    options = dict(_DEFAULT_OPTIONS)
+    styles = [] if style is None else [style] if isinstance(style, (str, dict)) else list(style)
+    for name in styles:
+        if isinstance(name, str):
+            options.update(_STYLE_OPTIONS.get(name, {}))
+    return options
+
+
+def axes_pixel_size(ax: plt.Axes, dpi: float | None = None) -> tuple[int, int]:
+    """Return the (width, height) of the axes in pixels when the figure is saved.
+
+    Args:
+        ax (plt.Axes): The axes.
+        dpi (float, optional): The resolution. Defaults to None, in which case `savefig.dpi` is used.
+    """
+    import matplotlib as mpl
+
+    fig = ax.get_figure()
+    if fig is None:
+        raise ValueError("The axes are not part of a figure.")
+    # The root figure, which holds the size also for axes in subfigures
+    fig = fig.figure
+    if dpi is None:
+        dpi = mpl.rcParams["savefig.dpi"]
+        if dpi == "figure":
+            dpi = fig.dpi
+    position = ax.get_position()
+    width_in, height_in = fig.get_size_inches()
+    return (
+        max(1, int(np.ceil(position.width * width_in * dpi))),
+        max(1, int(np.ceil(position.height * height_in * dpi))),
+    )
+
+
+def decimate_minmax(x: np.ndarray, y: np.ndarray, n_bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """Decimate a line to the first, last, minimum and maximum point of each of `n_bins` bins.
+
+    If `x` is sorted, the bins are equally wide intervals of `x` (e.g. the pixel columns of the axes), so the decimated
+    line is drawn identically to the full line at that resolution. Otherwise the bins hold equal numbers of points.
+    Gaps (NaN values in `y`) are kept. Runs in linear time.
+
+    Args:
+        x (np.ndarray): The x values.
+        y (np.ndarray): The y values.
+        n_bins (int): The number of bins, e.g. the width of the axes in pixels.
+
+    Returns:
+        x, y (np.ndarray): The decimated line, at most 4 * `n_bins` points plus one point per gap.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(x)
+    if n <= 4 * n_bins:
+        return x, y
+
+    span = x[-1] - x[0]
+    if span > 0 and np.all(x[1:] >= x[:-1]):
+        bins = np.minimum(((x - x[0]) * (n_bins / span)).astype(np.intp), n_bins - 1)
+    else:
+        bins = np.arange(n) * n_bins // n
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    ends = starts + counts - 1
+
+    keep = [starts, ends]
+    # Index of the first minimum and maximum of each bin, ignoring NaN
+    with np.errstate(invalid="ignore"):
+        for reduce in (np.fmin, np.fmax):
+            extrema = np.repeat(reduce.reduceat(y, starts), counts)
+            positions = np.flatnonzero(y == extrema)
+            if len(positions):
+                keep.append(positions[np.minimum(np.searchsorted(positions, starts), len(positions) - 1)])
+    nan = np.isnan(y)
+    keep.append(np.flatnonzero(nan & ~np.r_[False, nan[:-1]]))
+
+    index = np.unique(np.concatenate(keep))
+    return x[index], y[index]
+
+
+def decimate_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> tuple[np.ndarray, np.ndarray]:
+    """Decimate a line to `n_out` points with the Largest-Triangle-Three-Buckets algorithm.
+
+    LTTB keeps the point of each bucket that forms the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves the visual shape of the line with fewer points than min/max
+    decimation, but not every extreme value. `y` must not contain NaN values.
+
+    Args:
+        x (np.ndarray): The x values, sorted.
+        y (np.ndarray): The y values.
+        n_out (int): The number of points to keep, at least 3.
+
+    Returns:
+        x, y (np.ndarray): The decimated line.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    # Bucket boundaries of the n_out - 2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    index = np.empty(n_out, dtype=np.intp)
+    index[0], index[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        index[i + 1] = a
+    return x[index], y[index]
+
+
+def plot(
+    ax: plt.Axes,
+    x: np.ndarray,
+    y: np.ndarray,
+    *args,
+    style: StyleSpec | None = None,
+    dpi: float | None = None,
+    **kwargs,
+) -> list[Line2D]:
+    """Plot a long line series, decimated to the resolution of the axes.
+
+    Lines are decimated with the style's `line_method` to a few points per pixel column (see `decimate_minmax` and
+    `decimate_lttb`). Marker-only lines, as drawn by the "scatter" style, cannot be decimated without losing points
+    and are rasterized instead. Series with at most `line_threshold` points are plotted unchanged.
+
+    Args:
+        ax (plt.Axes): The axes to plot on.
+        x (np.ndarray): The x values.
+        y (np.ndarray): The y values.
+        *args: Additional positional arguments to pass to `ax.plot`, e.g. a format string.
+        style (str or list[str], optional): The style whose large data options to use, see `configure`. Defaults to
+            None, in which case the default options are used.
+        dpi (float, optional): The resolution the figure will be saved at. Defaults to `savefig.dpi`.
+        **kwargs: Additional keyword arguments to pass to `ax.plot`.
+
+    Returns:
+        lines (list[Line2D]): The plotted lines.
+    """
+    options = large_data_options(style)
+    x, y = np.asarray(x), np.asarray(y)
+    # Plot the full data first, so the data limits and the line properties (e.g. from the prop cycle) are final
+    lines = ax.plot(x, y, *args, **kwargs)
+    if len(x) <= options["line_threshold"]:
+        return lines
+
+    n_columns = axes_pixel_size(ax, dpi)[0]
+    for line in lines:
+        # A 2D `y` is plotted as one line per column, so each line is decimated from its own data
+        line_x, line_y = np.asarray(line.get_xdata()), np.asarray(line.get_ydata())
+        if line.get_linestyle() in ("None", " ", ""):
+            line.set_rasterized(True)
+        elif options["line_method"] == "lttb":
+            line.set_data(*decimate_lttb(line_x, line_y, 2 * n_columns))
+        else:
+            line.set_data(*decimate_minmax(line_x, line_y, n_columns))
+    return lines
+
+
+def _bin_counts(x: np.ndarray, y: np.ndarray, shape: tuple[int, int], extent: tuple[float, ...]) -> np.ndarray:
+    """Return the 2D histogram of the points as an array of shape (height, width)."""
+    width, height = shape
+    x0, x1, y0, y1 = extent
+    ix = np.minimum(((x - x0) * (width / ((x1 - x0) or 1))).astype(np.intp), width - 1)
+    iy = np.minimum(((y - y0) * (height / ((y1 - y0) or 1))).astype(np.intp), height - 1)
+    return np.bincount(iy * width + ix, minlength=width * height).reshape(height, width)
+
+
+def scatter(
+    ax: plt.Axes,
+    x: np.ndarray,
+    y: np.ndarray,
+    style: StyleSpec | None = None,
+    mode: str | None = None,
+    dpi: float | None = None,
+    **kwargs,
+) -> Collection | AxesImage:
+    """Scatter plot that stays fast to draw and export for millions of points.
+
+    Scatters with more than the style's `scatter_threshold` points are either rasterized ("rasterize"), which keeps
+    the look of individual markers, or aggregated into an image of point counts with one bin per pixel of the axes
+    ("aggregate"), which draws in constant time regardless of the number of points.
+
+    Args:
+        ax (plt.Axes): The axes to plot on.
+        x (np.ndarray): The x values.
+        y (np.ndarray): The y values.
+        style (str or list[str], optional): The style whose large data options to use, see `configure`. Defaults to
+            None, in which case the default options are used.
+        mode (str, optional): "rasterize" or "aggregate". Defaults to the style's `scatter_mode`.
+        dpi (float, optional): The resolution the figure will be saved at. Defaults to `savefig.dpi`.
+        **kwargs: Additional keyword arguments to pass to `ax.scatter`. When aggregating, only those that apply to the
+            image of point counts (`cmap`, `norm`, `vmin`, `vmax`, `alpha`, `zorder`, `label`) are passed to
+            `ax.imshow`, marker keywords such as `s`, `c` and `marker` are ignored.
+
+    Returns:
+        artist (Collection or AxesImage): The scatter, or the image of point counts. Aggregating returns an empty
+            scatter if none of the points is finite.
+    """
+    options = large_data_options(style)
+    mode = options["scatter_mode"] if mode is None else mode
+    if mode not in _SCATTER_MODES:
+        raise ValueError(f"Unrecognized scatter mode {mode}. Valid modes are {_SCATTER_MODES}.")
+    x, y = np.asarray(x).ravel(), np.asarray(y).ravel()
+    if len(x) <= options["scatter_threshold"]:
+        return ax.scatter(x, y, **kwargs)
+    if mode == "rasterize":
+        return ax.scatter(x, y, rasterized=True, **kwargs)
+
+    from matplotlib.colors import LogNorm
+
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if not len(x):
+        # Nothing to aggregate, e.g. all points are NaN
+        return ax.scatter(x, y, **kwargs)
+    extent = (x.min(), x.max(), y.min(), y.max())
+    counts = _bin_counts(x, y, axes_pixel_size(ax, dpi), extent)
+    image_kwargs = {key: value for key, value in kwargs.items() if key in _IMAGE_KWARGS}
+    if "vmin" not in image_kwargs and "vmax" not in image_kwargs:
+        image_kwargs.setdefault("norm", LogNorm())
+    return ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        extent=extent,
+        origin="lower",
+        aspect="auto",
+        interpolation="nearest",
+        **image_kwargs,
+    )
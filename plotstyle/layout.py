@@ -0,0 +1,253 @@
+"""Analytic, cached layout for subplot grids.
+
+`fig.tight_layout()` and `savefig(bbox_inches="tight")` draw the figure's text to measure it on every call. For a
+given style and figure size, the margins a subplot grid needs only depend on the font sizes and tick settings of the
+style, on which labels and titles are present and on the length of the tick labels. `GridLayoutEngine` estimates the
+margins from these without a renderer, and caches them per (style settings, figure size, grid shape, tick label length
+bucket), so figures of the same kind are laid out by a dictionary lookup.
+
+The estimate assumes tick labels and axis labels of the style's fonts, with an average character width of 0.6 em, and
+subplots of one regular grid. Legends and colorbars outside the axes are not accounted for. For those, use
+`tight_layout` instead. `GridLayoutEngine` requires matplotlib>=3.6, `apply_grid_layout` works with any version.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# `GridLayoutEngine` is created on first access, see `__getattr__`
+__all__ = ["GridLayoutEngine", "apply_grid_layout", "grid_layout_cache_info"]  # noqa: F822
+
+_log = logging.getLogger(__name__)
+
+# Average glyph width and line height, in units of the font size
+_CHAR_WIDTH = 0.6
+_LINE_HEIGHT = 1.2
+# Tick label lengths are rounded up to multiples of this, so similar figures share cache entries
+_LABEL_LENGTH_BUCKET = 2
+# Parts of tick labels that are not rendered as glyphs, e.g. in "$\mathdefault{10^{3}}$"
+_NON_GLYPHS = re.compile(r"\\[a-zA-Z]+|[${}^_\\]")
+
+
+class _StyleMetrics(NamedTuple):
+    """The rcParams a grid layout depends on, in points."""
+
+    xtick_labelsize: float
+    ytick_labelsize: float
+    xtick_extent: float
+    ytick_extent: float
+    labelsize: float
+    labelpad: float
+    titlesize: float
+    titlepad: float
+    suptitlesize: float
+    pad: float
+
+    @classmethod
+    def from_rc(cls, rc: Any) -> _StyleMetrics:
+        from matplotlib.font_manager import FontProperties
+
+        def size(key: str) -> float:
+            return FontProperties(size=rc[key]).get_size_in_points()
+
+        def tick_extent(axis: str) -> float:
+            # Ticks pointing out of the axes push the tick labels away from it
+            length = {"out": 1.0, "inout": 0.5}.get(rc[f"{axis}.direction"], 0.0) * rc[f"{axis}.major.size"]
+            return length + rc[f"{axis}.major.pad"]
+
+        return cls(
+            xtick_labelsize=size("xtick.labelsize"),
+            ytick_labelsize=size("ytick.labelsize"),
+            xtick_extent=tick_extent("xtick"),
+            ytick_extent=tick_extent("ytick"),
+            labelsize=size("axes.labelsize"),
+            labelpad=rc["axes.labelpad"],
+            titlesize=size("axes.titlesize"),
+            titlepad=rc["axes.titlepad"],
+            suptitlesize=size("figure.titlesize"),
+            pad=0.5 * size("font.size"),
+        )
+
+
+class _FigureContent(NamedTuple):
+    """What a figure shows that the margins depend on. Tick label lengths are bucketed."""
+
+    xtick_length: int
+    ytick_length: int
+    xlabel: bool
+    ylabel: bool
+    title: bool
+    suptitle: bool
+
+
+def _bucket(length: int) -> int:
+    return _LABEL_LENGTH_BUCKET * math.ceil(length / _LABEL_LENGTH_BUCKET)
+
+
+def _figure_content(fig: Figure) -> _FigureContent:
+    def tick_length(axis) -> int:
+        # Format the tick labels with the axis' locator and formatter, without a renderer and without creating ticks
+        low, high = sorted(axis.get_view_interval())
+        locs = [loc for loc in axis.get_major_locator()() if low <= loc <= high]
+        labels = [_NON_GLYPHS.sub("", label) for label in axis.get_major_formatter().format_ticks(locs)]
+        return _bucket(max((len(label) for label in labels), default=0))
+
+    axes = fig.axes
+    # There is no public accessor of the suptitle artist, and `get_suptitle` requires matplotlib>=3.8
+    suptitle = getattr(fig, "_suptitle", None)
+    return _FigureContent(
+        xtick_length=max(tick_length(ax.xaxis) for ax in axes),
+        ytick_length=max(tick_length(ax.yaxis) for ax in axes),
+        xlabel=any(ax.get_xlabel() for ax in axes),
+        ylabel=any(ax.get_ylabel() for ax in axes),
+        title=any(ax.get_title(loc) for ax in axes for loc in ("left", "center", "right")),
+        suptitle=bool(suptitle is not None and suptitle.get_text()),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _grid_margins(
+    metrics: _StyleMetrics, figsize: tuple[float, float], grid: tuple[int, int], content: _FigureContent
+) -> dict[str, float] | None:
+    """Return the `subplots_adjust` parameters of a subplot grid, or None if the labels do not fit the figure."""
+    m, c = metrics, content
+    width, height = (72 * size for size in figsize)
+    nrows, ncols = grid
+
+    # Space needed left of and below each axes, and above and right of it, in points
+    left = m.ytick_extent + c.ytick_length * _CHAR_WIDTH * m.ytick_labelsize
+    if c.ylabel:
+        left += m.labelpad + _LINE_HEIGHT * m.labelsize
+    bottom = m.xtick_extent + _LINE_HEIGHT * m.xtick_labelsize
+    if c.xlabel:
+        bottom += m.labelpad + _LINE_HEIGHT * m.labelsize
+    # Without a title, the top y tick label and the last x tick label stick out by about half their size
+    top = m.titlepad + _LINE_HEIGHT * m.titlesize if c.title else 0.5 * m.ytick_labelsize
+    right = 0.5 * c.xtick_length * _CHAR_WIDTH * m.xtick_labelsize
+    suptitle = _LINE_HEIGHT * m.suptitlesize + m.pad if c.suptitle else 0.0
+
+    axes_width = (width - 2 * m.pad - left - right - (ncols - 1) * (left + right + m.pad)) / ncols
+    axes_height = (height - 2 * m.pad - suptitle - top - bottom - (nrows - 1) * (top + bottom + m.pad)) / nrows
+    if axes_width <= 0 or axes_height <= 0:
+        return None
+    return {
+        "left": (m.pad + left) / width,
+        "right": 1 - (m.pad + right) / width,
+        "bottom": (m.pad + bottom) / height,
+        "top": 1 - (m.pad + suptitle + top) / height,
+        "wspace": (left + right + m.pad) / axes_width,
+        "hspace": (top + bottom + m.pad) / axes_height,
+    }
+
+
+def _grid_shape(fig: Figure) -> tuple[int, int] | None:
+    """Return the (nrows, ncols) of the subplot grid of the figure, or None if its axes are not one regular grid."""
+    gridspecs = set()
+    for ax in fig.axes:
+        subplotspec = ax.get_subplotspec()
+        if subplotspec is None:
+            return None
+        gridspecs.add(subplotspec.get_gridspec())
+    if len(gridspecs) != 1:
+        return None
+    (gridspec,) = gridspecs
+    ratios: Any
+    for ratios in (gridspec.get_width_ratios(), gridspec.get_height_ratios()):
+        if ratios is not None and len(set(ratios)) > 1:
+            return None
+    return gridspec.get_geometry()
+
+
+def apply_grid_layout(fig: Figure, rc: Any = None) -> dict[str, float] | None:
+    """Set the subplot margins of `fig` to the analytic grid layout, see `GridLayoutEngine`.
+
+    Args:
+        fig (Figure): The figure.
+        rc (Mapping, optional): The rcParams of the figure's style. Defaults to None, in which case the active rcParams
+            are used.
+
+    Returns:
+        margins (dict[str, float] or None): The applied `subplots_adjust` parameters. None if the figure is not a
+            regular subplot grid, in which case `tight_layout` is used instead, or if the labels do not fit the figure,
+            in which case the margins are kept.
+    """
+    import matplotlib as mpl
+
+    grid = _grid_shape(fig) if fig.axes else None
+    if grid is None:
+        _log.debug("Figure is not a regular subplot grid, falling back to tight_layout.")
+        fig.tight_layout()
+        return None
+    return _layout_grid(fig, grid, _StyleMetrics.from_rc(mpl.rcParams if rc is None else rc))
+
+
+def _layout_grid(fig: Figure, grid: tuple[int, int], metrics: _StyleMetrics) -> dict[str, float] | None:
+    figsize = tuple(round(size, 3) for size in fig.get_size_inches())
+    margins = _grid_margins(metrics, figsize, grid, _figure_content(fig))
+    if margins is None:
+        # Like `tight_layout`, keep the current margins
+        _log.warning("Grid layout not applied: the figure is too small for the labels of its axes.")
+        return None
+    fig.subplots_adjust(**margins)
+    return dict(margins)
+
+
+def grid_layout_cache_info() -> Any:
+    """Return the hit/miss statistics of the cache of grid layouts, see `functools.lru_cache`."""
+    return _grid_margins.cache_info()
+
+
+@functools.lru_cache(maxsize=None)
+def _grid_layout_engine() -> type:
+    # `matplotlib.layout_engine` was added in matplotlib 3.6, so it is only imported once the engine is used
+    from matplotlib.layout_engine import LayoutEngine
+
+    class GridLayoutEngine(LayoutEngine):
+        """Layout engine that sets the margins of a subplot grid analytically, without measuring text.
+
+        The style settings are captured when the engine is created, so create it within the figure's style, e.g.
+        `fig.set_layout_engine(GridLayoutEngine())`. On every draw, the margins are looked up in a cache keyed by the
+        style settings, the figure size, the grid shape, which labels and titles are present and the bucketed length of
+        the tick labels, and only computed on a miss. Requires matplotlib>=3.6.
+
+        Args:
+            rc (Mapping, optional): The rcParams of the figure's style. Defaults to None, in which case the active
+                rcParams are used.
+        """
+
+        _adjust_compatible = True
+        _colorbar_gridspec = True
+
+        def __init__(self, rc: Any = None, **kwargs) -> None:
+            import matplotlib as mpl
+
+            super().__init__(**kwargs)
+            self._metrics = _StyleMetrics.from_rc(mpl.rcParams if rc is None else rc)
+            self._params = self._metrics._asdict()
+
+        def set(self, **kwargs) -> None:
+            self._metrics = self._metrics._replace(**kwargs)
+            self._params = self._metrics._asdict()
+
+        def execute(self, fig: Figure) -> None:
+            grid = _grid_shape(fig) if fig.axes else None
+            if grid is None:
+                return
+            _layout_grid(fig, grid, self._metrics)
+
+    # Pickled figures refer to the engine by its module attribute, see `__getattr__`
+    GridLayoutEngine.__qualname__ = "GridLayoutEngine"
+    return GridLayoutEngine
+
+
+def __getattr__(name: str) -> Any:
+    if name == "GridLayoutEngine":
+        return _grid_layout_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,249 @@
+"""Live-updating styled plots for monitoring, e.g. training curves.
+
+`LivePlot` applies a style once and renders the static parts of the figure (axes, ticks, labels, legend and any TeX
+text) into a cached background. Each frame only restores that background and redraws the live lines on top of it
+(blitting). The background is only re-rendered when a line leaves the current axes limits, which are then expanded
+with some headroom, so that a growing curve does not trigger a full redraw every frame. Long lines are decimated to the
+resolution of the axes (see `plotstyle.largedata.decimate_minmax`), so the number of points drawn per frame stays
+bounded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .largedata import axes_pixel_size, decimate_minmax
+from .size import GOLDEN_RATIO, WIDTH, get_dim
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+
+__all__ = ["LivePlot"]
+
+
+class _LineData:
+    """Growable x/y buffers of a live line on the axes `ax`, with running bounds of its finite points."""
+
+    def __init__(self, ax: plt.Axes) -> None:
+        self.ax = ax
+        self.x = np.empty(1024)
+        self.y = np.empty(1024)
+        self.n = 0
+        self.bounds: tuple[float, float, float, float] | None = None
+        # Decimated data of the last frame, keyed by (number of points, number of pixel columns)
+        self.decimated: tuple[tuple[int, int], tuple[np.ndarray, np.ndarray]] | None = None
+
+    def set(self, x: np.ndarray, y: np.ndarray) -> None:
+        self.x, self.y = np.array(x, dtype=float), np.array(y, dtype=float)
+        self.n = len(self.x)
+        self.bounds = None
+        self.decimated = None
+        self._update_bounds(self.x, self.y)
+
+    def append(self, x: float | np.ndarray, y: float | np.ndarray) -> None:
+        x, y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        if self.n + len(x) > len(self.x):
+            capacity = max(2 * len(self.x), self.n + len(x))
+            self.x = np.resize(self.x[: self.n], capacity)
+            self.y = np.resize(self.y[: self.n], capacity)
+        self.x[self.n : self.n + len(x)] = x
+        self.y[self.n : self.n + len(y)] = y
+        self.n += len(x)
+        self._update_bounds(x, y)
+
+    def decimate(self, n_columns: int) -> tuple[np.ndarray, np.ndarray]:
+        key = (self.n, n_columns)
+        if self.decimated is None or self.decimated[0] != key:
+            self.decimated = (key, decimate_minmax(self.x[: self.n], self.y[: self.n], n_columns))
+        return self.decimated[1]
+
+    def _update_bounds(self, x: np.ndarray, y: np.ndarray) -> None:
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.any():
+            return
+        x, y = x[finite], y[finite]
+        bounds = (x.min(), x.max(), y.min(), y.max())
+        if self.bounds is not None:
+            bounds = (
+                min(bounds[0], self.bounds[0]),
+                max(bounds[1], self.bounds[1]),
+                min(bounds[2], self.bounds[2]),
+                max(bounds[3], self.bounds[3]),
+            )
+        self.bounds = bounds
+
+
+class LivePlot:
+    """Figure for live updates that only redraws the lines that change, on the Agg backend.
+
+    Example:
+
+        live = LivePlot(["science", "no-latex"], width=WIDTH.nature_column)
+        loss = live.line(label="loss")
+        live.axes[0, 0].set_xlabel("step")
+        for step in range(num_steps):
+            live.append(loss, step, train_step())
+            frame = live.render()  # RGBA array, or None if skipped to keep the frame interval
+
+    Args:
+        style (str or list[str]): The style (or list of styles) of the figure.
+        width (float, optional): The text width in pt, e.g. `WIDTH.nature_column`, see `plotstyle.size.get_dim`.
+            Defaults to `WIDTH.latex_default_article` (345.0pt).
+        fraction_of_line_width (float, optional): Fraction of `width` the figure occupies. Defaults to 1.
+        ratio (float, optional): Height to width ratio of the figure. Defaults to the golden ratio (5 ** 0.5 - 1)/2.
+        nrows (int, optional): The number of rows of the subplot grid. Defaults to 1.
+        ncols (int, optional): The number of columns of the subplot grid. Defaults to 1.
+        frame_interval (float, optional): The minimum time between two frames in seconds. `render` calls within this
+            interval of the previous frame are skipped, and their updates are shown with the next frame. Defaults to 0.
+        headroom (float, optional): When a line leaves the axes limits, the limits are expanded by this fraction of the
+            data range beyond the data, to avoid re-rendering the background on every frame. Defaults to 0.25.
+        dpi (float, optional): The resolution of the frames. Defaults to the figure dpi of the style.
+    """
+
+    def __init__(
+        self,
+        style: str | list[str],
+        width: float = WIDTH.latex_default_article,
+        fraction_of_line_width: float = 1.0,
+        ratio: float = GOLDEN_RATIO,
+        nrows: int = 1,
+        ncols: int = 1,
+        frame_interval: float = 0.0,
+        headroom: float = 0.25,
+        dpi: float | None = None,
+    ) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.style = style
+        self.frame_interval = frame_interval
+        self.headroom = headroom
+        with self.style_context():
+            self.fig = Figure(figsize=get_dim(width, fraction_of_line_width=fraction_of_line_width, ratio=ratio))
+            if dpi is not None:
+                self.fig.set_dpi(dpi)
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.axes = self.fig.subplots(nrows, ncols, squeeze=False)
+        self._lines: dict[Line2D, _LineData] = {}
+        self._background: Any = None
+        self._scaled: set[tuple[plt.Axes, str]] = set()
+        self._last_frame = -np.inf
+        self.stats = {"frames": 0, "skipped": 0, "background_draws": 0, "frame_time": 0.0}
+
+    def style_context(self):
+        """Return a context manager applying the plot's style."""
+        from .styles import style_context
+
+        return style_context(self.style)
+
+    def line(self, *args, ax: plt.Axes | None = None, **kwargs) -> Line2D:
+        """Add a live line to an axes.
+
+        Args:
+            *args: Additional positional arguments to pass to `ax.plot`, e.g. a format string.
+            ax (plt.Axes, optional): The axes to add the line to. Defaults to None, in which case the first axes is
+                used.
+            **kwargs: Additional keyword arguments to pass to `ax.plot`, e.g. `label`.
+
+        Returns:
+            line (Line2D): The line, to pass to `set_data` and `append`.
+        """
+        ax = self.axes[0, 0] if ax is None else ax
+        with self.style_context():
+            (line,) = ax.plot([], [], *args, animated=True, **kwargs)
+        self._lines[line] = _LineData(ax)
+        self.invalidate()
+        return line
+
+    def set_data(self, line: Line2D, x: np.ndarray, y: np.ndarray) -> None:
+        """Replace the data of a live line."""
+        self._lines[line].set(x, y)
+
+    def append(self, line: Line2D, x: float | np.ndarray, y: float | np.ndarray) -> None:
+        """Append one or more points to a live line."""
+        self._lines[line].append(x, y)
+
+    def invalidate(self) -> None:
+        """Re-render the background with the next frame, e.g. after changing labels, titles or the legend."""
+        self._background = None
+
+    def _expand_limits(self) -> bool:
+        """Expand the axes limits to contain all live lines. Returns True if any limits changed."""
+        changed = False
+        for ax in self.fig.axes:
+            bounds = [data.bounds for data in self._lines.values() if data.ax is ax and data.bounds is not None]
+            if not bounds:
+                continue
+            x0, x1 = min(b[0] for b in bounds), max(b[1] for b in bounds)
+            y0, y1 = min(b[2] for b in bounds), max(b[3] for b in bounds)
+            for (lo, hi), get_lim, set_lim in (
+                ((x0, x1), ax.get_xlim, ax.set_xlim),
+                ((y0, y1), ax.get_ylim, ax.set_ylim),
+            ):
+                pad = self.headroom * ((hi - lo) or abs(hi) or 1.0)
+                if (ax, set_lim.__name__) not in self._scaled:
+                    # The first data of an axes replaces the default limits
+                    self._scaled.add((ax, set_lim.__name__))
+                    set_lim(lo - pad, hi + pad)
+                    changed = True
+                    continue
+                view_lo, view_hi = sorted(get_lim())
+                if lo >= view_lo and hi <= view_hi:
+                    continue
+                # Only expand the side the data left
+                set_lim(view_lo if lo >= view_lo else lo - pad, view_hi if hi <= view_hi else hi + pad)
+                changed = True
+        return changed
+
+    def render(self, force: bool = False) -> np.ndarray | None:
+        """Render a frame.
+
+        Args:
+            force (bool, optional): Render even if the previous frame was less than `frame_interval` ago. Defaults to
+                False.
+
+        Returns:
+            frame (np.ndarray): The RGBA pixels of the frame, of shape (height, width, 4). Valid until the next frame.
+                None if the frame was skipped.
+        """
+        start = time.perf_counter()
+        if not force and start - self._last_frame < self.frame_interval:
+            self.stats["skipped"] += 1
+            return None
+        self._last_frame = start
+
+        with self.style_context():
+            if self._expand_limits() or self._background is None:
+                # Live lines are animated, so they are not part of the background
+                self.canvas.draw()
+                self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+                self.stats["background_draws"] += 1
+            else:
+                self.canvas.restore_region(self._background)
+            for line, data in self._lines.items():
+                n_columns = axes_pixel_size(data.ax, self.fig.dpi)[0]
+                line.set_data(*data.decimate(n_columns))
+                data.ax.draw_artist(line)
+            self.canvas.blit(self.fig.bbox)
+
+        self.stats["frames"] += 1
+        self.stats["frame_time"] = time.perf_counter() - start
+        return np.asarray(self.canvas.buffer_rgba())
+
+    def savefig(self, *args, **kwargs) -> None:
+        """Save the current state of the figure, including the live lines, with `fig.savefig` within the style."""
+        for line, data in self._lines.items():
+            line.set_data(data.x[: data.n], data.y[: data.n])
+            line.set_animated(False)
+        try:
+            with self.style_context():
+                self.fig.savefig(*args, **kwargs)
+        finally:
+            for line in self._lines:
+                line.set_animated(True)
+            # Saving may resize the canvas renderer, render the background again
+            self.invalidate()
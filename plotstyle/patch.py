@@ -2,16 +2,22 @@ from __future__ import annotations
 
 import matplotlib.pyplot as plt
 
+from plotstyle.profiling import profiled
 from plotstyle.size import get_dim
+from plotstyle.styles import style_context
 
+__all__ = ["patch_figure", "patch_plot"]
 
-def patch_plot(style: str, figsize: float | tuple[float, float]):
+
+@profiled
+def patch_plot(style: str, figsize: float | tuple[float, float], layout: str | None = "tight"):
     """Applies a specified matplotlib style to an existing figure and adjusts its size.
 
     Args:
     - style (str): The name of the matplotlib style to apply to the figure.
     - figsize (float | tuple[float, float]): The size of the figure in inches. If a float is provided,
         the size assumed to be the width of the figure and the height is calculated using the golden ratio.
+    - layout (str, optional): How to lay out the figure after restyling, see `patch_figure`. Defaults to "tight".
 
     Returns:
     - fig, ax (matplotlib.figure.Figure, matplotlib.axes.Axes): The created figure and axes objects.
@@ -51,7 +57,92 @@ def patch_plot(style: str, figsize: float | tuple[float, float]):
             for text in legend.get_texts():
                 text.set_fontsize(plt.rcParams["legend.fontsize"])
 
-        # Tight layout
-        fig.tight_layout()
+        _apply_layout(fig, layout)
 
         return fig, ax
+
+
+@profiled
+def patch_figure(
+    style: str | list[str],
+    figsize: float | tuple[float, float] | None = None,
+    fig: plt.Figure | None = None,
+    layout: str | None = "tight",
+) -> plt.Figure:
+    """Applies a specified matplotlib style to every axes of an existing figure and adjusts its size.
+
+    Unlike `patch_plot`, which only restyles the current axes, this visits each axes once and updates the font sizes of
+    the existing text artists in place: tick labels are restyled via `tick_params`, so tick locators and formatters are
+    kept and no tick labels are recreated. Layout is done once at the end.
+
+    Args:
+    - style (str | list[str]): The name of the matplotlib style (or list of styles) to apply to the figure.
+    - figsize (float | tuple[float, float], optional): The size of the figure in inches. If a float is provided,
+        the size assumed to be the width of the figure and the height is calculated using the golden ratio.
+        If None, the figure size is not changed.
+    - fig (matplotlib.figure.Figure, optional): The figure to patch. Defaults to the current figure.
+    - layout (str, optional): How to lay out the figure once after restyling: "tight" calls `tight_layout`, which
+        measures the rendered text, "grid" sets margins computed from the style's font sizes without rendering (see
+        `plotstyle.layout.GridLayoutEngine`), and None keeps the current margins. Defaults to "tight".
+
+    Returns:
+    - fig (matplotlib.figure.Figure): The patched figure.
+    """
+    with style_context(style):
+        rc = plt.rcParams
+        fig = plt.gcf() if fig is None else fig
+
+        # Set figure size
+        if isinstance(figsize, tuple):
+            fig.set_size_inches(figsize)
+        elif figsize is not None:
+            fig.set_size_inches(get_dim(figsize))
+
+        # Figure-level text
+        for text in fig.texts:
+            text.set_fontsize(rc["font.size"])
+        for legend in fig.legends:
+            for text in legend.get_texts():
+                text.set_fontsize(rc["legend.fontsize"])
+
+        for ax in fig.axes:
+            # Annotations and other text artists
+            for text in ax.texts:
+                text.set_fontsize(rc["font.size"])
+
+            # Tick labels, updated in place for existing ticks and used for ticks created later
+            ax.tick_params(axis="x", which="both", labelsize=rc["xtick.labelsize"])
+            ax.tick_params(axis="y", which="both", labelsize=rc["ytick.labelsize"])
+            ax.xaxis.get_offset_text().set_fontsize(rc["xtick.labelsize"])
+            ax.yaxis.get_offset_text().set_fontsize(rc["ytick.labelsize"])
+
+            # Axis labels and titles
+            ax.xaxis.label.set_fontsize(rc["axes.labelsize"])
+            ax.yaxis.label.set_fontsize(rc["axes.labelsize"])
+            # The left and right titles have no public accessor, only their texts do
+            for title in (ax.title, getattr(ax, "_left_title", None), getattr(ax, "_right_title", None)):
+                if title is not None:
+                    title.set_fontsize(rc["axes.titlesize"])
+
+            ax_legend = ax.get_legend()
+            if ax_legend:
+                for text in ax_legend.get_texts():
+                    text.set_fontsize(rc["legend.fontsize"])
+                if ax_legend.get_title().get_text():
+                    ax_legend.get_title().set_fontsize(rc["legend.title_fontsize"] or rc["legend.fontsize"])
+
+        _apply_layout(fig, layout)
+
+        return fig
+
+
+def _apply_layout(fig: plt.Figure, layout: str | None) -> None:
+    """Lay out a figure within its style, see `patch_figure`."""
+    if layout == "tight":
+        fig.tight_layout()
+    elif layout == "grid":
+        from .layout import apply_grid_layout
+
+        apply_grid_layout(fig)
+    elif layout is not None:
+        raise ValueError(f'`layout` must be "tight", "grid" or None, not {layout!r}.')
@@ -0,0 +1,209 @@
+"""Pool of reusable pre-styled figures.
+
+Creating a figure, applying a style stack, sizing it and building its axes and tick formatters often costs more than
+updating the data of a plot. `FigurePool` keeps idle figures around, keyed by their style, size and subplot grid, and
+hands them out again, artists included, so that dashboards and other repeatedly updated plots only update their data:
+
+    pool = FigurePool(max_size=4)
+    with pool.figure(["science", "no-latex"], width=WIDTH.nature_column) as template:
+        ax = template.axes[0, 0]
+        if not ax.lines:
+            ax.plot(x, y)
+        else:
+            ax.lines[0].set_data(x, y)
+        template.savefig("loss.png")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from .size import GOLDEN_RATIO, WIDTH, get_dim
+
+if TYPE_CHECKING:
+    import numpy as np
+    from matplotlib.figure import Figure
+
+__all__ = ["FigurePool", "FigureTemplate"]
+
+TemplateKey = Tuple[Tuple[str, ...], float, float, float, int, int, Optional[str]]
+
+
+@dataclass
+class FigureTemplate:
+    """A pre-styled figure handed out by `FigurePool`.
+
+    Attributes:
+        fig (Figure): The figure. It is not registered with pyplot and has an Agg canvas.
+        axes (np.ndarray): The 2D array of axes of the subplot grid.
+        style (tuple[str, ...]): The styles the figure was created with.
+        key (tuple): The key of the template in the pool.
+        uses (int): How often the template has been handed out.
+    """
+
+    fig: Figure
+    axes: np.ndarray
+    style: tuple[str, ...]
+    key: TemplateKey
+    uses: int = field(default=0)
+
+    def style_context(self) -> contextlib.AbstractContextManager:
+        """Return a context manager applying the template's style.
+
+        Most style settings are baked into the artists when they are created, but some are read when the figure is
+        drawn (e.g. `text.usetex` or `savefig.*`), so draw and save the figure within this context.
+        """
+        from .styles import style_context
+
+        return style_context(list(self.style))
+
+    def clear(self) -> None:
+        """Remove all artists added to the axes, keeping the axes, the style and the figure size."""
+        with self.style_context():
+            for ax in self.fig.axes:
+                ax.cla()
+
+    def savefig(self, *args, **kwargs) -> None:
+        """Save the figure with `fig.savefig`, within the template's style."""
+        with self.style_context():
+            self.fig.savefig(*args, **kwargs)
+
+
+class FigurePool:
+    """Pool of pre-styled figures keyed by (styles, width, fraction of line width, ratio, subplot grid, layout).
+
+    `acquire` hands out an idle figure of the requested kind if there is one (a hit), and creates one otherwise (a
+    miss). `release` returns a figure to the pool; figures keep their artists, so their data can be updated in place
+    (e.g. with `Line2D.set_data`) the next time they are handed out. When more than `max_size` figures are idle, the
+    least recently used ones are evicted. The pool is thread safe, a figure is only handed out to one user at a time.
+
+    Args:
+        max_size (int, optional): The maximum number of idle figures kept. Defaults to 16.
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        if max_size < 0:
+            raise ValueError("`max_size` must not be negative.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._idle: OrderedDict[TemplateKey, list[FigureTemplate]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        style: str | list[str],
+        width: float,
+        fraction_of_line_width: float,
+        ratio: float,
+        nrows: int,
+        ncols: int,
+        layout: str | None,
+    ) -> TemplateKey:
+        styles = (style,) if isinstance(style, str) else tuple(style)
+        return (styles, float(width), float(fraction_of_line_width), float(ratio), nrows, ncols, layout)
+
+    def acquire(
+        self,
+        style: str | list[str],
+        width: float = WIDTH.latex_default_article,
+        fraction_of_line_width: float = 1.0,
+        ratio: float = GOLDEN_RATIO,
+        nrows: int = 1,
+        ncols: int = 1,
+        layout: str | None = None,
+        clear: bool = False,
+    ) -> FigureTemplate:
+        """Hand out a pre-styled figure, creating it if there is no idle one of the requested kind.
+
+        Args:
+            style (str or list[str]): The style (or list of styles) of the figure, e.g. `["science", "nature"]`.
+            width (float, optional): The text width in pt, e.g. `WIDTH.nature_column`, see `plotstyle.size.get_dim`.
+                Defaults to `WIDTH.latex_default_article` (345.0pt).
+            fraction_of_line_width (float, optional): Fraction of `width` the figure occupies. Defaults to 1.
+            ratio (float, optional): Height to width ratio of the figure. Defaults to the golden ratio (5 ** 0.5 - 1)/2.
+            nrows (int, optional): The number of rows of the subplot grid. Defaults to 1.
+            ncols (int, optional): The number of columns of the subplot grid. Defaults to 1.
+            layout (str, optional): The layout engine of the figure, e.g. "constrained". Defaults to None.
+            clear (bool, optional): If True, the artists left by the previous user are removed. Defaults to False.
+
+        Returns:
+            template (FigureTemplate): The figure and its axes. Return it with `release` when done.
+        """
+        key = self._key(style, width, fraction_of_line_width, ratio, nrows, ncols, layout)
+        with self._lock:
+            idle = self._idle.get(key)
+            template = idle.pop() if idle else None
+            if idle is not None and not idle:
+                del self._idle[key]
+            if template is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if template is None:
+            template = self._create(key)
+        elif clear:
+            template.clear()
+        template.uses += 1
+        return template
+
+    def _create(self, key: TemplateKey) -> FigureTemplate:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        from .styles import style_context
+
+        styles, width, fraction_of_line_width, ratio, nrows, ncols, layout = key
+        with style_context(list(styles)):
+            # Not created with pyplot, so it is never shown and pyplot does not hold a reference to it
+            fig = Figure(figsize=get_dim(width, fraction_of_line_width=fraction_of_line_width, ratio=ratio))
+            FigureCanvasAgg(fig)
+            if layout is not None:
+                # The stubs only accept the literal engine names, `layout` is validated by matplotlib
+                fig.set_layout_engine(layout)  # type: ignore[arg-type]
+            axes = fig.subplots(nrows, ncols, squeeze=False)
+        return FigureTemplate(fig=fig, axes=axes, style=styles, key=key)
+
+    def release(self, template: FigureTemplate) -> None:
+        """Return a figure to the pool, evicting the least recently used idle figures if the pool is full."""
+        with self._lock:
+            self._idle.setdefault(template.key, []).append(template)
+            self._idle.move_to_end(template.key)
+            while sum(len(templates) for templates in self._idle.values()) > self.max_size:
+                key, templates = next(iter(self._idle.items()))
+                templates.pop(0)
+                if not templates:
+                    del self._idle[key]
+                self.evictions += 1
+
+    @contextlib.contextmanager
+    def figure(self, style: str | list[str], **kwargs) -> Iterator[FigureTemplate]:
+        """Context manager that acquires a figure, see `acquire`, and releases it on exit."""
+        template = self.acquire(style, **kwargs)
+        try:
+            yield template
+        finally:
+            self.release(template)
+
+    def clear(self) -> None:
+        """Drop all idle figures."""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of hits, misses and evictions, the hit rate and the number of idle figures."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": sum(len(templates) for templates in self._idle.values()),
+            }
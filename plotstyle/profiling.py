@@ -0,0 +1,234 @@
+"""Per-figure render profiling.
+
+`RenderProfiler` temporarily instruments matplotlib and plotstyle to record where the time of each
+`save_timestamped_figure`, `patch_plot` and `patch_figure` call goes: style resolution, layout, tight bounding boxes,
+font lookup, drawing per artist type, TeX compilation and encoding per file format. Each call produces one record:
+
+    {
+        "event": "save_timestamped_figure",
+        "args": {"name": "loss", "file_types": ["pdf", "png"]},
+        "total": 0.412,
+        "phases": {
+            "draw": {"Line2D": 0.081, "Text": 0.064, "XTick": 0.02, ...},
+            "bbox": {"tight": 0.07},
+            "encode": {"pdf": 0.05, "png": 0.03},
+            "other": {"save_timestamped_figure": 0.002},
+            ...
+        },
+    }
+
+Phase times are exclusive: time spent in nested phases (e.g. drawing the artists of an axes) is only counted once, in
+the innermost phase, so all phase times of a record add up to its total.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import inspect
+import json
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+__all__ = ["RenderProfiler", "profiled"]
+
+# The profiler currently collecting records, see `RenderProfiler.__enter__`
+_active: RenderProfiler | None = None
+
+# Arguments of the profiled functions that are copied into the records
+_RECORDED_ARGUMENTS = ("name", "style", "figsize", "file_types")
+
+
+def _json_safe(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=repr))
+
+
+def _timed(func: Callable, category: str, label: str | Callable[..., str]) -> Callable:
+    """Wrap `func` so that calls are timed as the phase (`category`, `label`) while a profiler is active."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        profiler._push(category, label(*args, **kwargs) if callable(label) else label)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler._pop()
+
+    return wrapper
+
+
+def profiled(func: Callable) -> Callable:
+    """Decorator marking `func` as a profiled event: each outermost call made while a `RenderProfiler` is active
+    produces one record."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+        recorded = {key: arguments[key] for key in _RECORDED_ARGUMENTS if key in arguments}
+        profiler._push("other", func.__name__, event=func.__name__, args=recorded)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler._pop()
+
+    return wrapper
+
+
+def _artist_label(artist, *args, **kwargs) -> str:
+    return type(artist).__name__
+
+
+def _print_figure_format(canvas, filename, *args, **kwargs) -> str:
+    import matplotlib as mpl
+
+    if kwargs.get("format"):
+        return kwargs["format"]
+    if isinstance(filename, (str, os.PathLike)):
+        ext = os.path.splitext(filename)[1]
+        if ext:
+            return ext[1:].lower()
+    return mpl.rcParams["savefig.format"]
+
+
+def _artist_classes() -> list[type]:
+    """Return all imported Artist subclasses that define their own `draw` method."""
+    import matplotlib.pyplot  # noqa: F401, imports the common artist modules
+    from matplotlib.artist import Artist
+
+    classes: list[type] = []
+    todo: list[type] = [Artist]
+    while todo:
+        cls = todo.pop()
+        todo.extend(cls.__subclasses__())
+        if "draw" in cls.__dict__ and cls not in classes:
+            classes.append(cls)
+    return classes
+
+
+def _instrumented_attributes() -> list[tuple[Any, str, str, str | Callable[..., str]]]:
+    """Return the (owner, attribute, category, label) of each function that is timed while profiling."""
+    import matplotlib.style as mplstyle
+    from matplotlib.backend_bases import FigureCanvasBase
+    from matplotlib.figure import Figure
+    from matplotlib.font_manager import FontManager
+    from matplotlib.texmanager import TexManager
+
+    from . import styles
+
+    style_module = inspect.getmodule(mplstyle.use)
+    attributes: list[tuple[Any, str, str, str | Callable[..., str]]] = [
+        (style_module, "use", "style", "use"),
+        (styles, "_resolve_style", "style", "resolve"),
+    ]
+    try:
+        from matplotlib.layout_engine import ConstrainedLayoutEngine, TightLayoutEngine
+    except ImportError:
+        # matplotlib<3.6 has no layout engines, the constrained layout is then counted as drawing the figure
+        attributes.append((Figure, "tight_layout", "layout", "tight"))
+    else:
+        attributes += [
+            (TightLayoutEngine, "execute", "layout", "tight"),
+            (ConstrainedLayoutEngine, "execute", "layout", "constrained"),
+        ]
+    attributes += [
+        (Figure, "get_tightbbox", "bbox", "tight"),
+        (FontManager, "findfont", "font", "findfont"),
+        (TexManager, "make_dvi", "tex", "dvi"),
+        (TexManager, "make_png", "tex", "png"),
+        (FigureCanvasBase, "print_figure", "encode", _print_figure_format),
+    ]
+    attributes += [(cls, "draw", "draw", _artist_label) for cls in _artist_classes()]
+    return attributes
+
+
+class RenderProfiler(contextlib.ContextDecorator):
+    """Context manager (or decorator) that records where the time of rendering and saving figures goes.
+
+    While active, every outermost call to `save_timestamped_figure`, `patch_plot` or `patch_figure` (and any other
+    function decorated with `profiled`) produces one record, see the module docstring for its layout. Records are
+    collected in `records`, passed to `callback` and/or appended to a JSON lines file, so they can be aggregated across
+    a batch job.
+
+    The instrumentation patches matplotlib classes for the duration of the block, so only one profiler can be active
+    at a time, and figures saved in other processes (e.g. by `save_timestamped_figures`) are not profiled.
+
+    Example:
+        >>> with RenderProfiler(path="profile.jsonl") as profiler:  # doctest: +SKIP
+        ...     save_timestamped_figure("loss", fig=fig, file_types=["pdf", "png"])
+        >>> profiler.records[0]["phases"]["encode"]  # doctest: +SKIP
+        {'pdf': 0.051, 'png': 0.032}
+
+    Args:
+        callback (Callable[[dict], None], optional): Called with each record as soon as it is complete. Defaults to
+            None.
+        path (str, optional): If given, each record is appended to this file as one line of JSON. Defaults to None.
+    """
+
+    def __init__(self, callback: Callable[[dict], None] | None = None, path: str | None = None) -> None:
+        self.callback = callback
+        self.path = path
+        self.records: list[dict] = []
+        self._stack: list[list] = []
+        self._phases: dict[str, dict[str, float]] = {}
+        self._originals: list[tuple[Any, str, Any]] = []
+
+    def __enter__(self) -> RenderProfiler:
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another RenderProfiler is already active.")
+        for owner, attribute, category, label in _instrumented_attributes():
+            original = inspect.getattr_static(owner, attribute)
+            wrapped: Any
+            if isinstance(original, (classmethod, staticmethod)):
+                wrapped = type(original)(_timed(original.__func__, category, label))
+            else:
+                wrapped = _timed(original, category, label)
+            self._originals.append((owner, attribute, original))
+            setattr(owner, attribute, wrapped)
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        _active = None
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals.clear()
+        self._stack.clear()
+
+    def _push(self, category: str, label: str, event: str | None = None, args: dict | None = None) -> None:
+        if not self._stack:
+            if event is None:
+                # Only time phases that happen within a profiled event
+                return
+            self._phases = {}
+        self._stack.append([category, label, time.perf_counter(), 0.0, event, args])
+
+    def _pop(self) -> None:
+        if not self._stack:
+            return
+        category, label, start, child_time, event, args = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        phase = self._phases.setdefault(category, {})
+        phase[label] = phase.get(label, 0.0) + elapsed - child_time
+        if self._stack:
+            self._stack[-1][3] += elapsed
+        else:
+            self._emit({"event": event, "args": _json_safe(args), "total": elapsed, "phases": self._phases})
+
+    def _emit(self, record: dict) -> None:
+        self.records.append(record)
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        if self.callback is not None:
+            self.callback(record)
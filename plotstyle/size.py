@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 __all__ = [
     "GOLDEN_RATIO",
@@ -122,5 +124,7 @@ def set_dim(
         void; alters current figure to have the desired dimensions
     """
     if fig is None:
+        import matplotlib.pyplot as plt
+
         fig = plt.gcf()
     fig.set_size_inches(get_dim(**get_dim_kwargs))
@@ -0,0 +1,318 @@
+"""Plotting helpers that aggregate data chunk by chunk.
+
+The helpers in this module accept data that does not fit into memory: memory-mapped NumPy arrays (or paths to .npy
+files, which are memory-mapped), pandas DataFrames, paths to Parquet or CSV files, and iterables of DataFrame chunks
+such as `pd.read_csv(..., chunksize=...)`. The data is read `chunk_size` rows at a time and only the aggregate
+(histogram counts, per-bin sums or a 2D count image) is kept, so peak memory is bounded by the chunk size and the number
+of bins, regardless of the size of the input.
+
+Iterables of chunks can only be read once. For those, the `range` of the bins must be given, otherwise it is computed
+in an additional pass over the data.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Sequence, Union
+
+import numpy as np
+
+from .largedata import _bin_counts, axes_pixel_size
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from matplotlib.image import AxesImage
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import StepPatch
+
+__all__ = ["iter_chunks", "stream_binned_mean", "stream_density", "stream_histogram"]
+
+DataSource = Union[np.ndarray, str, os.PathLike, tuple, Any]
+Range = Sequence[float]
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _open_source(
+    data: DataSource, columns: Sequence | None, n_columns: int, chunk_size: int
+) -> tuple[Callable[[], Iterator[tuple[np.ndarray, ...]]], bool]:
+    """Return a function that iterates over the chunks of `data`, and whether it can be called more than once."""
+    import pandas as pd  # type: ignore[import]
+
+    if isinstance(data, (str, os.PathLike)):
+        path = os.fspath(data)
+        if path.endswith(".npy"):
+            data = np.load(path, mmap_mode="r")
+        elif path.endswith(".parquet"):
+            return (lambda: _iter_parquet(path, columns, chunk_size)), True
+        elif path.endswith(".csv"):
+            return (lambda: _iter_frames(pd.read_csv(path, usecols=columns, chunksize=chunk_size), columns)), True
+        else:
+            raise ValueError(f"Unrecognized file type of {path}. Supported are .npy, .parquet and .csv files.")
+
+    if isinstance(data, tuple):
+        arrays = [np.asarray(array) if not isinstance(array, np.ndarray) else array for array in data]
+        if len(arrays) != n_columns:
+            raise ValueError(f"Expected {n_columns} arrays, got {len(arrays)}.")
+        return (lambda: _iter_arrays(arrays, chunk_size)), True
+    if isinstance(data, np.ndarray):
+        if data.ndim == 1 and n_columns == 1:
+            return (lambda: _iter_arrays([data], chunk_size)), True
+        if data.ndim != 2:
+            raise ValueError(f"Expected a 1D or 2D array, got an array of shape {data.shape}.")
+        columns = list(range(n_columns)) if columns is None else columns
+        return (lambda: _iter_arrays([data[:, column] for column in columns], chunk_size)), True
+    if isinstance(data, pd.DataFrame):
+        frame = data
+        return (lambda: _iter_frames(_slice_frame(frame, chunk_size), columns)), True
+    if isinstance(data, Iterable):
+        return (lambda: _iter_frames(data, columns)), False
+    raise ValueError(f"Unsupported data of type {type(data).__name__}.")
+
+
+def _iter_arrays(arrays: list[np.ndarray], chunk_size: int) -> Iterator[tuple[np.ndarray, ...]]:
+    n = len(arrays[0])
+    for start in range(0, n, chunk_size):
+        # Only this slice of a memory-mapped array is read from disk
+        yield tuple(np.asarray(array[start : start + chunk_size], dtype=float) for array in arrays)
+
+
+def _slice_frame(frame, chunk_size: int) -> Iterator:
+    for start in range(0, len(frame), chunk_size):
+        yield frame.iloc[start : start + chunk_size]
+
+
+def _iter_frames(frames: Iterable, columns: Sequence | None) -> Iterator[tuple[np.ndarray, ...]]:
+    for frame in frames:
+        selected = frame if columns is None else frame[list(columns)]
+        yield tuple(selected[column].to_numpy(dtype=float) for column in selected.columns)
+
+
+def _iter_parquet(path: str, columns: Sequence | None, chunk_size: int) -> Iterator[tuple[np.ndarray, ...]]:
+    try:
+        import pyarrow.parquet as pq  # type: ignore[import]
+    except ImportError:
+        raise ImportError("Reading Parquet files in chunks requires pyarrow, install it with `pip install pyarrow`.")
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=None if columns is None else list(columns)):
+        yield tuple(np.asarray(column.to_numpy(zero_copy_only=False), dtype=float) for column in batch.columns)
+
+
+def iter_chunks(
+    data: DataSource, columns: Sequence | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[np.ndarray, ...]]:
+    """Iterate over `data` in chunks of at most `chunk_size` rows.
+
+    Args:
+        data: A (memory-mapped) array, a tuple of arrays, a DataFrame, a path to a .npy, .parquet or .csv file, or an
+            iterable of DataFrame chunks.
+        columns (Sequence, optional): The columns to read: indices for 2D arrays, names for tabular data. Defaults to
+            None, in which case all columns are read.
+        chunk_size (int, optional): The number of rows per chunk. Defaults to 1_000_000.
+
+    Yields:
+        chunk (tuple[np.ndarray, ...]): One float array per column.
+    """
+    if isinstance(data, (str, os.PathLike)) and os.fspath(data).endswith(".npy"):
+        # Memory-mapped, so that the number of columns is known without reading the data
+        data = np.load(os.fspath(data), mmap_mode="r")
+    if isinstance(data, tuple):
+        n_columns = len(data)
+    elif columns is not None:
+        n_columns = len(columns)
+    elif isinstance(data, np.ndarray) and data.ndim == 2:
+        n_columns = data.shape[1]
+    else:
+        n_columns = 1
+    chunks, _ = _open_source(data, columns, n_columns, chunk_size)
+    yield from chunks()
+
+
+def _finite_rows(chunk: tuple[np.ndarray, ...]) -> tuple[np.ndarray, ...]:
+    mask = np.logical_and.reduce([np.isfinite(column) for column in chunk])
+    return tuple(column[mask] for column in chunk)
+
+
+def _compute_range(chunks: Iterator[tuple[np.ndarray, ...]], n_columns: int) -> list[tuple[float, float]]:
+    """Return the (min, max) of each column in one pass over the chunks."""
+    lo, hi = np.full(n_columns, np.inf), np.full(n_columns, -np.inf)
+    for chunk in chunks:
+        chunk = _finite_rows(chunk)
+        if len(chunk[0]):
+            lo = np.minimum(lo, [column.min() for column in chunk])
+            hi = np.maximum(hi, [column.max() for column in chunk])
+    if not np.all(np.isfinite(lo)):
+        raise ValueError("The data has no finite values.")
+    return list(zip(lo.tolist(), hi.tolist()))
+
+
+def _prepare(
+    data: DataSource, columns: Sequence | None, n_columns: int, chunk_size: int, ranges: list | None
+) -> tuple[Callable[[], Iterator[tuple[np.ndarray, ...]]], list[tuple[float, float]]]:
+    chunks, reiterable = _open_source(data, columns, n_columns, chunk_size)
+    if ranges is None or any(r is None for r in ranges):
+        if not reiterable:
+            raise ValueError("`range` is required for iterables of chunks, which can only be read once.")
+        computed = _compute_range(chunks(), n_columns)
+        ranges = computed if ranges is None else [c if r is None else r for r, c in zip(ranges, computed)]
+    return chunks, [tuple(r) for r in ranges]
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Return the bin of each value, -1 for values outside the edges. The last bin includes its right edge."""
+    index = np.searchsorted(edges, values, side="right") - 1
+    index[values == edges[-1]] = len(edges) - 2
+    index[(values < edges[0]) | (values > edges[-1])] = -1
+    return index
+
+
+def _edges(bins: int | Sequence[float], value_range: tuple[float, float]) -> np.ndarray:
+    if np.ndim(bins) > 0 or isinstance(bins, Sequence):
+        return np.asarray(bins, dtype=float)
+    return np.linspace(*value_range, int(bins) + 1)
+
+
+def stream_histogram(
+    ax: plt.Axes,
+    data: DataSource,
+    bins: int | Sequence[float] = 100,
+    range: Range | None = None,
+    column: Any = None,
+    density: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> StepPatch:
+    """Plot the histogram of a column of `data`, reading it in chunks.
+
+    Args:
+        ax (plt.Axes): The axes to plot on.
+        data: The data, see `iter_chunks`.
+        bins (int or Sequence[float], optional): The number of equally wide bins, or the bin edges. Defaults to 100.
+        range (Sequence[float], optional): The (min, max) of the bins. Defaults to None, in which case the range of
+            the data is used.
+        column (optional): The column to plot, see `iter_chunks`. Defaults to None, in which case `data` must have a
+            single column.
+        density (bool, optional): If True, the histogram is normalized to a probability density. Defaults to False.
+        chunk_size (int, optional): The number of rows read at once. Defaults to 1_000_000.
+        **kwargs: Additional keyword arguments to pass to `ax.stairs`.
+
+    Returns:
+        patch (StepPatch): The histogram.
+    """
+    columns = None if column is None else [column]
+    chunks, ranges = _prepare(data, columns, 1, chunk_size, None if range is None else [range])
+    edges = _edges(bins, ranges[0])
+    counts = np.zeros(len(edges) - 1)
+    for (values,) in chunks():
+        index = _bin_index(values[np.isfinite(values)], edges)
+        counts += np.bincount(index[index >= 0], minlength=len(counts))
+    if density:
+        counts = counts / (counts.sum() * np.diff(edges))
+    kwargs.setdefault("fill", True)
+    return ax.stairs(counts, edges, **kwargs)
+
+
+def stream_binned_mean(
+    ax: plt.Axes,
+    data: DataSource,
+    bins: int | Sequence[float] = 100,
+    range: Range | None = None,
+    columns: Sequence | None = None,
+    show_std: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> Line2D:
+    """Plot the mean of y in bins of x, reading the data in chunks.
+
+    Args:
+        ax (plt.Axes): The axes to plot on.
+        data: The (x, y) data, see `iter_chunks`.
+        bins (int or Sequence[float], optional): The number of equally wide bins of x, or the bin edges. Defaults to
+            100.
+        range (Sequence[float], optional): The (min, max) of x. Defaults to None, in which case the range of the data is
+            used.
+        columns (Sequence, optional): The x and y columns, see `iter_chunks`. Defaults to None, in which case the first
+            two columns are used.
+        show_std (bool, optional): If True, a band of one standard deviation around the mean is drawn as well.
+            Defaults to False.
+        chunk_size (int, optional): The number of rows read at once. Defaults to 1_000_000.
+        **kwargs: Additional keyword arguments to pass to `ax.plot`.
+
+    Returns:
+        line (Line2D): The line of the means at the bin centers. Empty bins are left out.
+    """
+    x_range = None if range is None else [range, (-np.inf, np.inf)]
+    chunks, ranges = _prepare(data, columns, 2, chunk_size, x_range)
+    edges = _edges(bins, ranges[0])
+    n_bins = len(edges) - 1
+    counts, sums, squares = np.zeros(n_bins), np.zeros(n_bins), np.zeros(n_bins)
+    for chunk in chunks():
+        x, y = _finite_rows(chunk)
+        index = _bin_index(x, edges)
+        inside = index >= 0
+        index, y = index[inside], y[inside]
+        counts += np.bincount(index, minlength=n_bins)
+        sums += np.bincount(index, weights=y, minlength=n_bins)
+        squares += np.bincount(index, weights=y * y, minlength=n_bins)
+
+    filled = counts > 0
+    centers = ((edges[:-1] + edges[1:]) / 2)[filled]
+    mean = sums[filled] / counts[filled]
+    (line,) = ax.plot(centers, mean, **kwargs)
+    if show_std:
+        std = np.sqrt(np.maximum(squares[filled] / counts[filled] - mean**2, 0))
+        ax.fill_between(centers, mean - std, mean + std, color=line.get_color(), alpha=0.3, linewidth=0)
+    return line
+
+
+def stream_density(
+    ax: plt.Axes,
+    data: DataSource,
+    bins: tuple[int, int] | None = None,
+    range: Sequence[Range] | None = None,
+    columns: Sequence | None = None,
+    dpi: float | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs,
+) -> AxesImage:
+    """Plot the 2D density of (x, y) points as an image of point counts, reading the data in chunks.
+
+    Args:
+        ax (plt.Axes): The axes to plot on.
+        data: The (x, y) data, see `iter_chunks`.
+        bins (tuple[int, int], optional): The number of bins in x and y. Defaults to None, in which case there is one
+            bin per pixel of the axes, see `plotstyle.largedata.axes_pixel_size`.
+        range (Sequence[Sequence[float]], optional): The ((xmin, xmax), (ymin, ymax)) of the bins. Defaults to None, in
+            which case the range of the data is used.
+        columns (Sequence, optional): The x and y columns, see `iter_chunks`. Defaults to None, in which case the first
+            two columns are used.
+        dpi (float, optional): The resolution the figure will be saved at, used if `bins` is None. Defaults to
+            `savefig.dpi`.
+        chunk_size (int, optional): The number of rows read at once. Defaults to 1_000_000.
+        **kwargs: Additional keyword arguments to pass to `ax.imshow`, e.g. `cmap` or `norm`.
+
+    Returns:
+        image (AxesImage): The image of point counts, with empty bins masked.
+    """
+    from matplotlib.colors import LogNorm
+
+    chunks, ranges = _prepare(data, columns, 2, chunk_size, None if range is None else list(range))
+    shape = axes_pixel_size(ax, dpi) if bins is None else (int(bins[0]), int(bins[1]))
+    extent = (*ranges[0], *ranges[1])
+    counts = np.zeros((shape[1], shape[0]), dtype=np.int64)
+    for chunk in chunks():
+        x, y = _finite_rows(chunk)
+        inside = (x >= extent[0]) & (x <= extent[1]) & (y >= extent[2]) & (y <= extent[3])
+        counts += _bin_counts(x[inside], y[inside], shape, extent)
+
+    kwargs.setdefault("norm", LogNorm())
+    return ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        extent=extent,
+        origin="lower",
+        aspect="auto",
+        interpolation="nearest",
+        **kwargs,
+    )
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+import os
+import warnings
+from collections.abc import Iterator, Mapping
+from typing import Any, Union
+
+from .constants import PLOTSTYLE_DATA_DIR
+
+__all__ = [
+    "STYLES_DIR",
+    "STYLE_EXTENSION",
+    "style_index",
+    "style_path",
+    "parse_style_file",
+    "read_style",
+    "register_styles",
+    "resolve_style",
+    "style_context",
+]
+
+_log = logging.getLogger(__name__)
+
+# Path to the bundled stylesheets
+STYLES_DIR = os.path.join(PLOTSTYLE_DATA_DIR, "styles")
+STYLE_EXTENSION = "mplstyle"
+
+StyleSpec = Union[str, dict, list]
+
+# Aliases understood by `matplotlib.style.use`
+_STYLE_ALIASES = {"mpl20": "default", "mpl15": "classic"}
+
+
+@functools.lru_cache(maxsize=None)
+def style_index() -> dict[str, str]:
+    """Return a mapping from style name to the path of the bundled stylesheet.
+
+    Styles are read from `STYLES_DIR` and its direct subfolders. Only the directory listing is read, the
+    stylesheets themselves are not parsed.
+    """
+    index: dict[str, str] = {}
+    # Reads styles in /styles and in /styles subfolders
+    style_dirs = [STYLES_DIR] + sorted(entry.path for entry in os.scandir(STYLES_DIR) if entry.is_dir())
+    for style_dir in style_dirs:
+        for entry in sorted(os.scandir(style_dir), key=lambda e: e.name):
+            name, ext = os.path.splitext(entry.name)
+            if entry.is_file() and ext == f".{STYLE_EXTENSION}":
+                index[name] = entry.path
+    return index
+
+
+def style_path(name: str) -> str:
+    """Return the path of the bundled stylesheet `name`."""
+    try:
+        return style_index()[name]
+    except KeyError:
+        raise ValueError(f"Unrecognized style {name}. Available styles are {sorted(style_index())}.") from None
+
+
+def parse_style_file(path: str) -> dict[str, Any]:
+    """Parse and validate the stylesheet at `path`, bypassing the style cache."""
+    from matplotlib import rc_params_from_file
+
+    with warnings.catch_warnings(record=True) as warns:
+        rc: Mapping = rc_params_from_file(path, use_default_template=False)
+    for w in warns:
+        _log.warning("In %s: %s", path, w.message)
+    return dict(rc)
+
+
+def read_style(name: str, use_cache: bool = True) -> dict[str, Any]:
+    """Parse and validate the bundled stylesheet `name`.
+
+    Args:
+        name (str): The name of the style, e.g. "science".
+        use_cache (bool, optional): If True, the validated rcParams are read from (and written to) the compiled
+            style cache in `plotstyle.cache`. Defaults to True.
+
+    Returns:
+        rc (dict): The validated rcParams set by the stylesheet.
+    """
+    path = style_path(name)
+    if not use_cache:
+        return parse_style_file(path)
+
+    from .cache import get_style_cache
+
+    cache = get_style_cache()
+    rc = cache.get(path)
+    if rc is None:
+        rc = parse_style_file(path)
+        # Written to disk once, see `get_style_cache`
+        cache.put(path, rc)
+    return dict(rc)
+
+
+class _LazyStyle(Mapping):
+    """Stand-in for a parsed stylesheet in `matplotlib.style.library`, parsed on first access."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._rc: dict[str, Any] | None = None
+
+    @property
+    def rc(self) -> dict[str, Any]:
+        if self._rc is None:
+            self._rc = read_style(self.name)
+        return self._rc
+
+    def __getitem__(self, key: str) -> Any:
+        return self.rc[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rc)
+
+    def __len__(self) -> int:
+        return len(self.rc)
+
+    def __repr__(self) -> str:
+        state = "parsed" if self._rc is not None else "unparsed"
+        return f"<{type(self).__name__} {self.name!r} ({state})>"
+
+
+def register_styles(lazy: bool = True) -> None:
+    """Register the bundled stylesheets in the matplotlib style library.
+
+    Args:
+        lazy (bool, optional): If True, only the name -> path index is built and each stylesheet is parsed the first
+            time it is requested via `plt.style.use` or `plt.style.context`. If False, all stylesheets are parsed
+            immediately. Defaults to True.
+    """
+    import matplotlib.style as mplstyle
+
+    library: dict[str, Any] = mplstyle.library
+    for name in style_index():
+        if name in library and not isinstance(library[name], _LazyStyle):
+            # Update an existing style, as `matplotlib.style.core.update_nested_dict` does
+            library[name].update(read_style(name))
+        elif lazy:
+            library[name] = _LazyStyle(name)
+        else:
+            library[name] = read_style(name)
+    # Write the stylesheets parsed above to the style cache at once, if any
+    from .cache import save_style_cache
+
+    save_style_cache()
+    # Update `plt.style.available`, as `matplotlib.style.reload_library` does
+    mplstyle.available[:] = sorted(name for name in library if not name.startswith("_"))
+
+
+def _style_blacklist() -> set[str]:
+    import matplotlib.style as mplstyle
+
+    # Private in matplotlib>=3.11, public in `matplotlib.style.core` before
+    if hasattr(mplstyle, "_STYLE_BLACKLIST"):
+        return getattr(mplstyle, "_STYLE_BLACKLIST")
+    from matplotlib.style.core import STYLE_BLACKLIST
+
+    return STYLE_BLACKLIST
+
+
+def _style_version(style: str) -> tuple[int, int] | None:
+    """Return a key that changes whenever the file behind the style `style` changes."""
+    import matplotlib.style as mplstyle
+
+    path = style_index().get(style)
+    if path is None and style not in mplstyle.library and os.path.isfile(style):
+        path = style
+    if path is None:
+        return None
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_style_spec(style: str | dict) -> Mapping:
+    import matplotlib as mpl
+    import matplotlib.style as mplstyle
+
+    if not isinstance(style, str):
+        # Validate user-provided dicts, as `matplotlib.style.use` does via `rcParams.update`
+        return mpl.RcParams(style)
+    style = _STYLE_ALIASES.get(style, style)
+    if style == "default":
+        return mpl.rcParamsDefault
+    if style in style_index():
+        return read_style(style)
+    if style in mplstyle.library:
+        return mplstyle.library[style]
+    return parse_style_file(style)
+
+
+def _flatten_styles(styles: tuple[str | dict, ...]) -> dict[str, Any]:
+    blacklist = _style_blacklist()
+    rc: dict[str, Any] = {}
+    for style in styles:
+        style_rc = _read_style_spec(style)
+        # Filter before reading values, as `matplotlib.style.use` does, to not trigger RcParams.__getitem__("backend")
+        for key in style_rc:
+            if key not in blacklist:
+                rc[key] = style_rc[key]
+    return rc
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_style_cached(key: tuple[tuple[str, tuple[int, int] | None], ...]) -> dict[str, Any]:
+    return _flatten_styles(tuple(style for style, _ in key))
+
+
+def _resolve_style(style: StyleSpec) -> dict[str, Any]:
+    styles = [style] if isinstance(style, (str, dict)) else list(style)
+    names = [s for s in styles if isinstance(s, str)]
+    if len(names) < len(styles):
+        # Dicts are not hashable, resolve without memoization
+        return _flatten_styles(tuple(styles))
+    return _resolve_style_cached(tuple((s, _style_version(s)) for s in names))
+
+
+def _resolve_style_fonts(style: StyleSpec, resolve_fonts: bool) -> dict[str, Any]:
+    rc = _resolve_style(style)
+    if not resolve_fonts:
+        return rc
+    from .fonts import resolve_font_rc
+
+    return {**rc, **resolve_font_rc(rc)}
+
+
+def resolve_style(style: StyleSpec, resolve_fonts: bool = False) -> dict[str, Any]:
+    """Resolve a style specification into a single flattened dict of validated rcParams.
+
+    Lists of style names are memoized in an LRU cache keyed by the ordered style names and the modification times of
+    the stylesheets behind them, so each stack is only read and merged once per process.
+
+    Args:
+        style (str, dict or list): A style specification as accepted by `plt.style.use`, e.g.
+            `["science", "nature", "bright", "no-latex"]`.
+        resolve_fonts (bool, optional): If True, `font.family` is replaced by the installed fonts of the style's font
+            fallback chain, see `plotstyle.fonts.resolve_font_rc`. Defaults to False.
+
+    Returns:
+        rc (dict): The rcParams set by the style(s), later styles taking precedence.
+    """
+    return dict(_resolve_style_fonts(style, resolve_fonts))
+
+
+@contextlib.contextmanager
+def style_context(style: StyleSpec, after_reset: bool = False, resolve_fonts: bool = False) -> Iterator[None]:
+    """Fast drop-in replacement for `plt.style.context`.
+
+    The style is resolved once via `resolve_style` and the precomputed, already validated rcParams are applied
+    directly, instead of re-reading, re-merging and re-validating each stylesheet on every entry.
+
+    Args:
+        style (str, dict or list): A style specification as accepted by `plt.style.context`.
+        after_reset (bool, optional): If True, apply the style after resetting settings to their defaults. Defaults to
+            False.
+        resolve_fonts (bool, optional): If True, only the installed fonts of the style's font fallback chain are set,
+            see `plotstyle.fonts.resolve_font_rc`. Defaults to False.
+    """
+    import matplotlib as mpl
+
+    rc = _resolve_style_fonts(style, resolve_fonts)
+    with mpl.rc_context():
+        if after_reset:
+            mpl.rcdefaults()
+        # Values were validated when the stylesheets were read, skip `RcParams.__setitem__`
+        params: Any = mpl.rcParams
+        if hasattr(params, "_update_raw"):
+            params._update_raw(rc)
+        else:
+            dict.update(params, rc)
+        yield
@@ -1,15 +1,87 @@
 from __future__ import annotations
 
-from distutils.spawn import find_executable
+import functools
+import inspect
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import zipfile
+from collections import Counter
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
 
-import matplotlib.pyplot as plt
+import matplotlib as mpl
 
-__all__ = ["latex_is_available", "use_tex"]
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
+__all__ = [
+    "compile_tex_labels",
+    "disable_tex_cache",
+    "enable_tex_cache",
+    "export_tex_cache",
+    "latex_is_available",
+    "tex_cache_stats",
+    "use_tex",
+    "warm_up",
+]
 
-def latex_is_available() -> bool:
-    """Returns True if latex is available on the system."""
-    return find_executable("latex") is not None
+_log = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _find_latex(path_env: str) -> str | None:
+    return shutil.which("latex", path=path_env)
+
+
+def _find_latex_cached_on_disk(path_env: str) -> str | None:
+    from .cache import default_cache_dir
+
+    cache_file = os.path.join(default_cache_dir(), "latex.json")
+    try:
+        with open(cache_file, "r") as f:
+            probes: dict[str, str] = json.load(f)
+    except (OSError, ValueError):
+        probes = {}
+    # Only found executables are cached, so installing latex later is picked up, and a cached executable that has
+    # since been removed is probed again
+    cached = probes.get(path_env)
+    if cached is not None and os.path.exists(cached):
+        return cached
+
+    latex = _find_latex(path_env)
+    if latex is None:
+        return None
+    probes[path_env] = latex
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        # Write atomically so concurrent processes never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(probes, f)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        _log.debug("Could not write latex probe cache %s: %s", cache_file, e)
+    return latex
+
+
+def latex_is_available(cache_on_disk: bool = False) -> bool:
+    """Returns True if latex is available on the system.
+
+    The result is cached per process and `PATH`.
+
+    Args:
+        cache_on_disk (bool, optional): If True, the location of latex is also cached on disk (keyed by `PATH`) in the
+            plotstyle cache directory, so new processes do not search `PATH` again. Defaults to False.
+    """
+    path_env = os.environ.get("PATH", os.defpath)
+    if cache_on_disk:
+        return _find_latex_cached_on_disk(path_env) is not None
+    return _find_latex(path_env) is not None
 
 
 def use_tex(preamble: str | None = None) -> None:
@@ -18,12 +90,366 @@ def use_tex(preamble: str | None = None) -> None:
         raise RuntimeError("Latex executable not found.")
 
     if preamble is None:
-        if "pgf.preamble" in plt.rcParams:
-            preamble = plt.rcParams["pgf.preamble"]
-    plt.rcParams.update(
+        if "pgf.preamble" in mpl.rcParams:
+            preamble = mpl.rcParams["pgf.preamble"]
+    mpl.rcParams.update(
         {
             "pgf.texsystem": "pdflatex",
             "text.usetex": True,
             "pgf.preamble": preamble,
         }
     )
+
+
+def _savefig_dpi() -> float:
+    dpi = mpl.rcParams["savefig.dpi"]
+    return mpl.rcParams["figure.dpi"] if dpi == "figure" else dpi
+
+
+def _warm_up(jobs: list[_TexJob], dpi: float) -> None:
+    """Compile TeX labels prepared by `_tex_jobs`, without reading rcParams, so that it can run in a thread."""
+    from matplotlib import dviread
+
+    try:
+        _compile_tex_jobs(jobs, dpi, raster=True)
+        for job in jobs:
+            # Loads the TeX fonts, as drawing the labels does
+            with dviread.Dvi(job.dvi_path, 72) as dvi:
+                for _ in dvi:
+                    pass
+    except Exception as e:
+        _log.warning("TeX warm-up failed: %s", e)
+
+
+def warm_up(
+    strings: tuple[str, ...] = ("0123456789", r"$-0.5$"),
+    fontsize: float | None = None,
+    dpi: float | None = None,
+    pgf: bool = False,
+    background: bool = True,
+) -> threading.Thread | None:
+    """Pre-compile TeX with the current preamble so that the first TeX-rendered figure does not stall.
+
+    Compiles `strings` with the active `text.latex.preamble` and font settings, which primes matplotlib's TeX cache
+    and loads the TeX fonts, and optionally starts the latex process used by the pgf backend. Call this after the
+    style (e.g. "science") has been applied. The rcParams are read when `warm_up` is called, so the style may be left
+    before the background warm-up has finished.
+
+    Args:
+        strings (tuple[str], optional): The TeX strings to compile. Defaults to digits and a math-mode number.
+        fontsize (float, optional): The font size. Defaults to None, in which case `font.size` is used.
+        dpi (float, optional): The resolution of the rasterized strings. Defaults to None, in which case
+            `savefig.dpi` (or `figure.dpi` if that is "figure") is used.
+        pgf (bool, optional): Whether to also start the latex process of the pgf backend. It reads the rcParams when
+            it starts, so it is always started in the calling thread. Defaults to False.
+        background (bool, optional): If True, the TeX strings are compiled in a daemon thread. Defaults to True.
+
+    Returns:
+        thread (threading.Thread or None): The warm-up thread if `background` is True, else None.
+    """
+    from matplotlib.texmanager import TexManager
+
+    if not latex_is_available():
+        raise RuntimeError("Latex executable not found.")
+
+    fontsize = mpl.rcParams["font.size"] if fontsize is None else fontsize
+    dpi = _savefig_dpi() if dpi is None else dpi
+    if pgf:
+        from matplotlib.backends.backend_pgf import LatexManager
+
+        # Starts the persistent latex process of the pgf backend with the configured `pgf.preamble`
+        LatexManager._get_cached_or_new()
+
+    if not hasattr(TexManager, "_get_tex_source"):
+        # Without access to the TeX sources (matplotlib<3.6), compile through matplotlib in the calling thread
+        texmanager = TexManager()
+        for tex in strings:
+            texmanager.get_text_width_height_descent(tex, fontsize)
+            texmanager.get_grey(tex, fontsize, dpi)
+        return None
+
+    # Snapshot the sources, which embed the preamble and font settings, while the caller's rcParams are active
+    jobs = _tex_jobs([(tex, fontsize) for tex in strings], dpi, raster=True)
+    if not background:
+        _warm_up(jobs, dpi)
+        return None
+    thread = threading.Thread(target=_warm_up, args=(jobs, dpi), name="plotstyle-tex-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# Layered TeX render cache
+# ========================
+# matplotlib's TexManager already stores compiled labels in its cache directory under a hash of the TeX source (which
+# includes the preamble and font size), so these files can be shared between machines as long as the TeX setup
+# matches. The functions below look labels up in shared read-only directories before latex is run.
+
+_tex_cache_stats: Counter = Counter()
+# TexManager looks a label up several times per draw, the stats only count the first lookup of each file
+_tex_cache_seen: set[str] = set()
+_shared_tex_dirs: list[str] = []
+_original_make_dvi: Callable[..., str]
+_original_make_png: Callable[..., str]
+
+
+def _tex_cache_dir() -> str:
+    from matplotlib.texmanager import TexManager
+
+    for attr in ("_cache_dir", "_texcache", "texcache"):
+        if hasattr(TexManager, attr):
+            return str(getattr(TexManager, attr))
+    raise RuntimeError("Could not locate the matplotlib TeX cache directory.")
+
+
+def _restore_from_shared(path: str, kind: str) -> None:
+    counted = path in _tex_cache_seen
+    _tex_cache_seen.add(path)
+    if os.path.exists(path):
+        if not counted:
+            _tex_cache_stats[f"{kind}_hits_local"] += 1
+        return
+    relpath = os.path.relpath(path, _tex_cache_dir())
+    for shared_dir in _shared_tex_dirs:
+        shared_path = os.path.join(shared_dir, relpath)
+        if os.path.exists(shared_path):
+            # Copy to a temporary name and rename, so other processes never see a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.copyfile(shared_path, tmp_path)
+            os.replace(tmp_path, path)
+            _tex_cache_stats[f"{kind}_hits_shared"] += 1
+            return
+    if not counted:
+        _tex_cache_stats[f"{kind}_misses"] += 1
+
+
+def _make_dvi(cls, tex: str, fontsize: float) -> str:
+    _restore_from_shared(cls.get_basefile(tex, fontsize) + ".dvi", "dvi")
+    return _original_make_dvi(cls, tex, fontsize)
+
+
+def _make_png(cls, tex: str, fontsize: float, dpi: float) -> str:
+    _restore_from_shared(cls.get_basefile(tex, fontsize, dpi) + ".png", "png")
+    return _original_make_png(cls, tex, fontsize, dpi)
+
+
+def enable_tex_cache(shared_dirs: Sequence[str] = (), archives: Sequence[str] = ()) -> None:
+    """Reuse compiled TeX labels from shared directories or prebuilt archives instead of running latex.
+
+    Labels are looked up, in order, in matplotlib's local TeX cache and in `shared_dirs`, which may be read-only (e.g.
+    a network mount shared by a fleet of workers). Labels found in a shared directory are copied to the local cache.
+    Archives created with `export_tex_cache` are extracted into the local cache once. Use `tex_cache_stats` to
+    monitor the hit rate, and `disable_tex_cache` to stop looking labels up in `shared_dirs`.
+
+    Args:
+        shared_dirs (Sequence[str], optional): Directories laid out like matplotlib's TeX cache, e.g. a copy of the
+            `tex.cache` folder in the matplotlib cache directory of a warmed-up machine. Defaults to ().
+        archives (Sequence[str], optional): Zip archives created with `export_tex_cache`. Defaults to ().
+    """
+    global _original_make_dvi, _original_make_png
+    from matplotlib.texmanager import TexManager
+
+    cache_dir = _tex_cache_dir()
+    for archive in archives:
+        with zipfile.ZipFile(archive) as zf:
+            for member in zf.namelist():
+                target = os.path.join(cache_dir, member)
+                if not os.path.exists(target):
+                    zf.extract(member, cache_dir)
+    _shared_tex_dirs[:] = [os.fspath(shared_dir) for shared_dir in shared_dirs]
+    _tex_cache_stats.clear()
+    _tex_cache_seen.clear()
+
+    make_dvi = inspect.getattr_static(TexManager, "make_dvi")
+    if getattr(make_dvi, "__func__", make_dvi) is not _make_dvi:
+        # make_dvi and make_png are classmethods since matplotlib 3.6 and plain methods before
+        wrap = classmethod if isinstance(make_dvi, classmethod) else (lambda f: f)
+        _original_make_dvi = getattr(make_dvi, "__func__", make_dvi)
+        make_png = inspect.getattr_static(TexManager, "make_png")
+        _original_make_png = getattr(make_png, "__func__", make_png)
+        setattr(TexManager, "make_dvi", wrap(_make_dvi))
+        setattr(TexManager, "make_png", wrap(_make_png))
+
+
+def disable_tex_cache() -> None:
+    """Undo `enable_tex_cache`, so that TeX labels are only looked up in matplotlib's local TeX cache again."""
+    from matplotlib.texmanager import TexManager
+
+    _shared_tex_dirs.clear()
+    make_dvi = inspect.getattr_static(TexManager, "make_dvi")
+    if getattr(make_dvi, "__func__", make_dvi) is _make_dvi:
+        wrap = classmethod if isinstance(make_dvi, classmethod) else (lambda f: f)
+        setattr(TexManager, "make_dvi", wrap(_original_make_dvi))
+        setattr(TexManager, "make_png", wrap(_original_make_png))
+
+
+def export_tex_cache(archive: str) -> int:
+    """Write the compiled labels in matplotlib's local TeX cache to a zip archive for `enable_tex_cache`.
+
+    Args:
+        archive (str): The path of the zip archive.
+
+    Returns:
+        num_files (int): The number of compiled labels in the archive.
+    """
+    cache_dir = _tex_cache_dir()
+    num_files = 0
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for root, _, files in os.walk(cache_dir):
+            for fname in files:
+                if fname.endswith((".dvi", ".png")):
+                    path = os.path.join(root, fname)
+                    zf.write(path, os.path.relpath(path, cache_dir))
+                    num_files += 1
+    return num_files
+
+
+def tex_cache_stats() -> dict[str, float]:
+    """Return hit and miss counts of the TeX cache since `enable_tex_cache`, and the overall hit rate.
+
+    Each compiled label is counted once, no matter how often matplotlib looks it up.
+    """
+    stats: dict[str, float] = {
+        f"{kind}_{outcome}": _tex_cache_stats[f"{kind}_{outcome}"]
+        for kind in ("dvi", "png")
+        for outcome in ("hits_local", "hits_shared", "misses")
+    }
+    hits = sum(v for k, v in stats.items() if "hits" in k)
+    total = hits + stats["dvi_misses"] + stats["png_misses"]
+    stats["hit_rate"] = hits / total if total else 0.0
+    return stats
+
+
+# Batch compilation of TeX labels
+# ===============================
+
+
+def _pending_tex_labels(figs: Sequence[plt.Figure]) -> set[tuple[str, float]]:
+    """Collect the (TeX string, font size) pairs that drawing `figs` with usetex would compile."""
+    from matplotlib.text import Text
+
+    labels = set()
+    for fig in figs:
+        # Tick labels are only created when ticks are updated, which does not require a draw
+        for ax in fig.axes:
+            for axis in (ax.xaxis, ax.yaxis):
+                axis.get_majorticklabels()
+                axis.get_minorticklabels()
+        for text in fig.findobj(Text):
+            if not text.get_visible() or not text.get_usetex() or not text.get_text():
+                continue
+            fontsize = text.get_fontproperties().get_size_in_points()
+            # Text layout measures "lp" to determine the line height
+            labels.add(("lp", fontsize))
+            for line in text.get_text().split("\n"):
+                labels.add((r"\ " if line == " " else line, fontsize))
+    return {(tex, fontsize) for tex, fontsize in labels if tex.strip()}
+
+
+def compile_tex_labels(figs: plt.Figure | Sequence[plt.Figure], dpi: float | None = None, raster: bool = True) -> int:
+    """Compile all TeX labels of one or more figures with a single latex run.
+
+    Normally each unique label is compiled by a separate latex (and dvipng) process when a figure using `text.usetex`
+    is drawn. This collects the labels that are not yet in matplotlib's TeX cache, typesets them as the pages of one
+    latex document, and splits the output into the per-label files matplotlib expects, so drawing the figures
+    afterwards only reads from the cache. Call this under the same style (rcParams) that the figures are saved with.
+
+    If the batch fails to compile (e.g. because of an invalid label), nothing is written and the labels are compiled
+    one by one when the figure is drawn, with matplotlib's usual error reporting.
+
+    Args:
+        figs (plt.Figure or Sequence[plt.Figure]): The figure(s) whose labels to compile.
+        dpi (float, optional): The resolution of the rasterized labels used by raster backends (e.g. for png). Defaults
+            to None, in which case `savefig.dpi` (or `figure.dpi` if that is "figure") is used.
+        raster (bool, optional): Whether to also rasterize the labels with a single dvipng run. Defaults to True.
+
+    Returns:
+        num_compiled (int): The number of labels compiled.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.texmanager import TexManager
+
+    if isinstance(figs, Figure):
+        figs = [figs]
+    dpi = _savefig_dpi() if dpi is None else dpi
+    if not hasattr(TexManager, "_get_tex_source"):
+        _log.warning("Batch compilation of TeX labels requires matplotlib>=3.6.")
+        return 0
+
+    jobs = _tex_jobs(sorted(_pending_tex_labels(figs)), dpi, raster)
+    try:
+        return _compile_tex_jobs(jobs, dpi, raster)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        _log.debug("Batch compilation of %d TeX labels failed: %s", len(jobs), e)
+        return 0
+
+
+class _TexJob(NamedTuple):
+    """A TeX label to compile: its full TeX source and the cache paths matplotlib reads it from."""
+
+    source: str
+    dvi_path: str
+    png_path: str
+
+
+def _tex_jobs(labels: Sequence[tuple[str, float]], dpi: float, raster: bool) -> list[_TexJob]:
+    """Return the labels that are not yet in matplotlib's TeX cache. Reads the active rcParams."""
+    from matplotlib.texmanager import TexManager
+
+    # Private, matplotlib>=3.6, checked by the callers
+    get_tex_source = getattr(TexManager, "_get_tex_source")
+    jobs = []
+    for tex, fontsize in labels:
+        dvi_path = TexManager.get_basefile(tex, fontsize) + ".dvi"
+        png_path = TexManager.get_basefile(tex, fontsize, dpi) + ".png"
+        if not os.path.exists(dvi_path) or (raster and not os.path.exists(png_path)):
+            jobs.append(_TexJob(get_tex_source(tex, fontsize), dvi_path, png_path))
+    return jobs
+
+
+def _compile_tex_jobs(jobs: Sequence[_TexJob], dpi: float, raster: bool) -> int:
+    """Compile TeX labels with one latex (and dvipng) run into matplotlib's TeX cache. Does not read rcParams.
+
+    Raises:
+        OSError, subprocess.CalledProcessError, ValueError: If the batch fails to compile. Nothing is written then.
+    """
+    from . import _dvi
+
+    if not jobs:
+        return 0
+
+    # All labels share the preamble; each label's document body becomes a page
+    preamble = jobs[0].source.split(r"\begin{document}", 1)[0]
+    bodies = [job.source.split(r"\begin{document}", 1)[1].rsplit(r"\end{document}", 1)[0] for job in jobs]
+    document = preamble + "\\begin{document}" + "\\newpage\n".join(bodies) + "\\end{document}\n"
+
+    cache_dir = os.path.dirname(jobs[0].dvi_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmpdir:
+        with open(os.path.join(tmpdir, "batch.tex"), "w", encoding="utf-8") as f:
+            f.write(document)
+        subprocess.run(
+            ["latex", "-interaction=nonstopmode", "-halt-on-error", "-no-shell-escape", "batch.tex"],
+            cwd=tmpdir,
+            check=True,
+            capture_output=True,
+        )
+        with open(os.path.join(tmpdir, "batch.dvi"), "rb") as f:
+            pages = _dvi.split_pages(f.read())
+        if len(pages) != len(jobs):
+            raise ValueError(f"Expected {len(jobs)} pages, got {len(pages)}.")
+        if raster:
+            subprocess.run(
+                ["dvipng", "-bg", "Transparent", "-D", str(dpi), "-T", "tight", "-o", "page%d.png", "batch.dvi"],
+                cwd=tmpdir,
+                check=True,
+                capture_output=True,
+            )
+
+        for i, (job, page) in enumerate(zip(jobs, pages), start=1):
+            if not os.path.exists(job.dvi_path):
+                with open(os.path.join(tmpdir, f"page{i}.dvi"), "wb") as f:
+                    f.write(page)
+                os.replace(os.path.join(tmpdir, f"page{i}.dvi"), job.dvi_path)
+            if raster and not os.path.exists(job.png_path):
+                os.replace(os.path.join(tmpdir, f"page{i}.png"), job.png_path)
+    return len(jobs)
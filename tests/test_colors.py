@@ -0,0 +1,176 @@
+import pickle
+
+import matplotlib as mpl
+import numpy as np
+import pytest
+
+from plotstyle.colors import Colors, cambridge_core, distinct_colors, oklab_to_srgb, srgb_to_oklab
+
+PALETTE = {"a": "red", "b": "#00ff00", "c": (0.0, 0.0, 1.0, 0.5)}
+
+
+def test_rgba_array_matches_matplotlib():
+    palette = Colors(dict(PALETTE))
+
+    np.testing.assert_allclose(palette.to_rgba_array(), mpl.colors.to_rgba_array(list(PALETTE.values())))
+    np.testing.assert_allclose(palette.to_rgb_array(), mpl.colors.to_rgba_array(list(PALETTE.values()))[:, :3])
+    assert palette.to_hex_list() == ["#ff0000", "#00ff00", "#0000ff"]
+    assert palette.to_rgba_list()[2] == (0.0, 0.0, 1.0, 0.5)
+
+
+def test_rgba_cache_follows_color_changes():
+    palette = Colors(dict(PALETTE))
+    palette.to_rgba_array()
+    palette["a"] = "black"
+    assert palette.to_hex_list()[0] == "#000000"
+
+    palette.colors["b"] = "white"
+    assert palette.to_hex_list()[1] == "#ffffff"
+
+    # Unchanged colors are not converted again
+    rgba = palette._rgba
+    assert palette._rgba is rgba
+    palette.colors.update(c="red")
+    assert palette._rgba is not rgba
+
+
+def test_rgba_arrays_are_copies():
+    palette = Colors(dict(PALETTE))
+    palette.to_rgba_array()[:] = 0.0
+
+    assert palette.to_hex_list()[0] == "#ff0000"
+
+
+def test_lighten_darken_interpolate():
+    palette = Colors(["#000000", "#ffffff"])
+
+    assert palette.lighten(1.0).to_hex_list() == ["#ffffff", "#ffffff"]
+    assert palette.darken(1.0).to_hex_list() == ["#000000", "#000000"]
+    assert palette.interpolate(3).to_hex_list()[::2] == ["#000000", "#ffffff"]
+    assert palette.distance().shape == (2, 2)
+
+
+def test_interpolate_empty():
+    with pytest.raises(ValueError):
+        Colors({}).interpolate(3)
+
+
+def test_module_palettes_are_valid_colors():
+    assert cambridge_core.to_rgba_array().shape == (len(cambridge_core), 4)
+
+
+def test_indexing():
+    palette = Colors(dict(PALETTE))
+
+    assert palette["b"] == "#00ff00"
+    assert palette[0] == "red"
+    assert palette[-1] == palette["c"]
+    assert palette[np.int64(1)] == "#00ff00"
+    assert palette[1:].names == ["b", "c"]
+    assert palette[["c", 0]].names == ["c", "a"]
+    assert palette[np.array([True, False, True])].names == ["a", "c"]
+    with pytest.raises(IndexError):
+        palette[3]
+    with pytest.raises(IndexError):
+        palette[-4]
+    with pytest.raises(IndexError):
+        palette[[True, False]]
+
+
+def test_setitem():
+    palette = Colors(["red", "green"])
+    palette[1] = "blue"
+    palette[2] = "black"
+
+    assert palette.colors == {"0": "red", "1": "blue", "2": "black"}
+    with pytest.raises(IndexError):
+        palette[4] = "white"
+
+
+def test_names_follow_mutation_of_colors():
+    palette = Colors({"a": "red", "b": "blue"})
+    assert palette.names == ["a", "b"]
+
+    # Same number of colors, different names
+    palette.colors.pop("a")
+    palette.colors["z"] = "green"
+    assert palette.names == ["b", "z"]
+    assert palette[0] == "blue"
+    assert palette[1] == "green"
+
+    del palette.colors["b"]
+    palette.colors.update(y="white")
+    assert palette.names == ["z", "y"]
+    palette.colors.setdefault("x", "black")
+    assert palette.names == ["z", "y", "x"]
+    palette.colors.clear()
+    assert palette.names == []
+
+
+def test_names_after_in_place_or():
+    palette = Colors({"a": "red", "b": "blue"})
+    assert palette.names == ["a", "b"]
+    colors = palette.colors
+    colors |= {"b": "black", "c": "green"}
+    assert palette.names == ["a", "b", "c"]
+    assert palette[1] == "black"
+
+
+def test_colors_do_not_share_state():
+    colors = {"a": "red"}
+    palette = Colors(colors)
+    palette["b"] = "blue"
+    assert colors == {"a": "red"}
+
+    extended = palette
+    extended += Colors({"c": "green"})
+    assert palette.names == ["a", "b"]
+    assert extended.names == ["a", "b", "c"]
+
+    n = len(cambridge_core)
+    combined = cambridge_core + Colors({"extra": "black"})
+    assert len(cambridge_core) == n
+    assert len(combined) == n + 1
+
+
+def test_pickle_roundtrip():
+    palette = Colors({"a": "red", "b": "blue"})
+    restored = pickle.loads(pickle.dumps(palette))
+
+    assert restored.colors == palette.colors
+    assert restored[1] == "blue"
+
+
+def test_oklab_roundtrip():
+    rgb = np.random.default_rng(0).random((100, 3))
+
+    np.testing.assert_allclose(oklab_to_srgb(srgb_to_oklab(rgb)), rgb, atol=1e-6)
+    np.testing.assert_allclose(srgb_to_oklab(np.ones(3)), [1.0, 0.0, 0.0], atol=1e-6)
+
+
+def test_distinct_colors_extends_base():
+    palette = distinct_colors(10, base=cambridge_core)
+
+    assert len(palette) == 10
+    assert palette.names[: len(cambridge_core)] == cambridge_core.names
+    assert palette[: len(cambridge_core)].colors == cambridge_core.colors
+    assert distinct_colors(3, base=cambridge_core).colors == cambridge_core[:3].colors
+
+
+def test_distinct_colors_are_distinct_and_deterministic():
+    palette = distinct_colors(12)
+    distance = palette.distance()
+
+    assert palette.colors == distinct_colors(12).colors
+    assert distance[~np.eye(12, dtype=bool)].min() > 0.05
+    assert palette.colors != distinct_colors(12, seed=1).colors
+
+
+def test_distinct_colors_respects_constraints():
+    lab = distinct_colors(8, lightness=(0.6, 0.7), min_chroma=0.1).to_oklab_array()
+
+    # Hex rounding moves colors slightly
+    assert np.all((lab[:, 0] > 0.59) & (lab[:, 0] < 0.71))
+    assert np.all(np.hypot(lab[:, 1], lab[:, 2]) > 0.09)
+    with pytest.raises(ValueError, match="n_candidates"):
+        distinct_colors(50, n_candidates=10)
@@ -0,0 +1,119 @@
+import os
+import shutil
+import uuid
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import pytest
+
+from plotstyle import _dvi
+
+COMMENT = b"test"
+PREAMBLE = bytes([_dvi._PRE, 2]) + (25400000).to_bytes(4, "big") + (473628672).to_bytes(4, "big")
+PREAMBLE += (1000).to_bytes(4, "big") + bytes([len(COMMENT)]) + COMMENT
+POST_FIELDS = (25400000).to_bytes(4, "big") + (473628672).to_bytes(4, "big") + (1000).to_bytes(4, "big")
+POST_FIELDS += (100).to_bytes(4, "big") + (200).to_bytes(4, "big")
+MAX_STACK = (3).to_bytes(2, "big")
+
+
+def font_def(font: int, name: bytes) -> bytes:
+    # fnt_def1 k[1] c[4] s[4] d[4] a[1] l[1] n[a + l]
+    return bytes([_dvi._FNT_DEF1, font]) + bytes(4) + (655360).to_bytes(4, "big") * 2 + bytes([0, len(name)]) + name
+
+
+def bop(page_number: int, prev: int) -> bytes:
+    return bytes([_dvi._BOP]) + page_number.to_bytes(4, "big") + bytes(36) + prev.to_bytes(4, "big", signed=True)
+
+
+# Page 1 defines and uses font 0, page 2 uses it again and exercises commands with arguments
+BODY_1 = font_def(0, b"cmr10") + bytes([_dvi._FNT_NUM_0, ord("A"), _dvi._EOP])
+BODY_2 = (
+    bytes([_dvi._FNT_NUM_0, ord("B")])
+    + bytes([143, 7])  # right1
+    + bytes([_dvi._SET_RULE]) + (10).to_bytes(4, "big") + (20).to_bytes(4, "big")
+    + bytes([_dvi._XXX1, 5]) + b"color"
+    + bytes([_dvi._EOP])
+)  # fmt: skip
+
+
+def make_dvi() -> bytes:
+    data = bytearray(PREAMBLE)
+    bop_1 = len(data)
+    data += bop(1, -1) + BODY_1
+    bop_2 = len(data)
+    data += bop(2, bop_1) + BODY_2
+    post = len(data)
+    data += bytes([_dvi._POST]) + bop_2.to_bytes(4, "big") + POST_FIELDS + MAX_STACK + (2).to_bytes(2, "big")
+    data += font_def(0, b"cmr10")
+    data += bytes([_dvi._POST_POST]) + post.to_bytes(4, "big") + bytes([2])
+    data += bytes([223]) * (4 + (-(len(data) + 4)) % 4)
+    return bytes(data)
+
+
+def test_split_pages():
+    pages = _dvi.split_pages(make_dvi())
+
+    assert len(pages) == 2
+    for page_number, (page, body) in enumerate(zip(pages, [BODY_1, BODY_2]), start=1):
+        assert page.startswith(PREAMBLE)
+        bop_offset = len(PREAMBLE)
+        # The counters are kept and there is no previous page
+        assert page[bop_offset : bop_offset + 45] == bop(page_number, -1)
+        body_start = bop_offset + 45
+        if page_number == 2:
+            # The font defined on page 1 is defined again before its first use
+            assert page[body_start:].startswith(font_def(0, b"cmr10"))
+            body_start += len(font_def(0, b"cmr10"))
+        assert page[body_start:].startswith(body)
+
+        # The postamble points to the page, and the post_post to the postamble
+        post = body_start + len(body)
+        assert page[post] == _dvi._POST
+        assert int.from_bytes(page[post + 1 : post + 5], "big") == bop_offset
+        assert page[post + 5 : post + 25] == POST_FIELDS
+        assert page[post + 25 : post + 27] == MAX_STACK
+        assert int.from_bytes(page[post + 27 : post + 29], "big") == 1
+        post_post = post + 29 + len(font_def(0, b"cmr10"))
+        assert page[post + 29 : post_post] == font_def(0, b"cmr10")
+        assert page[post_post] == _dvi._POST_POST
+        assert int.from_bytes(page[post_post + 1 : post_post + 5], "big") == post
+        assert page[post_post + 5] == 2
+        padding = page[post_post + 6 :]
+        assert len(padding) >= 4 and set(padding) == {223}
+        assert len(page) % 4 == 0
+
+
+def test_split_pages_not_dvi():
+    with pytest.raises(ValueError, match="Not a DVI file"):
+        _dvi.split_pages(b"%PDF-1.5")
+
+
+def dvi_glyphs(path: str) -> list[tuple]:
+    from matplotlib import dviread
+
+    with dviread.Dvi(path, None) as dvi:
+        return [(text.x, text.y, text.font.texname, text.glyph) for page in dvi for text in page.text]
+
+
+@pytest.mark.skipif(shutil.which("latex") is None, reason="latex is not installed")
+def test_compile_tex_labels_matches_matplotlib():
+    from matplotlib.texmanager import TexManager
+
+    from plotstyle.typesetting import _pending_tex_labels, compile_tex_labels
+
+    # Unique labels, so that none of them is in matplotlib's TeX cache yet
+    token = uuid.uuid4().hex[:8]
+    with mpl.rc_context({"text.usetex": True}):
+        fig, ax = plt.subplots()
+        ax.set_xlabel(f"x {token}")
+        ax.set_ylabel(rf"$\alpha_{{{token}}}$")
+        ax.set_title(f"Title {token}")
+        try:
+            assert compile_tex_labels(fig, raster=False) >= 3
+            for tex, fontsize in _pending_tex_labels([fig]):
+                path = TexManager.get_basefile(tex, fontsize) + ".dvi"
+                batched = dvi_glyphs(path)
+                os.remove(path)
+                assert dvi_glyphs(TexManager().make_dvi(tex, fontsize)) == batched
+        finally:
+            plt.close(fig)
@@ -0,0 +1,167 @@
+import os
+import zipfile
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import pytest
+
+from plotstyle.export import BackgroundFigureSaver, PdfReportWriter, export_size_report
+from plotstyle.styles import read_style
+
+
+@pytest.fixture
+def fig():
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 3])
+    yield fig
+    plt.close(fig)
+
+
+def test_background_saver_errors_are_raised_by_flush(fig, tmp_path):
+    with BackgroundFigureSaver(max_pending=1) as saver:
+        saver.submit("bad", fig=fig, save_dir=str(tmp_path), file_types="nope")
+        # Waits for room, without raising the error of the other figure
+        good = saver.submit("good", fig=fig, save_dir=str(tmp_path), file_types="png")
+        with pytest.raises(ValueError, match="Unrecognized file type"):
+            saver.flush(timeout=60)
+
+    assert len(good.result()) == 1
+
+
+def test_background_saver_flush_timeout_keeps_snapshots(fig, tmp_path):
+    from concurrent.futures import TimeoutError
+
+    with BackgroundFigureSaver() as saver:
+        saver.submit("first", fig=fig, save_dir=str(tmp_path), file_types="png")
+        saver.submit("second", fig=fig, save_dir=str(tmp_path), file_types="png")
+        # The worker process has not even started yet
+        with pytest.raises(TimeoutError):
+            saver.flush(timeout=0)
+        saved = saver.flush(timeout=60)
+
+    assert [len(paths) for paths in saved] == [1, 1]
+    assert saver.flush() == []
+
+
+def test_pdf_report_writer_deduplicates_png_names(tmp_path):
+    with PdfReportWriter("report", save_dir=str(tmp_path), png_zip=True) as report:
+        for name in ["loss", "loss", None, "loss"]:
+            fig, ax = plt.subplots()
+            ax.plot([1, 2, 3])
+            report.add(fig, name=name)
+
+    with zipfile.ZipFile(report.png_path) as zf:
+        assert zf.namelist() == ["loss.png", "loss-2.png", "page-0003.png", "loss-3.png"]
+
+
+def test_size_optimized_export_shrinks_serif_pdf():
+    with mpl.rc_context(read_style("no-latex")):
+        fig, ax = plt.subplots()
+        ax.plot([1, 2, 3])
+        ax.set_xlabel("Time $t$ (s)")
+        ax.set_title("Serif title")
+        sizes = export_size_report(fig, ["pdf", "eps"])
+        plt.close(fig)
+
+    assert sizes["pdf"][1] < sizes["pdf"][0]
+    assert sizes["eps"][1] <= sizes["eps"][0]
+
+
+def test_restyle_pickled_figures_resumes_from_manifest(tmp_path, monkeypatch):
+    import pickle
+
+    from plotstyle import export
+
+    source_dir = tmp_path / "source"
+    (source_dir / "sub").mkdir(parents=True)
+    for path in [source_dir / "a.pickle", source_dir / "sub" / "b.pkl"]:
+        fig, ax = plt.subplots()
+        ax.plot([1, 2, 3])
+        path.write_bytes(pickle.dumps(fig))
+        plt.close(fig)
+
+    restyled = []
+    restyle = export._restyle_pickled_figure
+
+    def spy(path, name, *args):
+        restyled.append(name)
+        return restyle(path, name, *args)
+
+    monkeypatch.setattr(export, "_restyle_pickled_figure", spy)
+
+    def run(style):
+        kwargs = dict(save_dir=str(tmp_path / "out"), max_workers=0, file_types="png")
+        return export.restyle_pickled_figures(str(source_dir), style, **kwargs)
+
+    first = run("no-latex")
+    assert sorted(restyled) == ["a", os.path.join("sub", "b")]
+    assert all(os.path.exists(path) for paths in first.values() for path in paths)
+
+    restyled.clear()
+    assert run("no-latex") == first
+    assert restyled == []
+
+    assert run("grid").keys() == first.keys()
+    assert sorted(restyled) == ["a", os.path.join("sub", "b")]
+
+
+def pdf_size(path):
+    import re
+
+    with open(path, "rb") as f:
+        box = re.search(rb"/MediaBox \[ *([\d.]+) ([\d.]+) ([\d.]+) ([\d.]+) *\]", f.read())
+    return float(box[3]) - float(box[1]), float(box[4]) - float(box[2])
+
+
+def save_rendered_once(fig, tmp_path, monkeypatch, **kwargs):
+    """Save `fig` as PNG and PDF with `render_once`, returning the paths and the number of figure draws."""
+    import matplotlib.image
+    from matplotlib.figure import Figure
+
+    from plotstyle.export import save_timestamped_figure
+
+    draws = []
+    draw = Figure.draw
+    monkeypatch.setattr(Figure, "draw", lambda self, renderer: draws.append(renderer) or draw(self, renderer))
+    png, pdf = save_timestamped_figure(
+        "fig", save_dir=str(tmp_path), fig=fig, file_types=["png", "pdf"], render_once=True, **kwargs
+    )
+    return matplotlib.image.imread(png), pdf_size(pdf), len(draws)
+
+
+def test_render_once_draws_once_for_png_and_pdf(tmp_path, monkeypatch):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    ax.plot([1, 2, 3])
+    png, pdf, draws = save_rendered_once(fig, tmp_path, monkeypatch, bbox_inches=None, dpi=50)
+    plt.close(fig)
+
+    # One Agg draw shared by the layout and the PNG, and one draw of the PDF
+    assert draws == 2
+    assert png.shape[:2] == (150, 200)
+    assert pdf == pytest.approx((288, 216))
+
+
+@pytest.mark.parametrize("fallback", ["facecolor", "layout_engine"])
+def test_render_once_fallback(tmp_path, monkeypatch, fallback):
+    rc = {"savefig.facecolor": "red"} if fallback == "facecolor" else {}
+    with mpl.rc_context(rc):
+        fig, ax = plt.subplots(figsize=(4, 3), layout="constrained" if fallback == "layout_engine" else None)
+        ax.plot([1, 2, 3])
+        engine = fig.get_layout_engine()
+        layouts = []
+        if engine is not None:
+            execute = engine.execute
+            monkeypatch.setattr(engine, "execute", lambda fig: layouts.append(fig) or execute(fig))
+        png, pdf, draws = save_rendered_once(fig, tmp_path, monkeypatch, bbox_inches=None, dpi=50)
+        plt.close(fig)
+
+    assert png.shape[:2] == (150, 200)
+    assert pdf == pytest.approx((288, 216))
+    if fallback == "facecolor":
+        # The PNG is saved by `savefig`, with the face color the Agg draw does not have
+        assert draws == 3
+        assert tuple(png[0, 0, :3]) == (1.0, 0.0, 0.0)
+    else:
+        # The layout is computed once and the engine is restored afterwards
+        assert len(layouts) == 1
+        assert fig.get_layout_engine() is engine
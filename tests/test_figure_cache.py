@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from plotstyle.cache import FigureCache, figure_hash
+from plotstyle.export import save_timestamped_figure
+
+HASH_SCRIPT = """
+import matplotlib
+matplotlib.use("agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from plotstyle.cache import figure_hash
+
+fig, ax = plt.subplots()
+ax.plot(np.arange(10), 1.0 * np.arange(10) ** 2, label="data")
+ax.set_xlabel("x")
+ax.legend()
+print(figure_hash(fig, "pdf"))
+"""
+
+
+def make_figure(scale: float = 1.0) -> plt.Figure:
+    fig, ax = plt.subplots()
+    ax.plot(np.arange(10), scale * np.arange(10) ** 2, label="data")
+    ax.set_xlabel("x")
+    ax.legend()
+    return fig
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+def test_figure_hash_stable_for_identical_figures():
+    assert figure_hash(make_figure(), "pdf") == figure_hash(make_figure(), "pdf")
+
+
+def test_figure_hash_stable_across_processes():
+    digests = {
+        subprocess.run([sys.executable, "-c", HASH_SCRIPT], capture_output=True, text=True, check=True).stdout.strip()
+        for _ in range(2)
+    }
+
+    assert digests == {figure_hash(make_figure(), "pdf")}
+
+
+def test_figure_hash_changes_with_content():
+    fig = make_figure()
+    digest = figure_hash(fig, "pdf")
+
+    assert figure_hash(make_figure(scale=2.0), "pdf") != digest
+    assert figure_hash(fig, "png") != digest
+    fig.axes[0].set_xlabel("y")
+    assert figure_hash(fig, "pdf") != digest
+
+
+def test_figure_hash_changes_with_transform():
+    from matplotlib.transforms import Affine2D
+
+    digests = set()
+    for transform in ["transAxes", "transData", "blended", "rotated", "rotated_more"]:
+        fig, ax = plt.subplots()
+        if transform == "blended":
+            transform = ax.get_xaxis_transform()
+        elif transform.startswith("rotated"):
+            transform = Affine2D().rotate_deg(45 if transform == "rotated_more" else 30) + ax.transData
+        else:
+            transform = getattr(ax, transform)
+        ax.text(0.5, 0.5, "x", transform=transform)
+        digests.add(figure_hash(fig))
+    assert len(digests) == 5
+
+
+def test_figure_hash_changes_with_rcparams():
+    fig = make_figure()
+    digest = figure_hash(fig)
+    with plt.rc_context({"savefig.dpi": 42}):
+        assert figure_hash(fig) != digest
+
+
+def save(fig, name, save_dir, version, cache=True):
+    return save_timestamped_figure(
+        name, save_dir=save_dir, fig=fig, file_types=["png"], date_format=version, cache=cache
+    )
+
+
+def test_cache_hit_reuses_files(tmp_path):
+    first = save(make_figure(), "fig", str(tmp_path), "v1")
+    second = save(make_figure(), "fig", str(tmp_path), "v2")
+
+    assert second == first
+    assert not os.path.exists(os.path.join(tmp_path, "fig_v2.png"))
+
+
+def test_cache_hit_paths_have_the_form_of_a_miss(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = save(make_figure(), "fig", "figures", "v1")
+    second = save(make_figure(), "fig", "figures", "v2")
+
+    assert first == [os.path.join("figures", "fig_v1.png")]
+    assert second == first
+
+
+def test_cache_miss_for_changed_figure(tmp_path):
+    save(make_figure(), "fig", str(tmp_path), "v1")
+    second = save(make_figure(scale=2.0), "fig", str(tmp_path), "v2")
+
+    assert second == [os.path.join(tmp_path, "fig_v2.png")]
+    assert os.path.exists(second[0])
+
+
+def test_cache_miss_for_other_name(tmp_path):
+    save(make_figure(), "fig", str(tmp_path), "v1")
+    other = save(make_figure(), "other", str(tmp_path), "v1")
+
+    assert other == [os.path.join(tmp_path, "other_v1.png")]
+    assert os.path.exists(other[0])
+
+
+def test_cache_link_and_keep_versions(tmp_path):
+    cache = FigureCache(link=True, keep_versions=1)
+    first = save(make_figure(), "fig", str(tmp_path), "v1", cache)
+    second = save(make_figure(), "fig", str(tmp_path), "v2", cache)
+
+    assert second == [os.path.join(tmp_path, "fig_v2.png")]
+    assert os.path.samefile(first[0], second[0])
+
+    third = save(make_figure(scale=2.0), "fig", str(tmp_path), "v3", cache)
+    assert os.path.exists(third[0])
+    assert not os.path.exists(first[0])
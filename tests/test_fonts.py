@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+
+from plotstyle import fonts
+
+
+@pytest.fixture(autouse=True)
+def font_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(fonts, "default_cache_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(fonts, "_resolved", {})
+
+
+def test_font_chain_expands_generic_families():
+    rc = {
+        "font.family": ["serif", "Arial", "sans-serif"],
+        "font.serif": ["Times", "DejaVu Serif", "serif"],
+        "font.sans-serif": ["Arial", "DejaVu Sans"],
+    }
+    assert fonts.font_chain(rc) == ["Times", "DejaVu Serif", "Arial", "DejaVu Sans"]
+    assert fonts.font_chain({"font.family": "Arial"}) == ["Arial"]
+
+
+def test_resolve_font_rc_keeps_installed_fonts():
+    rc = {"font.family": "serif", "font.serif": ["Not A Font", "dejavu serif"]}
+    assert fonts.resolve_font_rc(rc) == {"font.family": ["DejaVu Serif"]}
+
+
+def test_resolve_font_rc_falls_back_to_generic_family(caplog):
+    rc = {"font.family": "serif", "font.serif": ["Not A Font"]}
+    with caplog.at_level(logging.WARNING, logger="plotstyle.fonts"):
+        resolved = fonts.resolve_font_rc(rc)
+        assert fonts.resolve_font_rc(rc) == resolved
+
+    assert "DejaVu Serif" in resolved["font.family"]
+    # Warned once per chain
+    assert [record.getMessage() for record in caplog.records] == [
+        f"None of the fonts ['Not A Font'] are installed, using {resolved['font.family']} instead."
+    ]
+
+
+def test_font_cache_is_invalidated_when_fonts_change(monkeypatch):
+    rc = {"font.family": "New Font"}
+    fallback = fonts.resolve_font_rc(rc)
+    assert fallback != {"font.family": ["New Font"]}
+
+    # A new process with the same fonts reads the chain from the disk cache
+    monkeypatch.setattr(fonts, "_resolved", {})
+    monkeypatch.setattr(fonts, "installed_families", lambda: {"new font": "New Font"})
+    assert fonts.resolve_font_rc(rc) == fallback
+
+    # Installing a font changes the fingerprint, so the chain is resolved again
+    monkeypatch.setattr(fonts, "_resolved", {})
+    monkeypatch.setattr(fonts, "_fonts_fingerprint", lambda: "new fonts")
+    assert fonts.resolve_font_rc(rc) == {"font.family": ["New Font"]}
@@ -0,0 +1,60 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from plotstyle import largedata
+
+
+@pytest.fixture(autouse=True, scope="module")
+def aggregate_style():
+    # Aggregate at any number of points
+    largedata.configure("test-aggregate", scatter_threshold=0, scatter_mode="aggregate")
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots()
+    yield ax
+    plt.close(fig)
+
+
+def test_scatter_aggregate_counts_points(ax):
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=1000), rng.normal(size=1000)
+    x[0] = np.nan
+    image = largedata.scatter(ax, x, y, style="test-aggregate")
+
+    assert image.get_array().sum() == 999
+
+
+def test_scatter_aggregate_without_finite_points(ax):
+    x = np.full(1000, np.nan)
+    artist = largedata.scatter(ax, x, x, style="test-aggregate")
+
+    assert len(artist.get_offsets()) == 0
+
+
+def test_scatter_aggregate_ignores_marker_kwargs(ax):
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=1000), rng.normal(size=1000)
+    image = largedata.scatter(ax, x, y, style="test-aggregate", s=4, c="k", marker="x", cmap="viridis", alpha=0.5)
+
+    assert image.get_cmap().name == "viridis"
+    assert image.get_alpha() == 0.5
+    assert image.get_array().sum() == 1000
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_plot_decimates_each_column_of_2d_y(ax, method):
+    largedata.configure(f"test-{method}", line_threshold=100, line_method=method)
+    x = np.linspace(0, 1, 10_000)
+    y = np.column_stack([np.sin(20 * x), 10 + np.cos(20 * x)])
+    lines = largedata.plot(ax, x, y, style=f"test-{method}")
+
+    assert len(lines) == 2
+    for line, column in zip(lines, y.T):
+        line_y = line.get_ydata()
+        assert len(line_y) < len(x)
+        # Each line keeps the values of its own column
+        assert column.min() <= min(line_y) < max(line_y) <= column.max()
+        assert max(line_y) - min(line_y) == pytest.approx(np.ptp(column), rel=0.01)
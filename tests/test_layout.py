@@ -0,0 +1,41 @@
+import pickle
+
+import matplotlib.image
+import matplotlib.pyplot as plt
+import pytest
+
+from plotstyle import layout
+from plotstyle.export import save_timestamped_figure
+
+
+@pytest.fixture
+def fig():
+    fig, axes = plt.subplots(2, 2, figsize=(6, 4), dpi=100)
+    for ax in axes.flat:
+        ax.plot([1, 2, 3], label="data")
+        ax.set_xlabel("x")
+    yield fig
+    plt.close(fig)
+
+
+def test_grid_layout_engine_pickles(fig):
+    fig.set_layout_engine(layout.GridLayoutEngine())
+    # The number of ticks, and so the tick label lengths, depend on the axes size set by the first layout
+    fig.canvas.draw()
+    fig.canvas.draw()
+    margins = fig.subplotpars.left, fig.subplotpars.bottom
+
+    restored = pickle.loads(pickle.dumps(fig))
+    assert isinstance(restored.get_layout_engine(), layout.GridLayoutEngine)
+    restored.canvas.draw()
+    assert (restored.subplotpars.left, restored.subplotpars.bottom) == pytest.approx(margins)
+    plt.close(restored)
+
+
+def test_save_with_grid_layout_keeps_bbox_inches(fig, tmp_path):
+    # A legend outside the axes is only included by the tight bounding box
+    fig.axes[1].legend(loc="upper left", bbox_to_anchor=(1.0, 1.0))
+    (path,) = save_timestamped_figure("fig", save_dir=str(tmp_path), fig=fig, file_types="png", layout="grid", dpi=100)
+
+    height, width = matplotlib.image.imread(path).shape[:2]
+    assert width > 600
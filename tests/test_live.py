@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pytest
+
+from plotstyle.live import LivePlot
+
+
+@pytest.fixture
+def live():
+    return LivePlot("no-latex", headroom=0.5)
+
+
+def test_limits_expand_only_where_the_data_left(live):
+    ax = live.axes[0, 0]
+    line = live.line()
+    live.set_data(line, np.arange(11.0), np.linspace(0, 1, 11))
+    live.render()
+    assert ax.get_xlim() == pytest.approx((-5, 15))
+    assert ax.get_ylim() == pytest.approx((-0.5, 1.5))
+    assert live.stats["background_draws"] == 1
+
+    # Within the limits, only the line is redrawn
+    live.append(line, 12.0, 1.2)
+    live.render()
+    assert live.stats["background_draws"] == 1
+
+    live.append(line, 20.0, 0.5)
+    live.render()
+    assert ax.get_xlim() == pytest.approx((-5, 30))
+    assert ax.get_ylim() == pytest.approx((-0.5, 1.5))
+    assert live.stats["background_draws"] == 2
+
+
+def test_frames_within_the_interval_are_skipped(live):
+    live.frame_interval = 3600
+    line = live.line()
+    live.append(line, [0.0, 1.0], [0.0, 1.0])
+
+    assert live.render() is not None
+    assert live.render() is None
+    assert live.render(force=True) is not None
+    assert live.stats["frames"] == 2 and live.stats["skipped"] == 1
+
+
+def test_render_after_savefig(live):
+    line = live.line()
+    x = np.linspace(0, 1, 100_000)
+    live.set_data(line, x, np.sin(x))
+    frame = live.render().copy()
+    # Rendered frames are decimated to the axes resolution
+    assert len(line.get_xdata()) < len(x)
+
+    live.savefig(io.BytesIO(), format="png", dpi=2 * live.fig.dpi)
+    assert len(line.get_xdata()) == len(x)
+    assert line.get_animated()
+
+    draws = live.stats["background_draws"]
+    np.testing.assert_array_equal(live.render(), frame)
+    assert live.stats["background_draws"] == draws + 1
@@ -0,0 +1,42 @@
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.font_manager import FontProperties
+from matplotlib.ticker import FixedLocator, MultipleLocator
+
+from plotstyle.patch import patch_figure
+from plotstyle.styles import style_context
+
+
+def style_sizes(style):
+    with style_context(style):
+        keys = ["xtick.labelsize", "ytick.labelsize", "axes.labelsize", "axes.titlesize", "legend.fontsize"]
+        return {key: FontProperties(size=plt.rcParams[key]).get_size_in_points() for key in keys}
+
+
+def test_patch_figure_restyles_every_axes():
+    fig, axes = plt.subplots(2, 2)
+    for i, ax in enumerate(axes.flat):
+        ax.plot([1, 2, 3], label=f"line {i}")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.set_title("center")
+        ax.set_title("left", loc="left")
+        ax.legend()
+    axes[0, 0].xaxis.set_major_locator(MultipleLocator(0.25))
+    axes[1, 1].yaxis.set_major_locator(FixedLocator([1.5, 2.5]))
+    locators = [(ax.xaxis.get_major_locator(), ax.yaxis.get_major_locator()) for ax in fig.axes]
+
+    patch_figure("nature", fig=fig)
+    sizes = style_sizes("nature")
+
+    for ax, (x_locator, y_locator) in zip(fig.axes, locators):
+        assert ax.xaxis.get_major_locator() is x_locator
+        assert ax.yaxis.get_major_locator() is y_locator
+        assert {label.get_fontsize() for label in ax.get_xticklabels()} == {sizes["xtick.labelsize"]}
+        assert {label.get_fontsize() for label in ax.get_yticklabels()} == {sizes["ytick.labelsize"]}
+        assert ax.xaxis.label.get_fontsize() == ax.yaxis.label.get_fontsize() == sizes["axes.labelsize"]
+        for title in [ax.title, ax._left_title]:
+            assert title.get_fontsize() == pytest.approx(sizes["axes.titlesize"])
+        assert {text.get_fontsize() for text in ax.get_legend().get_texts()} == {sizes["legend.fontsize"]}
+    assert [tick.get_loc() for tick in fig.axes[3].yaxis.get_major_ticks()] == [1.5, 2.5]
+    plt.close(fig)
@@ -0,0 +1,37 @@
+import pytest
+
+from plotstyle.pool import FigurePool
+
+
+def test_pool_evicts_least_recently_used():
+    pool = FigurePool(max_size=2)
+    templates = {style: pool.acquire(style) for style in ["grid", "no-latex", "sans"]}
+    pool.release(templates["grid"])
+    pool.release(templates["no-latex"])
+    # Using "grid" again makes "no-latex" the least recently used
+    with pool.figure("grid") as template:
+        assert template is templates["grid"]
+    pool.release(templates["sans"])
+
+    assert pool.stats() == {"hits": 1, "misses": 3, "evictions": 1, "hit_rate": 0.25, "size": 2}
+    assert pool.acquire("no-latex") is not templates["no-latex"]
+    assert pool.acquire("grid") is templates["grid"]
+    assert pool.acquire("sans") is templates["sans"]
+
+
+def test_reused_figure_is_clean():
+    pool = FigurePool()
+    with pool.figure("grid", nrows=1, ncols=2) as template:
+        figsize = tuple(template.fig.get_size_inches())
+        ax = template.axes[0, 1]
+        ax.plot([1, 2, 3], label="data")
+        ax.legend()
+        ax.set_title("title")
+
+    with pool.figure("grid", nrows=1, ncols=2, clear=True) as reused:
+        assert reused is template
+        ax = reused.axes[0, 1]
+        assert not ax.lines and ax.get_legend() is None and ax.get_title() == ""
+        # The style and size are kept
+        assert all(line.get_visible() for line in ax.get_xgridlines())
+        assert tuple(reused.fig.get_size_inches()) == pytest.approx(figsize)
@@ -0,0 +1,33 @@
+import inspect
+
+import matplotlib.pyplot as plt
+import pytest
+
+from plotstyle.export import save_timestamped_figure
+from plotstyle.profiling import RenderProfiler, _instrumented_attributes
+
+
+def test_phase_times_add_up_to_total(tmp_path):
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 3])
+    ax.set_xlabel("x")
+    with RenderProfiler() as profiler:
+        save_timestamped_figure("fig", save_dir=str(tmp_path), fig=fig, file_types=["pdf", "png"])
+    plt.close(fig)
+
+    (record,) = profiler.records
+    assert record["event"] == "save_timestamped_figure"
+    assert set(record["phases"]["encode"]) == {"pdf", "png"}
+    assert "Line2D" in record["phases"]["draw"]
+    phase_total = sum(time for phase in record["phases"].values() for time in phase.values())
+    assert phase_total == pytest.approx(record["total"])
+
+
+def test_instrumentation_is_restored():
+    def originals():
+        return [inspect.getattr_static(owner, attribute) for owner, attribute, *_ in _instrumented_attributes()]
+
+    before = originals()
+    with RenderProfiler():
+        assert originals() != before
+    assert originals() == before
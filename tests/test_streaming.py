@@ -0,0 +1,73 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd  # type: ignore[import]
+import pytest
+
+from plotstyle import streaming
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots()
+    yield ax
+    plt.close(fig)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, size=10_000)
+    frame = pd.DataFrame({"x": x, "y": np.sin(x) + rng.normal(scale=0.1, size=len(x))})
+    frame.loc[::97, "y"] = np.nan
+    return frame
+
+
+@pytest.mark.parametrize("bins", [20, [-3.0, -1.0, 0.0, 0.5, 2.0, 3.0]])
+@pytest.mark.parametrize("density", [False, True])
+def test_stream_histogram_matches_numpy(ax, bins, density):
+    values = np.random.default_rng(0).normal(size=10_000)
+    values[::101] = np.nan
+    patch = streaming.stream_histogram(ax, values, bins=bins, density=density, chunk_size=1_000)
+
+    finite = values[np.isfinite(values)]
+    value_range = None if np.ndim(bins) else (finite.min(), finite.max())
+    expected, edges = np.histogram(finite, bins=bins, range=value_range, density=density)
+    data = patch.get_data()
+    np.testing.assert_allclose(data.edges, edges)
+    np.testing.assert_allclose(data.values, expected)
+
+
+@pytest.mark.parametrize("columns", [None, [2, 0]])
+def test_iter_chunks_of_2d_array(columns):
+    data = np.arange(30, dtype=float).reshape(10, 3)
+    chunks = list(streaming.iter_chunks(data, columns=columns, chunk_size=4))
+
+    expected = data if columns is None else data[:, columns]
+    assert [len(chunk) for chunk in chunks] == [expected.shape[1]] * 3
+    for i, column in enumerate(expected.T):
+        np.testing.assert_array_equal(np.concatenate([chunk[i] for chunk in chunks]), column)
+
+
+def test_stream_histogram_of_chunk_iterable(ax, frame):
+    chunks = (frame.iloc[i : i + 1_000] for i in range(0, len(frame), 1_000))
+    patch = streaming.stream_histogram(ax, chunks, bins=10, range=(0, 5), column="x")
+
+    expected, _ = np.histogram(frame["x"], bins=10, range=(0, 5))
+    np.testing.assert_allclose(patch.get_data().values, expected)
+
+
+def test_stream_binned_mean_matches_groupby(ax, frame):
+    line = streaming.stream_binned_mean(ax, frame, bins=20, range=(0, 10), columns=["x", "y"], chunk_size=1_000)
+
+    finite = frame.dropna()
+    groups = finite.groupby(pd.cut(finite["x"], np.linspace(0, 10, 21), right=False), observed=True)["y"]
+    expected = groups.mean()
+    centers = [interval.mid for interval in expected.index]
+    np.testing.assert_allclose(line.get_xdata(), centers)
+    np.testing.assert_allclose(line.get_ydata(), expected.to_numpy())
+
+
+def test_stream_binned_mean_requires_range_for_iterables(ax, frame):
+    chunks = (frame.iloc[i : i + 1_000] for i in range(0, len(frame), 1_000))
+    with pytest.raises(ValueError, match="`range` is required"):
+        streaming.stream_binned_mean(ax, chunks, columns=["x", "y"])
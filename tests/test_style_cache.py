@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from plotstyle import cache, styles
+from plotstyle.cache import StyleCache
+
+
+@pytest.fixture
+def stylesheet(tmp_path):
+    path = tmp_path / "test.mplstyle"
+    path.write_text("lines.linewidth: 2\n")
+    return str(path)
+
+
+@pytest.fixture
+def style_cache(tmp_path, monkeypatch):
+    # A fresh process-wide cache in a temporary directory
+    monkeypatch.setenv("PLOTSTYLE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "_style_cache", None)
+    return cache.get_style_cache()
+
+
+def test_style_cache_roundtrip(tmp_path, stylesheet):
+    style_cache = StyleCache(str(tmp_path / "cache"))
+    style_cache.put(stylesheet, {"lines.linewidth": 2.0})
+    style_cache.save()
+
+    assert StyleCache(str(tmp_path / "cache")).get(stylesheet) == {"lines.linewidth": 2.0}
+
+
+def test_style_cache_invalidated_by_stylesheet_change(tmp_path, stylesheet):
+    style_cache = StyleCache(str(tmp_path / "cache"))
+    style_cache.put(stylesheet, {"lines.linewidth": 2.0})
+    style_cache.save()
+
+    with open(stylesheet, "a") as f:
+        f.write("lines.markersize: 3\n")
+    assert StyleCache(str(tmp_path / "cache")).get(stylesheet) is None
+
+    # An unchanged size with a new modification time invalidates the entry as well
+    style_cache.put(stylesheet, {"lines.linewidth": 2.0})
+    stat = os.stat(stylesheet)
+    os.utime(stylesheet, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert style_cache.get(stylesheet) is None
+
+
+def test_style_cache_invalidated_by_version_change(tmp_path, stylesheet, monkeypatch):
+    style_cache = StyleCache(str(tmp_path / "cache"))
+    style_cache.put(stylesheet, {"lines.linewidth": 2.0})
+    style_cache.save()
+
+    monkeypatch.setattr(cache, "VERSION", "999.0.0")
+    assert StyleCache(str(tmp_path / "cache")).get(stylesheet) is None
+
+
+def test_style_cache_ignores_corrupt_file(tmp_path, stylesheet):
+    style_cache = StyleCache(str(tmp_path / "cache"))
+    os.makedirs(style_cache.cache_dir)
+    with open(style_cache.path, "wb") as f:
+        f.write(b"not a pickle")
+
+    assert StyleCache(str(tmp_path / "cache")).get(stylesheet) is None
+
+
+def test_read_style_saves_once(style_cache, monkeypatch):
+    saves = []
+    monkeypatch.setattr(style_cache, "save", lambda: saves.append(1))
+    names = list(styles.style_index())[:3]
+    for name in names:
+        styles.read_style(name)
+
+    assert not saves
+    assert all(style_cache.get(styles.style_path(name)) is not None for name in names)
+
+
+def test_register_styles_writes_cache(style_cache, monkeypatch):
+    import matplotlib.style as mplstyle
+
+    # Keep the lazily registered styles of other tests
+    monkeypatch.setattr(mplstyle, "library", dict(mplstyle.library))
+    styles.register_styles(lazy=False)
+
+    assert os.path.exists(style_cache.path)
+    assert len(StyleCache(style_cache.cache_dir).entries) == len(styles.style_index())
+
+
+def test_save_style_cache(style_cache):
+    styles.read_style("science")
+    assert not os.path.exists(style_cache.path)
+
+    cache.save_style_cache()
+    assert os.path.exists(style_cache.path)
+
+
+def test_import_does_not_import_pyplot_or_seaborn():
+    code = "import sys, plotstyle; print(sorted({'matplotlib.pyplot', 'seaborn'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_read_style_matches_uncached(style_cache):
+    name = "science"
+    uncached = styles.read_style(name, use_cache=False)
+    # A miss, then a hit
+    assert styles.read_style(name) == uncached
+    assert styles.read_style(name) == uncached
@@ -0,0 +1,65 @@
+import os
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import pytest
+
+import plotstyle  # noqa: F401
+from plotstyle import styles
+
+STACKS = [
+    "science",
+    ["science", "no-latex"],
+    ["science", "nature", "bright", "no-latex"],
+    ["science", {"lines.linewidth": 3.0}],
+]
+
+
+@pytest.mark.parametrize("style", STACKS)
+def test_style_context_matches_matplotlib(style):
+    with plt.style.context(style):
+        expected = dict(mpl.rcParams)
+    with styles.style_context(style):
+        actual = dict(mpl.rcParams)
+
+    assert actual == expected
+
+
+def test_style_context_restores_rcparams():
+    before = dict(mpl.rcParams)
+    with styles.style_context(["science", "no-latex"]):
+        assert mpl.rcParams["text.usetex"] is False
+    assert dict(mpl.rcParams) == before
+
+
+def test_resolve_style_later_styles_take_precedence():
+    rc = styles.resolve_style(["science", "no-latex", {"lines.linewidth": 3.0}])
+
+    assert rc["lines.linewidth"] == 3.0
+    assert rc["text.usetex"] is False
+
+
+def test_resolve_style_returns_copies():
+    rc = styles.resolve_style("science")
+    rc.clear()
+
+    assert styles.resolve_style("science")
+
+
+def test_resolve_style_invalidated_by_stylesheet_change(tmp_path):
+    path = tmp_path / "test.mplstyle"
+    path.write_text("lines.linewidth: 2\n")
+    assert styles.resolve_style(str(path))["lines.linewidth"] == 2.0
+    hits = styles._resolve_style_cached.cache_info().hits
+    assert styles.resolve_style(str(path))["lines.linewidth"] == 2.0
+    assert styles._resolve_style_cached.cache_info().hits == hits + 1
+
+    path.write_text("lines.linewidth: 4\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert styles.resolve_style(str(path))["lines.linewidth"] == 4.0
+
+
+def test_unknown_style():
+    with pytest.raises(ValueError, match="Unrecognized style"):
+        styles.style_path("not-a-style")
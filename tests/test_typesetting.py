@@ -0,0 +1,95 @@
+import inspect
+import os
+
+import pytest
+from matplotlib.texmanager import TexManager
+
+from plotstyle import typesetting
+
+
+@pytest.fixture
+def tex_cache(tmp_path, monkeypatch):
+    """Use an empty local TeX cache, and populate a shared one without running latex."""
+    local_dir, shared_dir = tmp_path / "local", tmp_path / "shared"
+    local_dir.mkdir()
+    monkeypatch.setattr(TexManager, "_cache_dir", local_dir)
+    make_dvi = inspect.getattr_static(TexManager, "make_dvi")
+    path = TexManager.get_basefile("shared label", 10) + ".dvi"
+    shared_path = shared_dir / os.path.relpath(path, local_dir)
+    shared_path.parent.mkdir(parents=True)
+    shared_path.write_bytes(b"compiled")
+    yield path, shared_dir
+    typesetting.disable_tex_cache()
+    assert inspect.getattr_static(TexManager, "make_dvi").__func__ is make_dvi.__func__
+
+
+def test_tex_cache_restores_from_shared_dir(tex_cache):
+    path, shared_dir = tex_cache
+    typesetting.enable_tex_cache(shared_dirs=[str(shared_dir)])
+
+    # matplotlib looks a label up several times per draw
+    for _ in range(3):
+        assert TexManager.make_dvi("shared label", 10) == path
+    with open(path, "rb") as f:
+        assert f.read() == b"compiled"
+
+    stats = typesetting.tex_cache_stats()
+    assert stats["dvi_hits_shared"] == 1 and stats["dvi_hits_local"] == 0 and stats["dvi_misses"] == 0
+    assert stats["hit_rate"] == 1.0
+
+
+def test_disable_tex_cache(tex_cache):
+    path, shared_dir = tex_cache
+    typesetting.enable_tex_cache(shared_dirs=[str(shared_dir)])
+    typesetting.disable_tex_cache()
+
+    assert not typesetting._shared_tex_dirs
+    assert not os.path.exists(path)
+
+
+@pytest.fixture
+def latex_dirs(tmp_path, monkeypatch):
+    """Return an empty directory and one with a fake latex executable, and cache the probes in `tmp_path`."""
+    from plotstyle import cache
+
+    monkeypatch.setattr(cache, "default_cache_dir", lambda: str(tmp_path / "cache"))
+    typesetting._find_latex.cache_clear()
+    empty_dir, tex_dir = tmp_path / "empty", tmp_path / "tex"
+    empty_dir.mkdir()
+    tex_dir.mkdir()
+    latex = tex_dir / "latex"
+    latex.write_text("#!/bin/sh\n")
+    latex.chmod(0o755)
+    yield str(empty_dir), str(tex_dir)
+    typesetting._find_latex.cache_clear()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="The fake latex executable is a shell script")
+def test_latex_is_available_is_cached_per_path(latex_dirs, monkeypatch):
+    empty_dir, tex_dir = latex_dirs
+    monkeypatch.setenv("PATH", empty_dir)
+    assert not typesetting.latex_is_available()
+    assert not typesetting.latex_is_available()
+    assert typesetting._find_latex.cache_info().hits == 1
+
+    monkeypatch.setenv("PATH", tex_dir)
+    assert typesetting.latex_is_available()
+    assert typesetting._find_latex.cache_info().misses == 2
+
+
+@pytest.mark.skipif(os.name == "nt", reason="The fake latex executable is a shell script")
+def test_latex_is_available_cached_on_disk(latex_dirs, monkeypatch):
+    empty_dir, tex_dir = latex_dirs
+    monkeypatch.setenv("PATH", empty_dir)
+    assert not typesetting.latex_is_available(cache_on_disk=True)
+
+    monkeypatch.setenv("PATH", tex_dir)
+    assert typesetting.latex_is_available(cache_on_disk=True)
+    # A new process finds latex in the disk cache without searching PATH
+    typesetting._find_latex.cache_clear()
+    assert typesetting.latex_is_available(cache_on_disk=True)
+    assert typesetting._find_latex.cache_info().misses == 0
+
+    # Only found executables are cached, and a removed one is searched for again
+    os.remove(os.path.join(tex_dir, "latex"))
+    assert not typesetting.latex_is_available(cache_on_disk=True)